@@ -5,7 +5,7 @@
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse, HTMLResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from datetime import datetime
 import os
 import threading
@@ -22,6 +22,8 @@ import flashscore_reader
 import asian_reader
 import backup_manager
 import cross_verifier   # ✅ νέο module
+from modules.adaptive_poller import AdaptivePoller, ADAPTIVE_POLLING
+from modules.db_engine import get_read_engine
 
 # ----------------------------------------------
 # Load environment variables
@@ -29,10 +31,7 @@ import cross_verifier   # ✅ νέο module
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///matches.db")
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+read_engine = get_read_engine(DATABASE_URL)  # dashboard queries – οι feeds γράφουν με το δικό τους get_engine()
 
 # ----------------------------------------------
 # FastAPI setup
@@ -53,11 +52,11 @@ def home(request: Request):
 @app.get("/api/live_scores")
 def get_live_scores():
     try:
-        with engine.connect() as conn:
+        with read_engine.connect() as conn:
             result = conn.execute(text("""
                 SELECT match_id, home, away, score, status, source, updated_at
                 FROM matches
-                WHERE status IN ('live', 'inprogress', '1st_half', '2nd_half')
+                WHERE status IN ('live', 'inprogress', '1st_half', '2nd_half', 'extra_time')
                 ORDER BY updated_at DESC
                 LIMIT 100;
             """)).mappings().all()
@@ -76,7 +75,7 @@ def system_check():
 
     # ✅ Database check
     try:
-        with engine.connect() as conn:
+        with read_engine.connect() as conn:
             result = conn.execute(text("SELECT COUNT(*) AS cnt FROM matches")).mappings().first()
             status["database"] = {"connected": True, "live_matches": result["cnt"]}
     except Exception as e:
@@ -110,14 +109,32 @@ def system_check():
 def live_page(request: Request):
     return templates.TemplateResponse("live.html", {"request": request})
 
+# ----------------------------------------------
+# Adaptive polling (ADAPTIVE_POLLING=ON)
+# ----------------------------------------------
+# Οι live αγώνες του Sofascore μπαίνουν σε kickoff priority queue.
+# Όσο υπάρχουν live αγώνες τα threads τρέχουν πιο συχνά,
+# χωρίς live αγώνες αραιώνουν (IDLE_FACTOR × το σταθερό interval).
+LIVE_POLLER = AdaptivePoller()
+IDLE_FACTOR = int(os.getenv("POLL_IDLE_FACTOR", 3))
+
+def _next_sleep(default):
+    if not ADAPTIVE_POLLING:
+        return default
+    return LIVE_POLLER.cadence(idle=default * IDLE_FACTOR)
+
 # ----------------------------------------------
 # Background Threads
 # ----------------------------------------------
 def start_sofascore_feed():
     while True:
         print("[THREAD] 🟢 Sofascore feed running...")
-        live_feeds.update_sofascore_data()
-        time.sleep(120)
+        events = live_feeds.update_sofascore_data() or []
+        for e in events:
+            LIVE_POLLER.track(f"sofa_{e['id']}", kickoff=e.get("startTimestamp"),
+                              status=(e.get("status") or {}).get("type"))
+        LIVE_POLLER.retain(f"sofa_{e['id']}" for e in events)
+        time.sleep(_next_sleep(120))
 
 def start_flashscore_feed():
     while True:
@@ -126,13 +143,13 @@ def start_flashscore_feed():
         if html:
             matches = flashscore_reader.parse_flashscore(html)
             flashscore_reader.update_database(matches)
-        time.sleep(180)
+        time.sleep(_next_sleep(180))
 
 def start_cross_verifier():
     while True:
         print("[THREAD] ⚖️ Cross Verifier running...")
         cross_verifier.verify_and_update()
-        time.sleep(180)  # κάθε 3 λεπτά
+        time.sleep(_next_sleep(180))  # κάθε 3 λεπτά (adaptive αν είναι ενεργό)
 
 def start_backup_manager():
     print("[THREAD] 💾 Backup manager active (monthly check)")
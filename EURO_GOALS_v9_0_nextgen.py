@@ -16,13 +16,16 @@ from pathlib import Path
 from typing import Optional, List, Dict, Any
 
 import requests
-from requests.adapters import HTTPAdapter, Retry
+
+from modules import http_client
+from modules.db_engine import get_engine
+from modules.odds_store import get_odds_store
 
 from fastapi import FastAPI, Query, HTTPException
 from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Index, event, select, text
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship
 
 # ------------- CONFIG ---------------------------------------------------------
@@ -51,7 +54,7 @@ _file.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %
 logger.addHandler(_file)
 
 # ------------- DB -------------------------------------------------------------
-engine = create_engine(DB_URL, connect_args={"check_same_thread": False} if DB_URL.startswith("sqlite") else {})
+engine = get_engine(DB_URL)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 Base = declarative_base()
 
@@ -67,7 +70,8 @@ class Match(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow)
 
-    odds = relationship("Odds", back_populates="match", cascade="all, delete-orphan", lazy="selectin")
+    # Lazy: τα odds (tick history) φορτώνονται μόνο όταν ζητηθούν ρητά (/api/odds)
+    odds = relationship("Odds", back_populates="match", cascade="all, delete-orphan", lazy="select")
 
 Index("ix_matches_unique", Match.provider_id, Match.kickoff_utc, unique=False)
 
@@ -83,6 +87,19 @@ class Odds(Base):
 
     match = relationship("Match", back_populates="odds")
 
+class OddsLatest(Base):
+    """Τρέχουσα τιμή ανά (match, market, book) – ενημερώνεται στο ίδιο transaction με το Odds insert."""
+    __tablename__ = "odds_latest"
+    match_id = Column(Integer, ForeignKey("matches.id"), primary_key=True)
+    market = Column(String, primary_key=True)
+    book = Column(String, primary_key=True)
+    price = Column(Float)
+    line = Column(Float, nullable=True)
+    ts = Column(DateTime, index=True)
+    open_price = Column(Float)  # πρώτη τιμή που είδαμε (για move%)
+    open_ts = Column(DateTime)
+    ticks = Column(Integer, default=0)
+
 class Alert(Base):
     __tablename__ = "alerts"
     id = Column(Integer, primary_key=True)
@@ -92,20 +109,31 @@ class Alert(Base):
     payload = Column(Text)              # JSON string
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
+_BACKFILL_LATEST_SQL = text("""
+    INSERT INTO odds_latest (match_id, market, book, price, line, ts, open_price, open_ts, ticks)
+    SELECT match_id, market, book, price, line, ts, open_price, open_ts, ticks FROM (
+        SELECT match_id, market, book, price, line, ts,
+               ROW_NUMBER() OVER (PARTITION BY match_id, market, book ORDER BY ts DESC, id DESC) AS rn,
+               FIRST_VALUE(price) OVER (PARTITION BY match_id, market, book ORDER BY ts, id) AS open_price,
+               MIN(ts) OVER (PARTITION BY match_id, market, book) AS open_ts,
+               COUNT(*) OVER (PARTITION BY match_id, market, book) AS ticks
+        FROM odds WHERE match_id IS NOT NULL AND market IS NOT NULL AND book IS NOT NULL
+    ) r WHERE rn = 1
+""")
+
 def init_db():
     Base.metadata.create_all(engine)
+    # Παλιές βάσεις: χτίζει το snapshot μία φορά από το υπάρχον history
+    with SessionLocal() as s:
+        if s.query(OddsLatest).first() is None and s.query(Odds.id).first() is not None:
+            s.execute(_BACKFILL_LATEST_SQL)
+            s.commit()
+            logger.info("[DB] odds_latest backfilled from odds history")
 
 # ------------- HTTP CLIENT (retry) -------------------------------------------
 def make_session() -> requests.Session:
-    s = requests.Session()
-    retries = Retry(
-        total=4, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET", "POST"]
-    )
-    adapter = HTTPAdapter(max_retries=retries)
-    s.mount("http://", adapter)
-    s.mount("https://", adapter)
-    s.headers.update({"User-Agent": "EURO_GOALS/v9"})
-    return s
+    # Κοινό pooled session (keep-alive, gzip, retry με jitter) – modules/http_client.py
+    return http_client.get_session()
 
 http = make_session()
 
@@ -143,8 +171,46 @@ def upsert_match(session, provider_id: str, league: str, home: str, away: str, k
         m.updated_at = datetime.utcnow()
     return m
 
-def insert_odds(session, match: Match, book: str, market: str, price: float, line: Optional[float]):
-    session.add(Odds(match=match, book=book, market=market, price=price, line=line, ts=datetime.utcnow()))
+def insert_odds(session, match, book: str, market: str, price: float, line: Optional[float]):
+    """match: Match ή row με .id / .provider_id (π.χ. από select() στηλών)."""
+    ts = datetime.utcnow()
+    if match.id is None:
+        session.flush()
+    # match_id αντί για relationship: δεν αγγίζει (ούτε φορτώνει) το Match.odds collection
+    session.add(Odds(match_id=match.id, book=book, market=market, price=price, line=line, ts=ts))
+    # Snapshot τρέχουσας τιμής στο ίδιο session/transaction με το history row
+    key = (match.id, market, book)
+    pending = session.info.setdefault("odds_latest", {})  # autoflush=False: νέα rows δεν τα βρίσκει το get()
+    latest = pending.get(key) or session.get(OddsLatest, key)
+    if latest is None:
+        latest = pending[key] = OddsLatest(match_id=match.id, market=market, book=book, price=price, line=line,
+                                           ts=ts, open_price=price, open_ts=ts, ticks=1)
+        session.add(latest)
+    elif latest.ts is None or ts >= latest.ts:
+        latest.price, latest.line, latest.ts = price, line, ts
+        latest.ticks = (latest.ticks or 0) + 1
+    # Columnar price history (modules/odds_store.py): γράφεται μόνο μετά από επιτυχές commit
+    session.info.setdefault("odds_ticks", []).append((match.provider_id, market, book, price, ts, line))
+
+@event.listens_for(SessionLocal, "after_commit")
+def _record_committed_ticks(session):
+    """Τα ticks του transaction περνούν στο odds store μόνο αφού γραφτούν odds / odds_latest."""
+    session.info.pop("odds_latest", None)
+    ticks = session.info.pop("odds_ticks", None)
+    if not ticks:
+        return
+    store = get_odds_store()
+    for provider_id, market, book, price, ts, line in ticks:
+        try:
+            store.record(provider_id, market, book, price, ts=ts, line=line)
+        except Exception as e:
+            logger.warning("[ODDS_STORE] record failed for %s: %s", provider_id, e)
+
+@event.listens_for(SessionLocal, "after_soft_rollback")
+def _discard_rolled_back_ticks(session, previous_transaction):
+    if previous_transaction.parent is None:  # όχι για savepoints
+        session.info.pop("odds_latest", None)
+        session.info.pop("odds_ticks", None)
 
 def create_alert(session, level: str, kind: str, message: str, payload: Dict[str, Any]):
     session.add(Alert(level=level, kind=kind, message=message, payload=json.dumps(payload), created_at=datetime.utcnow()))
@@ -188,25 +254,31 @@ def worker_fetch_besoccer_recent():
 
 def worker_fetch_asian_odds():
     """Poll skeleton: fetch odds for saved matches and detect smart money moves."""
-    prev_prices: Dict[str, float] = {}
+    market, book = "AH -0.5", "Pinnacle"
     while not _stop.is_set():
         try:
             if not ASIAN_API_KEY:
                 time.sleep(30); continue
             with SessionLocal() as s:
-                matches = s.query(Match).filter(Match.kickoff_utc >= datetime.utcnow() - timedelta(hours=6)).all()
+                matches = s.execute(
+                    select(Match.id, Match.provider_id, Match.home, Match.away)
+                    .where(Match.kickoff_utc >= datetime.utcnow() - timedelta(hours=6))
+                ).all()
+                # Προηγούμενη τιμή από το snapshot: ένα query O(matches) (φορτώνει και το identity map του insert_odds)
+                prev_rows = {r.match_id: r.price for r in s.query(OddsLatest).filter(
+                    OddsLatest.market == market, OddsLatest.book == book,
+                    OddsLatest.match_id.in_([m.id for m in matches]))} if matches else {}
                 for m in matches:
                     # Placeholder: simulate odds for AH -0.5 from Pinnacle
-                    prev = prev_prices.get(m.provider_id, 1.92)
+                    prev = prev_rows.get(m.id) or 1.92
                     curr = round(max(1.5, prev - 0.02), 2)  # simulate drop
-                    insert_odds(s, m, book="Pinnacle", market="AH -0.5", price=curr, line=-0.5)
+                    insert_odds(s, m, book=book, market=market, price=curr, line=-0.5)
                     if detect_smart_move(prev, curr):
                         create_alert(
                             s, "critical", "smartmoney",
                             f"Smart Money: {m.home} vs {m.away} ({prev} → {curr})",
-                            {"match_id": m.provider_id, "market": "AH -0.5", "book":"Pinnacle", "prev": prev, "curr": curr}
+                            {"match_id": m.provider_id, "market": market, "book": book, "prev": prev, "curr": curr}
                         )
-                    prev_prices[m.provider_id] = curr
                 s.commit()
             logger.info("[ASIAN] odds polling OK")
         except Exception as e:
@@ -238,21 +310,53 @@ def on_startup():
 @app.on_event("shutdown")
 def on_shutdown():
     _stop.set()
+    get_odds_store().close()
     logger.info("👋 v9.0 shutdown")
 
 # ---- API: Matches ------------------------------------------------------------
+_MATCH_COLUMNS = (Match.id, Match.provider_id, Match.league, Match.home, Match.away, Match.kickoff_utc, Match.status)
+
+def odds_summary(session, match_ids) -> Dict[int, List[Dict[str, Any]]]:
+    """Ανά match: latest / open / move% ανά (market, book) από το odds_latest snapshot."""
+    out: Dict[int, List[Dict[str, Any]]] = {}
+    if not match_ids:
+        return out
+    rows = session.execute(
+        select(OddsLatest.match_id, OddsLatest.market, OddsLatest.book, OddsLatest.price,
+               OddsLatest.open_price, OddsLatest.ts)
+        .where(OddsLatest.match_id.in_(match_ids))
+    ).all()
+    for mid, market, book, price, open_price, ts in rows:
+        move = round(100.0 * (price - open_price) / open_price, 2) if open_price else None
+        out.setdefault(mid, []).append({"market": market, "book": book, "latest": price, "open": open_price,
+                                        "move_pct": move, "ts": ts.isoformat() if ts else None})
+    return out
+
+def list_matches(session, since: datetime, league: Optional[str] = None, with_odds: bool = False):
+    """Lean listing: core select μόνο των στηλών που χρειάζονται (tuples, χωρίς ORM objects)."""
+    stmt = select(*_MATCH_COLUMNS).where(Match.updated_at >= since)
+    if league:
+        stmt = stmt.where(Match.league == league)
+    rows = session.execute(stmt.order_by(Match.kickoff_utc.asc())).all()
+    summary = odds_summary(session, [r[0] for r in rows]) if with_odds else None
+    out = []
+    for mid, provider_id, lg, home, away, kickoff, status in rows:
+        item = {"id": mid, "provider_id": provider_id, "league": lg, "home": home, "away": away,
+                "kickoff_utc": kickoff.isoformat() if kickoff else None, "status": status}
+        if summary is not None:
+            item["odds"] = summary.get(mid, [])
+        out.append(item)
+    return out
+
 @app.get("/api/matches")
-def api_matches(since: Optional[str] = Query(None), league: Optional[str] = Query(None)):
+def api_matches(since: Optional[str] = Query(None), league: Optional[str] = Query(None),
+                odds: bool = Query(False)):
     try:
         dt_since = datetime.fromisoformat(since) if since else datetime.utcnow() - timedelta(days=2)
     except Exception:
         raise HTTPException(400, "Invalid 'since' (use ISO 8601)")
     with SessionLocal() as s:
-        q = s.query(Match).filter(Match.updated_at >= dt_since)
-        if league: q = q.filter(Match.league == league)
-        rows = q.order_by(Match.kickoff_utc.asc()).all()
-        return [{"id": r.id, "provider_id": r.provider_id, "league": r.league, "home": r.home, "away": r.away,
-                 "kickoff_utc": r.kickoff_utc.isoformat(), "status": r.status} for r in rows]
+        return list_matches(s, dt_since, league, with_odds=odds)
 
 # ---- API: Odds ---------------------------------------------------------------
 @app.get("/api/odds")
@@ -266,6 +370,45 @@ def api_odds(match_id: Optional[int] = Query(None), provider_id: Optional[str] =
         return [{"match_id": r.match_id, "book": r.book, "market": r.market, "price": r.price,
                  "line": r.line, "ts": r.ts.isoformat()} for r in rows]
 
+@app.get("/api/odds/latest")
+def api_odds_latest(provider_id: Optional[str] = Query(None), league: Optional[str] = Query(None),
+                    market: Optional[str] = Query(None), book: Optional[str] = Query(None), limit: int = 500):
+    """Τρέχουσες τιμές από το odds_latest snapshot (μία γραμμή ανά match/market/book)."""
+    with SessionLocal() as s:
+        q = s.query(OddsLatest, Match.provider_id).join(Match, Match.id == OddsLatest.match_id)
+        if provider_id: q = q.filter(Match.provider_id == provider_id)
+        if league: q = q.filter(Match.league == league)
+        if market: q = q.filter(OddsLatest.market == market)
+        if book: q = q.filter(OddsLatest.book == book)
+        q = q.order_by(OddsLatest.ts.desc()).limit(max(1, min(limit, 5000)))
+        out = []
+        for r, pid in q.all():
+            move = round(100.0 * (r.price - r.open_price) / r.open_price, 2) if r.open_price else None
+            out.append({"match_id": r.match_id, "provider_id": pid, "book": r.book, "market": r.market,
+                        "price": r.price, "line": r.line, "ts": r.ts.isoformat() if r.ts else None,
+                        "open_price": r.open_price, "move_pct": move, "ticks": r.ticks})
+        return out
+
+@app.get("/api/odds/history")
+def api_odds_history(provider_id: str = Query(...), market: Optional[str] = Query(None), book: Optional[str] = Query(None),
+                     since: Optional[str] = Query(None), until: Optional[str] = Query(None)):
+    """Price history από το odds store (χωρίς row-per-tick ORM query)."""
+    try:
+        start = datetime.fromisoformat(since) if since else None
+        end = datetime.fromisoformat(until) if until else None
+    except Exception:
+        raise HTTPException(400, "Invalid 'since'/'until' (use ISO 8601)")
+    store = get_odds_store()
+    out = []
+    for _, mk, bk in store.keys(provider_id):
+        if (market and mk != market) or (book and bk != book):
+            continue
+        ticks = store.history(provider_id, mk, bk, start, end)
+        out.append({"market": mk, "book": bk,
+                    "ticks": [{"ts": datetime.utcfromtimestamp(t).isoformat(), "price": p, "line": ln}
+                              for t, p, ln in ticks]})
+    return out
+
 # ---- API: Alerts -------------------------------------------------------------
 @app.get("/api/alerts")
 def api_alerts(level: Optional[str] = Query(None), kind: Optional[str] = Query(None), since: Optional[str] = Query(None), limit: int = 200):
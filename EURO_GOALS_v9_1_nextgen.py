@@ -8,7 +8,6 @@
 # ================================================================
 
 import os
-import json
 import time
 import threading
 import logging
@@ -19,6 +18,9 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from dotenv import load_dotenv
 
+from modules.alert_store import get_store
+from modules.status_registry import get_registry
+
 # ---------------------------------------------------------------
 # 1. Φόρτωση .env
 # ---------------------------------------------------------------
@@ -29,9 +31,6 @@ SMARTMONEY_REFRESH = int(os.getenv("SMARTMONEY_REFRESH_INTERVAL", 60))
 GOALMATRIX_REFRESH = int(os.getenv("GOALMATRIX_REFRESH_INTERVAL", 45))
 DUAL_ENGINE_MODE = os.getenv("DUAL_ENGINE_MODE", "ON")
 
-SYSTEM_STATUS_FILE = os.getenv("SYSTEM_STATUS_FILE", "data/system_status.json")
-ALERT_HISTORY_FILE = os.getenv("ALERT_HISTORY_FILE", "data/alert_history.json")
-
 # ---------------------------------------------------------------
 # 2. Logging
 # ---------------------------------------------------------------
@@ -55,41 +54,16 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
 # ---------------------------------------------------------------
-# 4. Utility: update system_status.json & alert_history.json
+# 4. Utility: update system_status.json & alerts (modules/alert_store.py)
 # ---------------------------------------------------------------
 def update_status(engine_name: str, state: str):
-    """Ενημερώνει το system_status.json"""
-    try:
-        os.makedirs(os.path.dirname(SYSTEM_STATUS_FILE), exist_ok=True)
-        data = {}
-        if os.path.exists(SYSTEM_STATUS_FILE):
-            with open(SYSTEM_STATUS_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        data[engine_name] = {
-            "status": state,
-            "last_update": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        with open(SYSTEM_STATUS_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
-    except Exception as e:
-        logger.error(f"Σφάλμα ενημέρωσης system_status.json: {e}")
+    """Ενημερώνει το status στη μνήμη (flush σε system_status.json: modules/status_registry.py)"""
+    get_registry().update(engine_name, state)
 
 def append_alert(source: str, message: str):
-    """Καταγραφή νέας ειδοποίησης"""
+    """Καταγράφει νέα ειδοποίηση (ring buffer + append-only log, modules/alert_store.py)"""
     try:
-        os.makedirs(os.path.dirname(ALERT_HISTORY_FILE), exist_ok=True)
-        data = []
-        if os.path.exists(ALERT_HISTORY_FILE):
-            with open(ALERT_HISTORY_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        entry = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "source": source,
-            "message": message
-        }
-        data.insert(0, entry)
-        with open(ALERT_HISTORY_FILE, "w", encoding="utf-8") as f:
-            json.dump(data[:500], f, indent=4, ensure_ascii=False)
+        get_store().append(source, message)
     except Exception as e:
         logger.error(f"Σφάλμα καταγραφής ειδοποίησης: {e}")
 
@@ -140,22 +114,14 @@ def home(request: Request):
 
 @app.get("/status")
 def get_status():
-    try:
-        if os.path.exists(SYSTEM_STATUS_FILE):
-            with open(SYSTEM_STATUS_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return JSONResponse(content=data)
-        return JSONResponse(content={"status": "no data yet"})
-    except Exception as e:
-        return JSONResponse(content={"error": str(e)})
+    """Επιστρέφει την τρέχουσα κατάσταση των μηχανών (από τη μνήμη)"""
+    data = get_registry().snapshot()
+    return JSONResponse(content=data or {"status": "no data yet"})
 
 @app.get("/alerts")
-def get_alerts():
-    if os.path.exists(ALERT_HISTORY_FILE):
-        with open(ALERT_HISTORY_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return JSONResponse(content=data)
-    return JSONResponse(content={"alerts": []})
+def get_alerts(limit: int = 0, source: str = ""):
+    """Επιστρέφει το ιστορικό ειδοποιήσεων (νεότερα πρώτα, από τη μνήμη)"""
+    return JSONResponse(content=get_store().recent(limit=limit or None, source=source or None))
 
 # ---------------------------------------------------------------
 # 7.5 /health_dual Route (ενισχυμένο)
@@ -164,11 +130,9 @@ def get_alerts():
 def health_dual():
     """Επιστρέφει συνοπτική εικόνα λειτουργίας SmartMoney + GoalMatrix"""
     try:
-        if not os.path.exists(SYSTEM_STATUS_FILE):
-            return JSONResponse(content={"status": "FAIL", "summary": "No system_status.json found"})
-
-        with open(SYSTEM_STATUS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = get_registry().snapshot()
+        if not data:
+            return JSONResponse(content={"status": "FAIL", "summary": "No engine status yet"})
 
         smart = data.get("SmartMoney", {}).get("status", "unknown")
         goal = data.get("GoalMatrix", {}).get("status", "unknown")
@@ -220,6 +184,10 @@ def startup_event():
     start_engines()
     logger.info("✅ Dual Engine ενεργό και συγχρονισμένο.")
 
+@app.on_event("shutdown")
+def shutdown_event():
+    get_registry().close()
+
 # ---------------------------------------------------------------
 # 9. Run
 # ---------------------------------------------------------------
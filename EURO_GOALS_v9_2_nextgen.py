@@ -6,12 +6,14 @@
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from datetime import datetime
 import requests
 import os
 from dotenv import load_dotenv
 
+from modules.db_engine import get_read_engine
+
 # --------------------------------------------------------------
 # LOAD ENVIRONMENT
 # --------------------------------------------------------------
@@ -29,10 +31,7 @@ BESOCCER_API_KEY = os.getenv("BESOCCER_API_KEY", "")
 app = FastAPI()
 templates = Jinja2Templates(directory="templates")
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+engine = get_read_engine(DATABASE_URL)  # μόνο dashboard/health queries
 
 # --------------------------------------------------------------
 # DATABASE HEALTH CHECK
@@ -6,11 +6,13 @@ from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from datetime import datetime
 import os
 
 from dotenv import load_dotenv
+
+from modules.db_engine import get_read_engine
 from health_check import run_full_healthcheck
 from render_status_monitor import get_render_status
 
@@ -35,10 +37,7 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 # Database connection
 # ------------------------------------------------------------
 try:
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-    )
+    engine = get_read_engine(DATABASE_URL)  # μόνο dashboard/health queries
     with engine.connect() as conn:
         conn.execute(text("SELECT 1"))
     DB_STATUS = f"Connected ({'SQLite' if 'sqlite' in DATABASE_URL else 'PostgreSQL'})"
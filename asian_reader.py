@@ -6,10 +6,11 @@
 import os
 import json
 import time
-import requests
 from datetime import datetime
 from dotenv import load_dotenv
 
+from modules import http_client
+
 load_dotenv()
 
 # ------------------------------------------------------------
@@ -63,7 +64,7 @@ def get_asian_odds():
 
         headers = {"Authorization": f"Bearer {ASIAN_API_KEY}"}
         url = f"{ASIAN_BASE_URL}/v1/odds"
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_client.get(url, provider="asianconnect", headers=headers)
 
         if response.status_code == 200:
             data = response.json()
@@ -0,0 +1,60 @@
+# ==============================================
+# EURO_GOALS – HTML backend benchmark
+# ==============================================
+# Μετρά την εξαγωγή αγώνων από αποθηκευμένη σελίδα αποτελεσμάτων Flashscore:
+#   legacy  = BeautifulSoup(html.parser) + select_one ανά πεδίο (παλιό season_manager)
+#   bs4 / lxml / selectolax = modules/html_backend.extract_rows
+# και προβάλλει τον χρόνο για backfill 5 σεζόν × όλες τις λίγκες του season_manager.
+#   python benchmark_html_backend.py [path] [runs]
+# ==============================================
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from modules.html_backend import available_backends
+from season_manager import FLASH_LEAGUES, parse_matches
+
+SAMPLE_PATH = os.path.join("data", "fixtures", "flashscore_results_sample.html")
+BACKFILL_PAGES = 5 * len(FLASH_LEAGUES)
+
+
+def legacy_parse(html):
+    soup = BeautifulSoup(html, "html.parser")
+    matches = []
+    for match in soup.select("div.event__match"):
+        date = match.get("data-date")
+        home = match.select_one(".event__participant--home").text.strip() if match.select_one(".event__participant--home") else ""
+        away = match.select_one(".event__participant--away").text.strip() if match.select_one(".event__participant--away") else ""
+        score = match.select_one(".event__scores").text.strip() if match.select_one(".event__scores") else ""
+        matches.append({"date": date, "home": home, "away": away, "score": score})
+    return matches
+
+
+def timed(fn, html, runs):
+    fn(html)  # warm-up (selector compile / imports)
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        rows = fn(html)
+    return (time.perf_counter() - t0) / runs, len(rows)
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else SAMPLE_PATH
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    with open(path, encoding="utf-8") as fh:
+        html = fh.read()
+
+    print(f"[BENCH] {path}: {len(html) / 1024:.0f} KB, {runs} runs, backfill = {BACKFILL_PAGES} pages")
+    base, n = timed(legacy_parse, html, runs)
+    print(f"[BENCH] {'legacy':<11} {base * 1000:8.1f} ms/page  {n:4d} rows  "
+          f"backfill {base * BACKFILL_PAGES:6.2f} s  x1.0")
+    for backend in available_backends():
+        per_page, n = timed(lambda h: parse_matches(h, backend=backend), html, runs)
+        print(f"[BENCH] {backend:<11} {per_page * 1000:8.1f} ms/page  {n:4d} rows  "
+              f"backfill {per_page * BACKFILL_PAGES:6.2f} s  x{base / per_page:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# ==============================================
+# EURO_GOALS – /api/matches benchmark (v9.0)
+# ==============================================
+# Μετρά το listing αγώνων όσο μεγαλώνει το odds history:
+#   selectin = παλιό s.query(Match) με eager selectin φόρτωση όλων των odds
+#   lean     = list_matches() – core select στηλών (tuples)
+#   summary  = list_matches(with_odds=True) – + latest/open/move% από odds_latest
+# Χρησιμοποιεί προσωρινή SQLite βάση (δεν αγγίζει το matches.db).
+#   python benchmark_match_listing.py [matches] [runs]
+# ==============================================
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_TMP = tempfile.mkdtemp(prefix="eg_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP, 'bench.db')}"
+os.environ["ODDS_STORE_DIR"] = os.path.join(_TMP, "odds_store")
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload
+
+import EURO_GOALS_v9_0_nextgen as app
+
+HISTORY_STEPS = (0, 20, 100, 400)  # ticks ανά αγώνα
+BOOKS = ("Pinnacle", "SBO", "188")
+_latest = {}  # (match_id, market, book) -> odds_latest row
+
+
+def seed_matches(n):
+    now = datetime.utcnow()
+    with app.SessionLocal() as s:
+        s.execute(insert(app.Match), [
+            {"provider_id": f"BENCH{i}", "league": "EPL", "home": f"Home {i}", "away": f"Away {i}",
+             "kickoff_utc": now + timedelta(hours=i % 48), "status": "scheduled",
+             "created_at": now, "updated_at": now}
+            for i in range(n)
+        ])
+        s.commit()
+        return [mid for (mid,) in s.execute(select(app.Match.id)).all()]
+
+
+def grow_history(match_ids, ticks_per_match):
+    """Προσθέτει ticks σε odds (bulk) και ενημερώνει το odds_latest όπως το insert_odds."""
+    now = datetime.utcnow()
+    rows = []
+    for mid in match_ids:
+        price = 1.95
+        for k in range(ticks_per_match):
+            book = BOOKS[k % len(BOOKS)]
+            price = round(max(1.3, price + random.uniform(-0.03, 0.02)), 2)
+            ts = now + timedelta(seconds=k)
+            rows.append({"match_id": mid, "book": book, "market": "AH -0.5", "price": price, "line": -0.5, "ts": ts})
+            key = (mid, "AH -0.5", book)
+            prev = _latest.get(key)
+            _latest[key] = {"match_id": mid, "market": "AH -0.5", "book": book, "price": price, "line": -0.5,
+                           "ts": ts, "open_price": prev["open_price"] if prev else price,
+                           "open_ts": prev["open_ts"] if prev else ts, "ticks": (prev["ticks"] + 1) if prev else 1}
+    with app.SessionLocal() as s:
+        if rows:
+            s.execute(insert(app.Odds), rows)
+        s.query(app.OddsLatest).delete()
+        if _latest:
+            s.execute(insert(app.OddsLatest), list(_latest.values()))
+        s.commit()
+
+
+def legacy_listing(since):
+    with app.SessionLocal() as s:
+        rows = (s.query(app.Match).options(selectinload(app.Match.odds))
+                .filter(app.Match.updated_at >= since).order_by(app.Match.kickoff_utc.asc()).all())
+        return [{"id": r.id, "provider_id": r.provider_id, "league": r.league, "home": r.home, "away": r.away,
+                 "kickoff_utc": r.kickoff_utc.isoformat(), "status": r.status} for r in rows]
+
+
+def lean_listing(since):
+    with app.SessionLocal() as s:
+        return app.list_matches(s, since)
+
+
+def summary_listing(since):
+    with app.SessionLocal() as s:
+        return app.list_matches(s, since, with_odds=True)
+
+
+def timed(fn, since, runs):
+    fn(since)  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        out = fn(since)
+    return (time.perf_counter() - t0) / runs * 1000, len(out)
+
+
+def main():
+    n_matches = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    app.init_db()
+    match_ids = seed_matches(n_matches)
+    since = datetime.utcnow() - timedelta(days=2)
+    print(f"[BENCH] {n_matches} matches, {runs} runs, DB {os.environ['DATABASE_URL']}")
+    print(f"[BENCH] {'odds rows':>10} {'selectin':>12} {'lean':>10} {'summary':>10}")
+    done = 0
+    for ticks in HISTORY_STEPS:
+        grow_history(match_ids, ticks - done)
+        done = ticks
+        legacy, _ = timed(legacy_listing, since, runs)
+        lean, _ = timed(lean_listing, since, runs)
+        summary, _ = timed(summary_listing, since, runs)
+        print(f"[BENCH] {ticks * n_matches:>10} {legacy:9.1f} ms {lean:7.1f} ms {summary:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
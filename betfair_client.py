@@ -5,10 +5,11 @@
 
 import os
 import json
-import requests
 from datetime import datetime
 from typing import List, Dict, Any
 
+from modules import http_client
+
 BETFAIR_JSONRPC_URL = "https://api.betfair.com/exchange/betting/json-rpc/v1"
 
 class BetfairClient:
@@ -40,7 +41,7 @@ class BetfairClient:
             "params": params,
             "id": 1
         }]
-        resp = requests.post(BETFAIR_JSONRPC_URL, headers=self.headers, data=json.dumps(payload), timeout=12)
+        resp = http_client.post(BETFAIR_JSONRPC_URL, provider="betfair", headers=self.headers, data=json.dumps(payload))
         resp.raise_for_status()
         data = resp.json()
         if isinstance(data, list) and "result" in data[0]:
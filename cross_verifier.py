@@ -1,22 +1,24 @@
 # ==============================================
 # CROSS VERIFIER MODULE (EURO_GOALS v7.2 – Safe)
 # ==============================================
-# Συγκρίνει Sofascore & Flashscore από τον πίνακα `matches`
+# Συγκρίνει όλες τις live πηγές (Sofascore, Flashscore, API-Football,
+# Football-Data) από τον πίνακα `matches` – quorum: modules/score_reconciler.py
 # Αποθηκεύει αποτέλεσμα σε `verifier_state` (ΔΕΝ αλλάζει matches)
 # και γράφει διαγνωστικά logs για αποκλίσεις.
 # ==============================================
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, inspect, text
 from datetime import datetime
+import json
 import os
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///matches.db")
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+from modules.db_engine import get_engine
+from modules.db_schema import LIVE_STATUSES
+from modules.identity_index import get_index, match_id
+from modules.score_reconciler import group_latest, reconcile
 
-LIVE_STATUSES = ("live", "inprogress", "1st_half", "2nd_half", "extra_time")
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///matches.db")
+engine = get_engine(DATABASE_URL)
 
 def log(msg: str) -> None:
     print(f"[CROSS_VERIFIER] {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} - {msg}")
@@ -33,102 +35,212 @@ def ensure_tables():
                 flash_score TEXT,
                 decided     TEXT,
                 note        TEXT,
+                sources     TEXT,
                 updated_at  TEXT
             )
         """))
+    # Παλιές βάσεις: στήλη με τα σκορ όλων των πηγών (JSON)
+    if "sources" not in {c["name"] for c in inspect(engine).get_columns("verifier_state")}:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE verifier_state ADD COLUMN sources TEXT"))
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS verifier_meta (
+                key   TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """))
+        if conn.execute(text("SELECT 1 FROM verifier_meta WHERE key = :k"), {"k": REKEY_KEY}).fetchone() is None:
+            _rekey_legacy_state(conn)
 
-def _mk_key(home: str, away: str) -> str:
-    return f"{home.strip().lower()}__{away.strip().lower()}"
+WATERMARK_KEY = "matches.updated_at"
+REKEY_KEY = "verifier_state.rekey"
+
+def _rekey_legacy_state(conn):
+    """
+    Μία φορά: τα παλιά keys ("home__away" χωρίς ημερομηνία) γίνονται το κοινό
+    dated match id του identity index. Το verifier_state δεν έχει kickoff, οπότε
+    η ημερομηνία βγαίνει από το updated_at (live αγώνας → ίδια μέρα)· σε σύγκρουση
+    κρατιέται το νεότερο row.
+    """
+    rows = conn.execute(text("""
+        SELECT match_key, home, away, updated_at FROM verifier_state
+        WHERE match_key NOT LIKE '%:%' ORDER BY updated_at
+    """)).fetchall()
+    moved = 0
+    for old_key, home, away, updated_at in rows:
+        new_key = match_id(home or "", away or "", str(updated_at or "")[:10] or None)
+        if new_key == old_key:
+            continue
+        newer = conn.execute(text("SELECT updated_at FROM verifier_state WHERE match_key = :k"),
+                             {"k": new_key}).scalar()
+        if newer is not None and str(newer) >= str(updated_at or ""):
+            conn.execute(text("DELETE FROM verifier_state WHERE match_key = :k"), {"k": old_key})
+        else:
+            conn.execute(text("DELETE FROM verifier_state WHERE match_key = :k"), {"k": new_key})
+            conn.execute(text("UPDATE verifier_state SET match_key = :new WHERE match_key = :old"),
+                         {"new": new_key, "old": old_key})
+        moved += 1
+    conn.execute(text("INSERT INTO verifier_meta (key, value) VALUES (:k, :v)"),
+                 {"k": REKEY_KEY, "v": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")})
+    if moved:
+        log(f"🔑 {moved} verifier_state rows → canonical match ids")
+
+# Ημερομηνία kickoff για το canonical id (ίδιο με SmartMoney / asian_reader)
+_KICKOFF = "COALESCE(CAST(kickoff_utc AS TEXT), date)"
+
+_LIVE_ROWS_SQL = text(f"""
+    SELECT home, away, {_KICKOFF} AS kickoff, score, source, updated_at
+    FROM matches
+    WHERE status IN :st
+    ORDER BY updated_at DESC
+""").bindparams(bindparam("st", expanding=True))
+
+_LIVE_ROWS_FOR_SQL = text(f"""
+    SELECT home, away, {_KICKOFF} AS kickoff, score, source, updated_at
+    FROM matches
+    WHERE status IN :st AND home IN :homes AND away IN :aways
+    ORDER BY updated_at DESC
+""").bindparams(bindparam("st", expanding=True), bindparam("homes", expanding=True),
+                bindparam("aways", expanding=True))
+
+_TOUCHED_SQL = text(f"""
+    SELECT home, away, {_KICKOFF} AS kickoff, MAX(updated_at)
+    FROM matches
+    WHERE status IN :st AND updated_at >= :wm
+    GROUP BY home, away, {_KICKOFF}
+""").bindparams(bindparam("st", expanding=True))
+
+_MAX_LIVE_UPDATED_SQL = text("""
+    SELECT MAX(updated_at) FROM matches WHERE status IN :st
+""").bindparams(bindparam("st", expanding=True))
+
+_UPSERT_STATE_SQL = text("""
+    INSERT INTO verifier_state (match_key, home, away, sofa_score, flash_score, decided, note, sources, updated_at)
+    VALUES (:k, :h, :a, :sofa, :flash, :decided, :note, :sources, :ts)
+    ON CONFLICT(match_key) DO UPDATE SET
+        sofa_score = excluded.sofa_score,
+        flash_score = excluded.flash_score,
+        decided    = excluded.decided,
+        note       = excluded.note,
+        sources    = excluded.sources,
+        updated_at = excluded.updated_at
+""")
+
+def _mk_key(home: str, away: str, kickoff=None) -> str:
+    # Canonical ομάδες + ημερομηνία kickoff (identity index) – το ίδιο id με
+    # SmartMoney / asian_reader για κάθε γραφή του ίδιου αγώνα
+    return match_id(home, away, kickoff)
 
 def _pick_decision(sofa_score: str | None, flash_score: str | None) -> tuple[str | None, str]:
     """
-    Επιλογή "καλύτερης" τιμής σκορ.
-    Κανόνας v1:
-      - Αν υπάρχει μόνο μία τιμή → αυτή.
-      - Αν διαφέρουν → προτεραιότητα Sofascore, αλλιώς Flashscore.
+    Επιλογή "καλύτερης" τιμής σκορ για Sofascore/Flashscore.
+    Wrapper γύρω από modules/score_reconciler.reconcile (βάρη + quorum).
     Επιστρέφει (decided, note).
     """
-    if sofa_score and not flash_score:
-        return sofa_score, "only_sofascore"
-    if flash_score and not sofa_score:
-        return flash_score, "only_flashscore"
-    if not sofa_score and not flash_score:
-        return None, "no_data"
-
-    if sofa_score == flash_score:
-        return sofa_score, "agree"
-    # Διαφέρουν → προτεραιότητα Sofascore (v1 απλός κανόνας)
-    return sofa_score, f"disagree_sofa_pref (sofa={sofa_score}, flash={flash_score})"
-
-def verify_and_update():
+    decided, note, _ = reconcile({"Sofascore": (sofa_score, None), "Flashscore": (flash_score, None)})
+    return decided, note
+
+def _get_watermark(conn):
+    row = conn.execute(text("SELECT value FROM verifier_meta WHERE key = :k"), {"k": WATERMARK_KEY}).fetchone()
+    return row[0] if row else None
+
+def _set_watermark(conn, value):
+    updated = conn.execute(text("UPDATE verifier_meta SET value = :v WHERE key = :k"),
+                           {"k": WATERMARK_KEY, "v": value}).rowcount
+    if not updated:
+        conn.execute(text("INSERT INTO verifier_meta (key, value) VALUES (:k, :v)"),
+                     {"k": WATERMARK_KEY, "v": value})
+
+def reset_watermark():
+    """Η επόμενη εκτέλεση ξαναεπεξεργάζεται όλα τα live rows."""
+    ensure_tables()
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM verifier_meta WHERE key = :k"), {"k": WATERMARK_KEY})
+
+def verify_and_update(incremental=True):
     """
     Φορτώνει τα πιο πρόσφατα live rows ανά (home, away) για κάθε source,
     υπολογίζει απόφαση και ενημερώνει τον πίνακα verifier_state.
+    Με incremental=True εξετάζονται μόνο τα ζευγάρια που άλλαξαν από το
+    τελευταίο watermark (updated_at) και γράφονται με ένα bulk upsert.
     """
     ensure_tables()
 
     with engine.begin() as conn:
-        # Φέρνουμε τα πιο πρόσφατα live rows (τελευταίο update σε προτεραιότητα)
-        rows = conn.execute(text(f"""
-            SELECT home, away, score, source, updated_at
-            FROM matches
-            WHERE status IN :st
-            ORDER BY updated_at DESC
-        """), {"st": LIVE_STATUSES}).mappings().all()
-
-    # Ομαδοποίηση: (home, away) -> { 'Sofascore': {...}, 'Flashscore': {...} }
-    latest: dict[tuple[str, str], dict[str, dict]] = {}
-    for r in rows:
-        key = (r["home"], r["away"])
-        src = (r["source"] or "").strip()
-        if src not in ("Sofascore", "Flashscore", "Verified"):
-            continue
-        # Κρατάμε το πρώτο (είναι ήδη ταξινομημένα DESC κατά updated_at)
-        if key not in latest:
-            latest[key] = {}
-        if src not in latest[key]:
-            latest[key][src] = dict(r)
-
-    # Υπολογισμός αποφάσεων & αποθήκευση κατάστασης
-    upserts = 0
+        watermark = _get_watermark(conn) if incremental else None
+        if watermark is None:
+            touched = None  # πρώτη / πλήρης εκτέλεση
+            new_watermark = conn.execute(_MAX_LIVE_UPDATED_SQL, {"st": LIVE_STATUSES}).scalar()
+        else:
+            # >= ώστε rows με ίδιο updated_at που γράφτηκαν μετά το προηγούμενο run να μη χαθούν
+            changed = conn.execute(_TOUCHED_SQL, {"st": LIVE_STATUSES, "wm": watermark}).fetchall()
+            touched = {(r[0], r[1], r[2]) for r in changed}
+            new_watermark = max((r[3] for r in changed), default=watermark)
+
+        if touched is None:
+            # Φέρνουμε τα πιο πρόσφατα live rows (τελευταίο update σε προτεραιότητα)
+            rows = conn.execute(_LIVE_ROWS_SQL, {"st": LIVE_STATUSES}).mappings().all()
+        elif touched:
+            # Όλες οι γνωστές γραφές των ομάδων, ώστε να έρθουν και οι άλλοι providers
+            index = get_index()
+            rows = conn.execute(_LIVE_ROWS_FOR_SQL, {
+                "st": LIVE_STATUSES,
+                "homes": sorted(set().union(*(index.spellings(h) for h, _, _ in touched))),
+                "aways": sorted(set().union(*(index.spellings(a) for _, a, _ in touched))),
+            }).mappings().all()
+        else:
+            rows = []
+
+    # Ομαδοποίηση σε ένα πέρασμα: canonical match key -> {source: (score, updated_at)}
+    names = {}
+    def _row_key(r):
+        k = _mk_key(r["home"], r["away"], r["kickoff"])
+        names.setdefault(k, (r["home"], r["away"]))
+        return k
+    latest = group_latest(rows, key=_row_key)
+    touched_keys = None if touched is None else {_mk_key(h, a, ko) for h, a, ko in touched}
+
+    # Υπολογισμός αποφάσεων (quorum πάνω σε όλες τις πηγές) & αποθήκευση κατάστασης
     discrepancies = 0
     now = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+    params = []
+
+    for match_key, sources in latest.items():
+        if touched_keys is not None and match_key not in touched_keys:
+            continue  # το IN (homes) × IN (aways) φέρνει και άσχετα ζευγάρια
+        home, away = names[match_key]
+        sofa_score = sources.get("Sofascore", (None,))[0]
+        flash_score = sources.get("Flashscore", (None,))[0]
+
+        decided, note, _ = reconcile(sources)
+        if note.startswith("disagree"):
+            discrepancies += 1
+            log(f"⚠️ Διαφορά σκορ για {home} – {away}: {note}")
+
+        params.append({
+            "k": match_key,
+            "h": home,
+            "a": away,
+            "sofa": sofa_score,
+            "flash": flash_score,
+            "decided": decided,
+            "note": note,
+            "sources": json.dumps({src: score for src, (score, _) in sorted(sources.items())}),
+            "ts": now
+        })
 
     with engine.begin() as conn:
-        for (home, away), sources in latest.items():
-            sofa_score = sources.get("Sofascore", {}).get("score")
-            flash_score = sources.get("Flashscore", {}).get("score")
-
-            decided, note = _pick_decision(sofa_score, flash_score)
-            if note.startswith("disagree"):
-                discrepancies += 1
-                log(f"⚠️ Διαφορά σκορ για {home} – {away}: Sofascore={sofa_score}, Flashscore={flash_score}")
-
-            match_key = _mk_key(home, away)
-            conn.execute(text("""
-                INSERT INTO verifier_state (match_key, home, away, sofa_score, flash_score, decided, note, updated_at)
-                VALUES (:k, :h, :a, :sofa, :flash, :decided, :note, :ts)
-                ON CONFLICT(match_key) DO UPDATE SET
-                    sofa_score = excluded.sofa_score,
-                    flash_score = excluded.flash_score,
-                    decided    = excluded.decided,
-                    note       = excluded.note,
-                    updated_at = excluded.updated_at
-            """), {
-                "k": match_key,
-                "h": home,
-                "a": away,
-                "sofa": sofa_score,
-                "flash": flash_score,
-                "decided": decided,
-                "note": note,
-                "ts": now
-            })
-            upserts += 1
-
-    log(f"🟢 Cross Verification ολοκληρώθηκε: {upserts} matches, {discrepancies} discrepancies.")
+        if params:
+            conn.execute(_UPSERT_STATE_SQL, params)  # ένα bulk upsert
+        if new_watermark is not None:
+            _set_watermark(conn, str(new_watermark))
+
+    mode = "full" if touched is None else "incremental"
+    log(f"🟢 Cross Verification ({mode}) ολοκληρώθηκε: {len(params)} matches, {discrepancies} discrepancies.")
     # Επιστρέφουμε μικρή σύνοψη για πιθανή χρήση από API/monitor
-    return {"processed": upserts, "discrepancies": discrepancies, "timestamp": now}
+    return {"processed": len(params), "discrepancies": discrepancies, "timestamp": now,
+            "mode": mode, "watermark": None if new_watermark is None else str(new_watermark)}
 
 if __name__ == "__main__":
     verify_and_update()
@@ -13,10 +13,11 @@ import os
 import random
 import time
 import json
-import requests
 from datetime import datetime
 from dotenv import load_dotenv
 
+from modules import http_client
+
 load_dotenv()
 
 DIGITAIN_API_URL = os.getenv("DIGITAIN_API_URL", "")
@@ -82,7 +83,7 @@ def get_digitain_smartmoney():
             matches = generate_mock_data()
         else:
             headers = {"Authorization": f"Bearer {DIGITAIN_API_KEY}"}
-            resp = requests.get(f"{DIGITAIN_API_URL}/odds", headers=headers, timeout=15)
+            resp = http_client.get(f"{DIGITAIN_API_URL}/odds", provider="digitain", headers=headers)
             if resp.status_code != 200:
                 raise Exception(f"API error {resp.status_code}")
             raw_data = resp.json()
@@ -9,7 +9,6 @@
 # ================================================================
 
 import os
-import json
 import time
 import threading
 import logging
@@ -18,6 +17,9 @@ from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 
+from modules.alert_store import get_store
+from modules.status_registry import get_registry
+
 # ---------------------------------------------------------------
 # 1. Φόρτωση .env
 # ---------------------------------------------------------------
@@ -27,7 +29,6 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///matches.db")
 SMARTMONEY_REFRESH = int(os.getenv("SMARTMONEY_REFRESH_INTERVAL", 60))
 GOALMATRIX_REFRESH = int(os.getenv("GOALMATRIX_REFRESH_INTERVAL", 45))
 DUAL_ENGINE_MODE = os.getenv("DUAL_ENGINE_MODE", "ON")
-SYSTEM_STATUS_FILE = os.getenv("SYSTEM_STATUS_FILE", "data/system_status.json")
 
 SMARTMONEY_LOG = os.getenv("SMARTMONEY_LOG_FILE", "logs/smartmoney.log")
 GOALMATRIX_LOG = os.getenv("GOALMATRIX_LOG_FILE", "logs/goalmatrix.log")
@@ -90,39 +91,13 @@ def goalmatrix_engine():
 # 5. Καταγραφή Κατάστασης & Ειδοποιήσεων
 # ---------------------------------------------------------------
 def update_status(engine_name: str, state: str):
-    """Ενημερώνει το system_status.json"""
-    try:
-        os.makedirs(os.path.dirname(SYSTEM_STATUS_FILE), exist_ok=True)
-        data = {}
-        if os.path.exists(SYSTEM_STATUS_FILE):
-            with open(SYSTEM_STATUS_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        data[engine_name] = {
-            "status": state,
-            "last_update": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        with open(SYSTEM_STATUS_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
-    except Exception as e:
-        logger.error(f"Σφάλμα ενημέρωσης system_status.json: {e}")
+    """Ενημερώνει το status στη μνήμη (flush σε system_status.json: modules/status_registry.py)"""
+    get_registry().update(engine_name, state)
 
 def append_alert(source: str, message: str):
-    """Καταγράφει νέα ειδοποίηση στο alert_history.json"""
+    """Καταγράφει νέα ειδοποίηση (ring buffer + append-only log, modules/alert_store.py)"""
     try:
-        os.makedirs("data", exist_ok=True)
-        alert_file = os.getenv("ALERT_HISTORY_FILE", "data/alert_history.json")
-        data = []
-        if os.path.exists(alert_file):
-            with open(alert_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        entry = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "source": source,
-            "message": message
-        }
-        data.insert(0, entry)
-        with open(alert_file, "w", encoding="utf-8") as f:
-            json.dump(data[:500], f, indent=4, ensure_ascii=False)
+        get_store().append(source, message)
     except Exception as e:
         logger.error(f"Σφάλμα καταγραφής ειδοποίησης: {e}")
 
@@ -133,26 +108,14 @@ app = FastAPI(title="EURO_GOALS Dual Engine API", version="9.1")
 
 @app.get("/status")
 def get_status():
-    """Επιστρέφει την τρέχουσα κατάσταση των δύο μηχανών"""
-    try:
-        if os.path.exists(SYSTEM_STATUS_FILE):
-            with open(SYSTEM_STATUS_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return JSONResponse(content=data)
-        else:
-            return JSONResponse(content={"status": "no data yet"})
-    except Exception as e:
-        return JSONResponse(content={"error": str(e)})
+    """Επιστρέφει την τρέχουσα κατάσταση των μηχανών (από τη μνήμη)"""
+    data = get_registry().snapshot()
+    return JSONResponse(content=data or {"status": "no data yet"})
 
 @app.get("/alerts")
-def get_alerts():
-    """Επιστρέφει το ιστορικό ειδοποιήσεων"""
-    alert_file = os.getenv("ALERT_HISTORY_FILE", "data/alert_history.json")
-    if os.path.exists(alert_file):
-        with open(alert_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return JSONResponse(content=data)
-    return JSONResponse(content={"alerts": []})
+def get_alerts(limit: int = 0, source: str = ""):
+    """Επιστρέφει το ιστορικό ειδοποιήσεων (νεότερα πρώτα, από τη μνήμη)"""
+    return JSONResponse(content=get_store().recent(limit=limit or None, source=source or None))
 
 # ---------------------------------------------------------------
 # 7. Εκκίνηση Threads
@@ -179,6 +142,10 @@ def on_startup():
     start_engines()
     logger.info("✅ Dual Engine ενεργό και συγχρονισμένο.")
 
+@app.on_event("shutdown")
+def on_shutdown():
+    get_registry().close()
+
 # ---------------------------------------------------------------
 # 8.5 Dual Engine Health Route
 # ---------------------------------------------------------------
@@ -186,12 +153,9 @@ def on_startup():
 def health_dual():
     """Επιστρέφει συνοπτική εικόνα λειτουργίας SmartMoney + GoalMatrix"""
     try:
-        status_path = os.getenv("SYSTEM_STATUS_FILE", "data/system_status.json")
-        if not os.path.exists(status_path):
-            return {"status": "FAIL", "summary": "No system_status.json found"}
-
-        with open(status_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = get_registry().snapshot()
+        if not data:
+            return {"status": "FAIL", "summary": "No engine status yet"}
 
         smart_status = data.get("SmartMoney", {}).get("status", "unknown")
         goal_status = data.get("GoalMatrix", {}).get("status", "unknown")
@@ -5,19 +5,22 @@ import time
 import json
 import random
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
 
 import pandas as pd
 
 # --- Optional JS-capable HTTP client for Flashscore (falls back if not available)
-try:
-    from requests_html import HTMLSession
-    JS_ENABLED = True
-except Exception:
-    JS_ENABLED = False
+from modules.browser_pool import BrowserPool, JS_ENABLED
+from flashscore_feed_reader import get_week_matches, to_week_rows
 
 EXCEL_PATH = r"C:\EURO_GOALS\EURO_GOALS_v6d.xlsx"
 MATCHES_SHEET = "Matches"
+# Headless browsers rendering league pages in parallel
+FLASH_BROWSERS = int(os.getenv("FLASH_BROWSERS", 4))
+# Min,max seconds between two renders against Flashscore across all browsers ("0" disables)
+FLASH_RENDER_DELAY = tuple(float(x) for x in (os.getenv("FLASH_RENDER_DELAY", "1.0,2.0").split(",") * 2)[:2])
+# "feed" = parse the x/feed endpoint first, render only leagues it did not cover; "browser" = render all
+FLASH_SOURCE = os.getenv("FLASH_SOURCE", "feed").lower()
 
 # Countries & leagues to fetch (Flashscore league paths).
 # We focus on: England (all), Germany 1-3, Greece 1-3, and Europe 1-2 divisions.
@@ -100,74 +103,88 @@ def polite_sleep(a=1.0, b=2.0):
 
 # --- Flashscore scraping (best-effort) -------------------------------------------------------
 
-def fetch_league_week(code: str, info: Dict, days: int = 7) -> pd.DataFrame:
+def _week_labels(days: int) -> Dict[str, "date"]:
+    """Human-readable date labels as shown on the site (approx) -> date, for today..today+days."""
+    today = datetime.now().date()
+    labels = {}
+    for offset in range(0, days+1):
+        d = today + timedelta(days=offset)
+        labels[d.strftime("%d %b %Y").lower()] = d  # e.g., '11 oct 2025'
+    return labels
+
+def fetch_league_week(code: str, info: Dict, days: int = 7, pool: Optional[BrowserPool] = None,
+                      skip_dates: Optional[Set[str]] = None) -> pd.DataFrame:
     """
     Best-effort fetch of a league for the next `days` from Flashscore.
+    The fixtures page is rendered ONCE and all day blocks are parsed in a single pass.
+    Days in `skip_dates` (YYYY-MM-DD, already covered by the x/feed) are not collected.
     Requires requests_html for JS rendering. If not present, returns empty and warns.
     """
     if not JS_ENABLED:
         print(f"[WARN] requests_html not installed; skip Flashscore for {code} ({info['name']}).")
         return pd.DataFrame(columns=["Date","Country","LeagueCode","LeagueName","HomeTeam","AwayTeam","HomeGoals","AwayGoals"])
 
-    session = HTMLSession()
+    own_pool = pool is None
+    if own_pool:
+        pool = BrowserPool(size=1, delay=FLASH_RENDER_DELAY)
     headers = {"User-Agent": USER_AGENT, "Accept-Language": "en-US,en;q=0.9"}
 
     all_rows = []
-    today = datetime.now().date()
-    for offset in range(0, days+1):
-        d = today + timedelta(days=offset)
-        # League fixtures page
-        url = BASE + info["path"] + "fixtures/"
-        try:
-            r = session.get(url, headers=headers, timeout=20)
-            # Render JS to populate matches
-            r.html.render(timeout=30, sleep=2)
-        except Exception as e:
-            print(f"[WARN] Render failed for {code} {info['name']}: {e}")
-            continue
+    url = BASE + info["path"] + "fixtures/"
+    try:
+        # Render JS to populate matches (one render per league page)
+        html = pool.render(url, headers=headers, timeout=20, render_timeout=30, sleep=2)
+    except Exception as e:
+        print(f"[WARN] Render failed for {code} {info['name']}: {e}")
+        if own_pool:
+            pool.close()
+        return pd.DataFrame(all_rows)
 
-        try:
-            # Flashscore typically groups matches by day in blocks with class 'event__day'
-            date_blocks = r.html.find("div.event__day")
-
-            # Build human-readable date as shown on the site (approx)
-            active_date_str = d.strftime("%d %b %Y").lower()  # e.g., '11 Oct 2025'
-
-            for block in date_blocks:
-                header = block.find("div.event__title--name", first=True)
-                if header:
-                    if active_date_str not in header.text.lower():
-                        continue  # skip other dates
-
-                matches = block.find("div.event__match")
-                for m in matches:
-                    home = m.find("div.event__participant--home", first=True)
-                    away = m.find("div.event__participant--away", first=True)
-                    hg_el = m.find("div.event__score--home", first=True)
-                    ag_el = m.find("div.event__score--away", first=True)
-
-                    home_team = home.text.strip() if home else ""
-                    away_team = away.text.strip() if away else ""
-                    hg = int(hg_el.text.strip()) if (hg_el and hg_el.text.strip().isdigit()) else None
-                    ag = int(ag_el.text.strip()) if (ag_el and ag_el.text.strip().isdigit()) else None
-
-                    if not home_team or not away_team:
-                        continue
-
-                    all_rows.append({
-                        "Date": d.strftime("%Y-%m-%d"),
-                        "Country": info["country"],
-                        "LeagueCode": code,
-                        "LeagueName": info["name"],
-                        "HomeTeam": home_team,
-                        "AwayTeam": away_team,
-                        "HomeGoals": hg,
-                        "AwayGoals": ag,
-                    })
-            polite_sleep(1.0, 2.0)
-        except Exception as e:
-            print(f"[WARN] Parse failed for {code} {info['name']} on {d}: {e}")
-            continue
+    labels = _week_labels(days)
+    today = datetime.now().date()
+    try:
+        # Flashscore typically groups matches by day in blocks with class 'event__day'
+        for block in html.find("div.event__day"):
+            header = block.find("div.event__title--name", first=True)
+            if header:
+                head_text = header.text.lower()
+                d = next((dt for label, dt in labels.items() if label in head_text), None)
+                if d is None:
+                    continue  # outside the requested window
+            else:
+                d = today  # untitled block: today's matches
+            if skip_dates and d.strftime("%Y-%m-%d") in skip_dates:
+                continue
+
+            for m in block.find("div.event__match"):
+                home = m.find("div.event__participant--home", first=True)
+                away = m.find("div.event__participant--away", first=True)
+                hg_el = m.find("div.event__score--home", first=True)
+                ag_el = m.find("div.event__score--away", first=True)
+
+                home_team = home.text.strip() if home else ""
+                away_team = away.text.strip() if away else ""
+                hg = int(hg_el.text.strip()) if (hg_el and hg_el.text.strip().isdigit()) else None
+                ag = int(ag_el.text.strip()) if (ag_el and ag_el.text.strip().isdigit()) else None
+
+                if not home_team or not away_team:
+                    continue
+
+                all_rows.append({
+                    "Date": d.strftime("%Y-%m-%d"),
+                    "Country": info["country"],
+                    "LeagueCode": code,
+                    "LeagueName": info["name"],
+                    "HomeTeam": home_team,
+                    "AwayTeam": away_team,
+                    "HomeGoals": hg,
+                    "AwayGoals": ag,
+                })
+    except Exception as e:
+        print(f"[WARN] Parse failed for {code} {info['name']}: {e}")
+    finally:
+        if own_pool:
+            pool.close()
 
     return pd.DataFrame(all_rows)
 
@@ -243,20 +260,47 @@ def dedupe_merge(existing: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
 def main():
     print("[INFO] EURO_GOALS v6d_auto — Flashscore weekly updater")
     print(f"[INFO] Excel path: {EXCEL_PATH}")
-    if not JS_ENABLED:
-        print("[WARN] 'requests_html' not installed. Install first:  pip install requests-html  ")
-        print("[WARN] Skipping Flashscore fetching. Exiting.")
-        sys.exit(1)
-
     existing = read_existing_matches(EXCEL_PATH)
 
     collected = []
-    for code, info in FLASH_LEAGUES.items():
-        print(f"[FETCH] {code} — {info['country']} / {info['name']}")
-        df = fetch_league_week(code, info, days=7)
-        print(f"[OK] {code}: fetched {len(df)} rows.")
-        if not df.empty:
+    pending = dict(FLASH_LEAGUES)
+    covered: Set[str] = set()  # days the x/feed actually returned
+    fed: Set[str] = set()      # leagues with feed rows
+    if FLASH_SOURCE == "feed":
+        # Browser-free path: one x/feed request per day for all leagues
+        rows = to_week_rows(get_week_matches(days=7, covered=covered), FLASH_LEAGUES)
+        if rows:
+            df = pd.DataFrame(rows)
             collected.append(df)
+            fed = set(df["LeagueCode"].unique())
+        week = {(datetime.now().date() + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(0, 8)}
+        if week <= covered:
+            # Full week from the feed: leagues with feed rows are done
+            for code in fed:
+                pending.pop(code, None)
+        elif fed:
+            print(f"[WARN] feed missing {len(week - covered)} day(s); rendering those days for {len(fed)} leagues.")
+        print(f"[OK] feed: {len(rows)} rows, {len(covered)}/{len(week)} days, "
+              f"{len(FLASH_LEAGUES) - len(pending)} leagues done; {len(pending)} left for rendering.")
+
+    if pending and not JS_ENABLED:
+        print("[WARN] 'requests_html' not installed. Install first:  pip install requests-html  ")
+        print(f"[WARN] Skipping browser fetch for {len(pending)} leagues.")
+        pending = {}
+
+    if pending:
+        print(f"[FETCH] {len(pending)} leagues with {FLASH_BROWSERS} headless browsers")
+        with BrowserPool(size=FLASH_BROWSERS, delay=FLASH_RENDER_DELAY) as pool:
+            jobs = pool.map(lambda code: fetch_league_week(code, pending[code], days=7, pool=pool,
+                                                           skip_dates=covered if code in fed else None), pending)
+            for code, df in jobs:
+                info = pending[code]
+                if isinstance(df, Exception):
+                    print(f"[WARN] {code} — {info['country']} / {info['name']} failed: {df}")
+                    continue
+                print(f"[OK] {code} — {info['country']} / {info['name']}: fetched {len(df)} rows.")
+                if not df.empty:
+                    collected.append(df)
     if not collected:
         print("[WARN] No data collected from Flashscore.")
         sys.exit(0)
@@ -8,9 +8,12 @@ from typing import Dict, List, Optional
 
 import pandas as pd
 
+from modules.browser_pool import BrowserPool, JS_ENABLED
+
 LOG_PATH = "log_dualsource.txt"
 EXCEL_PATH = r"C:\Users\pierr\Desktop\EURO_GOALS\EURO_GOALS_v6d.xlsx"
 SHEET = "Matches"
+FS_BROWSERS = int(os.getenv("FLASH_BROWSERS", 4))  # parallel headless renders
 
 FS_LEAGUES = {
     "ENG1":{"country":"England","name":"Premier League","path":"/football/england/premier-league/"},
@@ -139,60 +142,61 @@ def fetch_sofascore_week(code: str, info: dict, days: int = 7) -> pd.DataFrame:
         polite_sleep()
     return pd.DataFrame(rows)
 
-def fetch_flashscore_week(code: str, info: dict, days: int = 7) -> pd.DataFrame:
-    # Import inside function to avoid false negatives
-    try:
-        import nest_asyncio
-        nest_asyncio.apply()
-        from requests_html import HTMLSession
-    except Exception as e:
-        log(f"[WARN] requests_html import failed: {e}")
+def fetch_flashscore_week(code: str, info: dict, days: int = 7, pool: Optional[BrowserPool] = None) -> pd.DataFrame:
+    """One render of the league fixtures page, all day blocks parsed in a single pass."""
+    if not JS_ENABLED:
+        log("[WARN] requests_html/pyppeteer not available; skip Flashscore")
         return pd.DataFrame(columns=[])
 
-    session = HTMLSession()
+    own_pool = pool is None
+    if own_pool:
+        pool = BrowserPool(size=1)
     headers = {"User-Agent":UA,"Accept-Language":"en-US,en;q=0.9"}
 
     rows = []
     today = datetime.now().date()
+    labels = {(today + timedelta(days=o)).strftime("%d %b %Y").lower(): today + timedelta(days=o)
+              for o in range(0, days+1)}
     url = BASE_FS + info["path"] + "fixtures/"
     try:
-        r = session.get(url, headers=headers, timeout=25)
-        r.html.render(timeout=45, sleep=2)  # Headless Chromium
+        html = pool.render(url, headers=headers, timeout=25, render_timeout=45, sleep=2)  # Headless Chromium
     except Exception as e:
         log(f"[WARN] FS render failed for {code}: {e}")
+        if own_pool: pool.close()
         return pd.DataFrame(rows)
 
     try:
-        blocks = r.html.find("div.event__day")
-        for offset in range(0,days+1):
-            d = today + timedelta(days=offset)
-            label = d.strftime("%d %b %Y").lower()
-            for b in blocks:
-                head = b.find("div.event__title--name", first=True)
-                if head and (label not in head.text.lower()): continue
-                matches = b.find("div.event__match")
-                for m in matches:
-                    home = m.find("div.event__participant--home", first=True)
-                    away = m.find("div.event__participant--away", first=True)
-                    hg_el = m.find("div.event__score--home", first=True)
-                    ag_el = m.find("div.event__score--away", first=True)
-                    home_team = home.text.strip() if home else ""
-                    away_team = away.text.strip() if away else ""
-                    hg = int(hg_el.text.strip()) if (hg_el and hg_el.text.strip().isdigit()) else None
-                    ag = int(ag_el.text.strip()) if (ag_el and ag_el.text.strip().isdigit()) else None
-                    if not home_team or not away_team: continue
-                    rows.append({
-                        "Date": d.strftime("%Y-%m-%d"),
-                        "Country": info["country"],
-                        "LeagueCode": code,
-                        "LeagueName": info["name"],
-                        "HomeTeam": home_team, "AwayTeam": away_team,
-                        "HomeGoals": hg, "AwayGoals": ag,
-                        "source": "FS"
-                    })
-        polite_sleep()
+        for b in html.find("div.event__day"):
+            head = b.find("div.event__title--name", first=True)
+            if head:
+                head_text = head.text.lower()
+                d = next((dt for label, dt in labels.items() if label in head_text), None)
+                if d is None: continue
+            else:
+                d = today
+            for m in b.find("div.event__match"):
+                home = m.find("div.event__participant--home", first=True)
+                away = m.find("div.event__participant--away", first=True)
+                hg_el = m.find("div.event__score--home", first=True)
+                ag_el = m.find("div.event__score--away", first=True)
+                home_team = home.text.strip() if home else ""
+                away_team = away.text.strip() if away else ""
+                hg = int(hg_el.text.strip()) if (hg_el and hg_el.text.strip().isdigit()) else None
+                ag = int(ag_el.text.strip()) if (ag_el and ag_el.text.strip().isdigit()) else None
+                if not home_team or not away_team: continue
+                rows.append({
+                    "Date": d.strftime("%Y-%m-%d"),
+                    "Country": info["country"],
+                    "LeagueCode": code,
+                    "LeagueName": info["name"],
+                    "HomeTeam": home_team, "AwayTeam": away_team,
+                    "HomeGoals": hg, "AwayGoals": ag,
+                    "source": "FS"
+                })
     except Exception as e:
         log(f"[WARN] FS parse failed for {code}: {e}")
+    finally:
+        if own_pool: pool.close()
     return pd.DataFrame(rows)
 
 def unify(df: pd.DataFrame) -> pd.DataFrame:
@@ -248,12 +252,15 @@ def main():
     existing = read_existing()
     frames = []
 
-    # Flashscore sweep
-    for code, info in FS_LEAGUES.items():
-        print(f"[FETCH/FS] {code} — {info['country']} / {info['name']}")
-        fs = fetch_flashscore_week(code, info, days=7)
-        print(f"[OK/FS] {code}: {len(fs)} rows")
-        if not fs.empty: frames.append(fs)
+    # Flashscore sweep (one render per league, FS_BROWSERS in parallel)
+    print(f"[FETCH/FS] {len(FS_LEAGUES)} leagues, {FS_BROWSERS} browsers")
+    with BrowserPool(size=FS_BROWSERS) as pool:
+        for code, fs in pool.map(lambda c: fetch_flashscore_week(c, FS_LEAGUES[c], days=7, pool=pool), FS_LEAGUES):
+            if isinstance(fs, Exception):
+                print(f"[WARN/FS] {code}: {fs}")
+                continue
+            print(f"[OK/FS] {code}: {len(fs)} rows")
+            if not fs.empty: frames.append(fs)
 
     # Sofascore sweep (subset of leagues)
     for code, meta in SS_TOURNAMENTS.items():
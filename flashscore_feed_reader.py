@@ -0,0 +1,204 @@
+# ==============================================
+# FLASHSCORE FEED READER – Browser-free x/feed parser
+# ==============================================
+# Το Flashscore φορτώνει τα δεδομένα του από το /x/feed/ endpoint
+# (βλ. feeds.json) σε delimited μορφή:
+#   ~   → αρχή νέου record
+#   ¬   → διαχωριστικό πεδίων
+#   ÷   → key÷value
+# Records με ZA÷ είναι headers λίγκας, records με AA÷ είναι αγώνες.
+# Δεν χρειάζεται requests_html / Chromium ούτε HTML DOM.
+# ==============================================
+import os
+import re
+import time
+import unicodedata
+from datetime import datetime, timedelta, timezone
+
+from modules import http_client
+
+FEED_URL = "https://www.flashscore.com/x/feed/"
+# Το feed απαντά μόνο με το x-fsign header της σελίδας
+FEED_SIGN = os.getenv("FLASHSCORE_FSIGN", "SW9D1eZo")
+FEED_TZ = int(os.getenv("FLASHSCORE_FEED_TZ", 0))
+SAMPLE_PATH = os.path.join("data", "fixtures", "flashscore_feed_sample.txt")
+
+# AB (status type) → κοινό status των readers
+STATUS_MAP = {"1": "scheduled", "2": "live", "3": "finished"}
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                  "AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/120.0.0.0 Safari/537.36",
+    "x-fsign": FEED_SIGN,
+    "Referer": "https://www.flashscore.com/",
+}
+
+
+def _fields(record):
+    """'AA÷x¬AD÷y¬…' → {'AA': 'x', 'AD': 'y', …} (το πρώτο ÷ χωρίζει key/value)."""
+    out = {}
+    for field in record.split("¬"):
+        key, sep, value = field.partition("÷")
+        if sep:
+            out[key] = value
+    return out
+
+
+def _slug(text):
+    """'Süper Lig' → 'super-lig', '2. Bundesliga' → '2-bundesliga' (όπως τα paths του Flashscore)."""
+    text = unicodedata.normalize("NFKD", str(text or "").lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return re.sub(r"[^a-z0-9]+", "-", text).strip("-")
+
+
+def _score(value):
+    return int(value) if value and value.isdigit() else None
+
+
+def parse_feed(text):
+    """
+    Μετατρέπει ένα feed σε λίστα αγώνων:
+    {id, country, league, url, home, away, kickoff (UTC datetime), status, home_goals, away_goals}
+    (url = το path της λίγκας από το ZL του header, αν υπάρχει)
+    """
+    matches = []
+    country = league = url = ""
+    for record in (text or "").split("~"):
+        if record.startswith("ZA÷"):
+            f = _fields(record)
+            name = f.get("ZA", "")
+            # "ENGLAND: Premier League" → country / league
+            head, sep, tail = name.partition(": ")
+            country = f.get("ZY") or (head.title() if sep else "")
+            league = tail if sep else name
+            url = f.get("ZL", "")
+            continue
+        if not record.startswith("AA÷"):
+            continue
+        f = _fields(record)
+        home, away = f.get("AE", "").strip(), f.get("AF", "").strip()
+        if not home or not away:
+            continue
+        ts = f.get("AD")
+        matches.append({
+            "id": f["AA"],
+            "country": country,
+            "league": league,
+            "url": url,
+            "home": home,
+            "away": away,
+            "kickoff": datetime.fromtimestamp(int(ts), tz=timezone.utc) if ts and ts.isdigit() else None,
+            "status": STATUS_MAP.get(f.get("AB"), "unknown"),
+            "home_goals": _score(f.get("AG")),
+            "away_goals": _score(f.get("AH")),
+        })
+    return matches
+
+
+def fetch_feed(name, priority=None):
+    """Κατεβάζει ένα feed (π.χ. 'f_1_0_0_en_1') και επιστρέφει το raw κείμενο ή ''."""
+    try:
+        kw = {"priority": priority} if priority is not None else {}
+        resp = http_client.get(FEED_URL + name, provider="flashscore", headers=HEADERS, **kw)
+        if resp.status_code != 200:
+            print(f"[FLASHSCORE_FEED] ⚠️ {name}: HTTP {resp.status_code}")
+            return ""
+        return resp.text
+    except Exception as e:
+        print(f"[FLASHSCORE_FEED] ❌ Error fetching {name}: {e}")
+        return ""
+
+
+def get_day_matches(offset=0):
+    """Όλοι οι αγώνες ποδοσφαίρου μίας ημέρας (offset από σήμερα, -7..7)."""
+    return parse_feed(fetch_feed(f"f_1_{offset}_{FEED_TZ}_en_1"))
+
+
+def get_live_matches():
+    """Live αγώνες από το feed της τρέχουσας ημέρας."""
+    return [m for m in get_day_matches(0) if m["status"] == "live"]
+
+
+def get_week_matches(days=7, covered=None):
+    """
+    Αγώνες από σήμερα έως +days (ένα feed request ανά ημέρα).
+    Αν δοθεί set `covered`, προστίθενται οι ημερομηνίες (YYYY-MM-DD) των
+    ημερών που το feed όντως επέστρεψε – οι υπόλοιπες θέλουν fallback.
+    """
+    out = []
+    today = datetime.now().date()
+    for offset in range(0, days + 1):
+        text = fetch_feed(f"f_1_{offset}_{FEED_TZ}_en_1")
+        if not text:
+            continue
+        if covered is not None:
+            covered.add((today + timedelta(days=offset)).strftime("%Y-%m-%d"))
+        out.extend(parse_feed(text))
+    return out
+
+
+def _league_keys(leagues):
+    """
+    Lookup προς τον κωδικό λίγκας του updater. Κάθε λίγκα ταιριάζει με:
+      - το path της (π.χ. /football/greece/super-league/) ↔ ZL του feed
+      - (country, league) ως slugs, από το όνομα ΚΑΙ από το path, ώστε
+        "Super League 1" (config) να βρίσκει το "GREECE: Super League" (feed)
+    """
+    lookup = {}
+    for code, info in leagues.items():
+        country = _slug(info.get("country"))
+        lookup.setdefault((country, _slug(info.get("name"))), code)
+        path = info.get("path") or ""
+        parts = [p for p in path.split("/") if p]
+        if len(parts) >= 3:
+            lookup.setdefault(path, code)
+            lookup.setdefault((parts[-2], parts[-1]), code)
+    return lookup
+
+
+def to_week_rows(matches, leagues):
+    """
+    Φιλτράρει τους αγώνες στις λίγκες του updater ({code: {country, name, path}})
+    και τους επιστρέφει ως rows του Excel (Date, Country, LeagueCode, ...).
+    Οι λίγκες χωρίς κανέναν αγώνα στο feed καταγράφονται στο log.
+    """
+    lookup = _league_keys(leagues)
+    rows = []
+    found = set()
+    for m in matches:
+        code = lookup.get(m.get("url") or "") or lookup.get((_slug(m["country"]), _slug(m["league"])))
+        if code is None or m["kickoff"] is None:
+            continue
+        found.add(code)
+        info = leagues[code]
+        rows.append({
+            "Date": m["kickoff"].astimezone().strftime("%Y-%m-%d"),
+            "Country": info["country"],
+            "LeagueCode": code,
+            "LeagueName": info["name"],
+            "HomeTeam": m["home"],
+            "AwayTeam": m["away"],
+            "HomeGoals": m["home_goals"],
+            "AwayGoals": m["away_goals"],
+        })
+    missing = [f"{code} ({info['country']}/{info['name']})" for code, info in leagues.items() if code not in found]
+    if matches and missing:
+        print(f"[FLASHSCORE_FEED] ℹ️ {len(missing)} λίγκες χωρίς αγώνες στο feed: {', '.join(missing)}")
+    return rows
+
+
+if __name__ == "__main__":
+    # Χρονομέτρηση του parser στο αποθηκευμένο fixture (χωρίς δίκτυο)·
+    # έλεγχοι: tests/test_flashscore_feed_reader.py
+    with open(SAMPLE_PATH, encoding="utf-8") as fh:
+        sample = fh.read()
+    runs = 200
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        parsed = parse_feed(sample)
+    elapsed = (time.perf_counter() - t0) / runs
+    for m in parsed:
+        print(f"{m['kickoff']:%Y-%m-%d %H:%M} {m['country']}/{m['league']}: "
+              f"{m['home']} {m['home_goals']}-{m['away_goals']} {m['away']} [{m['status']}]")
+    print(f"[FLASHSCORE_FEED] ✅ {len(parsed)} matches, {len(sample)} bytes, {elapsed * 1000:.3f} ms/parse")
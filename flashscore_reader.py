@@ -1,15 +1,39 @@
 # ==============================================
 # FLASHSCORE READER – Live Odds Scraper (Clean v2)
 # ==============================================
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 
+from modules import http_client
+from modules.html_backend import extract_rows
+from flashscore_feed_reader import get_live_matches
+
+LIVE_FIELDS = {
+    "home": ".event__participant--home",
+    "away": ".event__participant--away",
+    "score_home": ".event__score--home",
+    "score_away": ".event__score--away",
+}
+
 def get_flashscore_odds():
     """
     Παίρνει αποδόσεις (1X2) από Flashscore live feed.
     Προσοχή: χρησιμοποιεί scraping, όχι API.
     """
+    # Πρώτα το x/feed (χωρίς HTML)· το scraping της αρχικής μένει ως fallback
+    feed = get_live_matches()
+    if feed:
+        now = datetime.now().strftime("%H:%M:%S")
+        matches = [{
+            "league": f"{m['country']}: {m['league']}" if m["country"] else m["league"],
+            "home": f"{m['home']} ({m['home_goals'] if m['home_goals'] is not None else '-'})",
+            "away": f"{m['away']} ({m['away_goals'] if m['away_goals'] is not None else '-'})",
+            "odds": "-",
+            "source": "Flashscore",
+            "timestamp": now,
+        } for m in feed]
+        print(f"[FLASHSCORE] ✅ Parsed {len(matches)} live matches from feed.")
+        return matches
+
     try:
         url = "https://www.flashscore.com/"
         headers = {
@@ -17,32 +41,22 @@ def get_flashscore_odds():
                           "AppleWebKit/537.36 (KHTML, like Gecko) "
                           "Chrome/120.0.0.0 Safari/537.36"
         }
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, "html.parser")
+        response = http_client.get(url, provider="flashscore", headers=headers)
+        rows = extract_rows(response.text, ".event__match.event__match--live", LIVE_FIELDS,
+                            header="div.event__titleBox")
 
         matches = []
-        live_blocks = soup.select(".event__match.event__match--live")
-
-        for block in live_blocks:
-            try:
-                league_tag = block.find_previous("div", class_="event__titleBox")
-                league = league_tag.text.strip() if league_tag else "Unknown League"
-
-                home = block.select_one(".event__participant--home").text.strip()
-                away = block.select_one(".event__participant--away").text.strip()
-                score_home = block.select_one(".event__score--home").text.strip()
-                score_away = block.select_one(".event__score--away").text.strip()
-
-                matches.append({
-                    "league": league,
-                    "home": f"{home} ({score_home})",
-                    "away": f"{away} ({score_away})",
-                    "odds": "-",  # Placeholder, μπορεί να επεκταθεί
-                    "source": "Flashscore",
-                    "timestamp": datetime.now().strftime("%H:%M:%S")
-                })
-            except Exception:
+        for row in rows:
+            if not row["home"] or not row["away"]:
                 continue
+            matches.append({
+                "league": row["header"] or "Unknown League",
+                "home": f"{row['home']} ({row['score_home']})",
+                "away": f"{row['away']} ({row['score_away']})",
+                "odds": "-",  # Placeholder, μπορεί να επεκταθεί
+                "source": "Flashscore",
+                "timestamp": datetime.now().strftime("%H:%M:%S")
+            })
 
         print(f"[FLASHSCORE] ✅ Scraped {len(matches)} live matches.")
         return matches
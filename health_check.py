@@ -11,10 +11,11 @@
 # και επιστρέφει unified JSON για το System Status Panel
 # ==============================================================
 
-import requests
 import os
 from datetime import datetime
 
+from modules import http_client
+
 # --------------------------------------------------------------
 # 1️⃣  Render Health Check
 # --------------------------------------------------------------
@@ -23,7 +24,7 @@ def check_render():
     if not url:
         return "PENDING"
     try:
-        res = requests.get(url, timeout=5)
+        res = http_client.get(url, provider="health")
         return "OK" if res.status_code == 200 else f"FAIL ({res.status_code})"
     except Exception as e:
         print("[HEALTH] ⚠️ Render error:", e)
@@ -57,7 +58,7 @@ def check_smartmoney():
 def check_asianconnect():
     url = "https://asianconnect88.com"
     try:
-        res = requests.get(url, timeout=5)
+        res = http_client.get(url, provider="health")
         return "OK" if res.status_code == 200 else "FAIL"
     except:
         return "FAIL"
@@ -68,7 +69,7 @@ def check_asianconnect():
 def check_goalmatrix():
     url = "https://euro-goals-nextgen.onrender.com/goalmatrix_data"
     try:
-        res = requests.get(url, timeout=5)
+        res = http_client.get(url, provider="health")
         return "OK" if res.status_code == 200 else "FAIL"
     except:
         return "FAIL"
@@ -83,7 +84,7 @@ def check_footballdata():
     try:
         url = "https://api.football-data.org/v4/competitions"
         headers = {"X-Auth-Token": key}
-        res = requests.get(url, headers=headers, timeout=5)
+        res = http_client.get(url, provider="health", headers=headers)
         return "OK" if res.status_code == 200 else f"FAIL ({res.status_code})"
     except:
         return "FAIL"
@@ -97,7 +98,7 @@ def check_sportmonks():
         return "PENDING"
     try:
         url = f"https://api.sportmonks.com/v3/football/leagues?api_token={key}"
-        res = requests.get(url, timeout=5)
+        res = http_client.get(url, provider="health")
         return "OK" if res.status_code == 200 else f"FAIL ({res.status_code})"
     except:
         return "FAIL"
@@ -111,7 +112,7 @@ def check_besoccer():
         return "PENDING"
     try:
         url = f"https://apiclient.besoccerapps.com/scripts/api/api.php?key={key}&req=leagues"
-        res = requests.get(url, timeout=5)
+        res = http_client.get(url, provider="health")
         return "OK" if res.status_code == 200 else f"FAIL ({res.status_code})"
     except:
         return "FAIL"
@@ -5,21 +5,21 @@
 # Περιλαμβάνει header spoofing ώστε να αποφεύγονται 403 από Sofascore.
 # ==============================================
 
-import requests
 import json
 import time
 from datetime import datetime
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 import os
 
+from modules import http_client
+from modules.change_filter import ChangeFilter
+from modules.db_engine import get_engine
+
 # ----------------------------------------------
 # Database setup
 # ----------------------------------------------
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///matches.db")
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+engine = get_engine(DATABASE_URL)
 
 # ----------------------------------------------
 # Helper: Λήψη δεδομένων με User-Agent
@@ -38,7 +38,7 @@ def fetch_feed(source_url):
     }
 
     try:
-        response = requests.get(source_url, headers=headers, timeout=10)
+        response = http_client.get(source_url, provider="sofascore", headers=headers)
         if response.status_code == 200:
             return response.json()
         else:
@@ -50,6 +50,29 @@ def fetch_feed(source_url):
 # ----------------------------------------------
 # Sofascore Feed
 # ----------------------------------------------
+# Hash (score, status) ανά Sofascore event id – μόνο τα νέα/αλλαγμένα events
+# γράφονται. Το WHERE του DO UPDATE καλύπτει και restart του process.
+SOFASCORE_CHANGES = ChangeFilter(
+    "sofascore",
+    key=lambda e: e["id"],
+    fields=lambda e: (e.get("homeScore", {}).get("current", 0),
+                      e.get("awayScore", {}).get("current", 0),
+                      e["status"]["type"]),
+)
+
+UPSERT_SQL = text("""
+    INSERT INTO matches (match_id, home, away, kickoff_utc, score, status, source, updated_at)
+    VALUES (:match_id, :home, :away, :kickoff_utc, :score, :status, 'Sofascore', :updated_at)
+    ON CONFLICT(match_id) DO UPDATE SET
+        kickoff_utc=COALESCE(excluded.kickoff_utc, matches.kickoff_utc),
+        score=excluded.score,
+        status=excluded.status,
+        updated_at=excluded.updated_at
+    WHERE COALESCE(matches.score, '') <> excluded.score
+       OR COALESCE(matches.status, '') <> excluded.status
+       OR (matches.kickoff_utc IS NULL AND excluded.kickoff_utc IS NOT NULL)
+""")
+
 def update_sofascore_data():
     print("[THREAD] 🟢 Sofascore feed running...")
     sofascore_url = "https://api.sofascore.com/api/v1/sport/football/events/live"
@@ -57,41 +80,42 @@ def update_sofascore_data():
     data = fetch_feed(sofascore_url)
     if not data or "events" not in data:
         print("[LIVE_FEEDS] ⚠️ Δεν βρέθηκαν δεδομένα από Sofascore.")
-        return
+        return []
 
     events = data["events"]
     print(f"[LIVE_FEEDS] ✅ Λήφθηκαν {len(events)} αγώνες από Sofascore.")
 
-    try:
-        with engine.begin() as conn:
-            for e in events:
-                match_id = f"sofa_{e['id']}"
-                home = e["homeTeam"]["name"]
-                away = e["awayTeam"]["name"]
-                score_home = e.get("homeScore", {}).get("current", 0)
-                score_away = e.get("awayScore", {}).get("current", 0)
-                score = f"{score_home}-{score_away}"
-                status = e["status"]["type"]
-                updated_at = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+    changed = SOFASCORE_CHANGES.changes(events)
+    rows = []
+    updated_at = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+    for e in changed:
+        try:
+            rows.append({
+                "match_id": f"sofa_{e['id']}",
+                "home": e["homeTeam"]["name"],
+                "away": e["awayTeam"]["name"],
+                # kickoff → ημερομηνία του canonical match id (cross_verifier)
+                "kickoff_utc": (datetime.utcfromtimestamp(e["startTimestamp"]).strftime("%Y-%m-%d %H:%M:%S")
+                                if e.get("startTimestamp") else None),
+                "score": f"{e.get('homeScore', {}).get('current', 0)}-{e.get('awayScore', {}).get('current', 0)}",
+                "status": e["status"]["type"],
+                "updated_at": updated_at,
+            })
+        except (KeyError, TypeError):
+            SOFASCORE_CHANGES.forget([e.get("id")])
+            continue
 
-                conn.execute(text("""
-                    INSERT INTO matches (match_id, home, away, score, status, source, updated_at)
-                    VALUES (:match_id, :home, :away, :score, :status, 'Sofascore', :updated_at)
-                    ON CONFLICT(match_id) DO UPDATE SET
-                        score=:score,
-                        status=:status,
-                        updated_at=:updated_at
-                """), {
-                    "match_id": match_id,
-                    "home": home,
-                    "away": away,
-                    "score": score,
-                    "status": status,
-                    "updated_at": updated_at
-                })
-        print("[LIVE_FEEDS] 🟢 Sofascore database updated.")
+    try:
+        if rows:
+            with engine.begin() as conn:
+                conn.execute(UPSERT_SQL, rows)  # ένα executemany ανά κύκλο
+        print(f"[LIVE_FEEDS] 🟢 Sofascore database updated: {len(rows)} αλλαγές, "
+              f"{len(events) - len(changed)} αμετάβλητοι.")
     except Exception as e:
+        # Να ξαναδοκιμαστούν στον επόμενο κύκλο
+        SOFASCORE_CHANGES.forget([ev.get("id") for ev in changed])
         print(f"[LIVE_FEEDS] ❌ Σφάλμα ενημέρωσης Sofascore DB: {e}")
+    return events
 
 # ----------------------------------------------
 # Flashscore Feed (προαιρετικό / placeholder)
@@ -5,51 +5,28 @@ from fastapi import FastAPI, Request
 from fastapi.responses import FileResponse, JSONResponse, HTMLResponse
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from datetime import datetime
 import os
 import openpyxl
 from dotenv import load_dotenv
 
+from modules.db_engine import get_engine, get_read_engine
+from modules.db_schema import ensure_schema
+
 load_dotenv()
 
 app = FastAPI()
 templates = Jinja2Templates(directory="templates")
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///matches.db")
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {})
+engine = get_engine(DATABASE_URL)
+read_engine = get_read_engine(DATABASE_URL)
 
 @app.on_event("startup")
 def startup_event():
-    with engine.connect() as conn:
-        if "sqlite" in DATABASE_URL:
-            conn.execute(text("""
-                CREATE TABLE IF NOT EXISTS matches (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date TEXT,
-                    league TEXT,
-                    home_team TEXT,
-                    away_team TEXT,
-                    home_odds REAL,
-                    draw_odds REAL,
-                    away_odds REAL,
-                    result TEXT
-                )
-            """))
-        else:
-            conn.execute(text("""
-                CREATE TABLE IF NOT EXISTS matches (
-                    id SERIAL PRIMARY KEY,
-                    date TEXT,
-                    league TEXT,
-                    home_team TEXT,
-                    away_team TEXT,
-                    home_odds REAL,
-                    draw_odds REAL,
-                    away_odds REAL,
-                    result TEXT
-                )
-            """))
+    # Canonical schema + indexes (modules/db_schema.py)
+    ensure_schema(engine)
 
 @app.get("/", response_class=HTMLResponse)
 def home(request: Request):
@@ -61,21 +38,11 @@ def health_check():
 
 @app.get("/api/matches")
 def get_matches():
-    with engine.connect() as conn:
-        result = conn.execute(text("SELECT * FROM matches ORDER BY id"))
-        matches = [
-            {
-                "id": row[0],
-                "date": row[1],
-                "league": row[2],
-                "home_team": row[3],
-                "away_team": row[4],
-                "home_odds": row[5],
-                "draw_odds": row[6],
-                "away_odds": row[7],
-                "result": row[8],
-            }
-            for row in result.fetchall()
-        ]
+    with read_engine.connect() as conn:
+        result = conn.execute(text("""
+            SELECT id, date, league, home_team, away_team, home_odds, draw_odds, away_odds, result
+            FROM matches ORDER BY id
+        """))
+        matches = [dict(row) for row in result.mappings().all()]
         return {"count": len(matches), "matches": matches}
 
@@ -0,0 +1,45 @@
+# ==============================================
+# EURO_GOALS – Database migration (matches schema)
+# ==============================================
+# Αναβαθμίζει in place μια υπάρχουσα βάση SQLite/Postgres στο canonical
+# schema του modules/db_schema.py (στήλες που λείπουν + indexes).
+#   python migrate_db.py              → εφαρμογή
+#   python migrate_db.py --dry-run    → μόνο εμφάνιση των βημάτων
+#   python migrate_db.py --url postgresql://...
+# ==============================================
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+
+from modules.db_engine import get_engine
+from modules.db_schema import ensure_schema, plan
+
+load_dotenv()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EURO_GOALS matches schema migration")
+    parser.add_argument("--url", default=os.getenv("DATABASE_URL", "sqlite:///matches.db"))
+    parser.add_argument("--dry-run", action="store_true", help="εμφάνιση βημάτων χωρίς αλλαγές")
+    args = parser.parse_args(argv)
+
+    engine = get_engine(args.url)
+    print(f"[MIGRATE] 🔍 {engine.url.render_as_string(hide_password=True)}")
+    if not plan(engine):
+        print("[MIGRATE] ✅ Το schema είναι ήδη ενημερωμένο.")
+        return 0
+
+    applied, failed = ensure_schema(engine, dry_run=args.dry_run)
+    if args.dry_run:
+        print(f"[MIGRATE] 📝 {len(applied)} βήματα εκκρεμούν.")
+        return 0
+    print(f"[MIGRATE] ✅ {len(applied)} βήματα εφαρμόστηκαν" + (f", ⚠️ {len(failed)} απέτυχαν" if failed else ""))
+    for desc in failed:
+        print(f"[MIGRATE]    - {desc}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+# ============================================================
+# modules/adaptive_poller.py
+# Kickoff-proximity adaptive polling (priority queue ανά kickoff)
+# ============================================================
+# Αντί για σταθερό refresh interval για όλους τους αγώνες:
+#   - live αγώνες           → κάθε POLL_LIVE δευτερόλεπτα
+#   - kickoff εντός 2 ωρών  → κάθε POLL_SOON
+#   - kickoff εντός 12 ωρών → κάθε POLL_TODAY
+#   - kickoff εντός 48 ωρών → κάθε POLL_LATER
+#   - πιο μακριά / άγνωστο  → κάθε POLL_FAR
+#   - τελειωμένοι αγώνες    → αφαιρούνται από το schedule
+# ============================================================
+
+import heapq
+import os
+import threading
+import time
+from datetime import timedelta
+
+from modules.quota_scheduler import LIVE_STATUSES, FINISHED_STATUSES, FINISHED_AFTER, _to_utc, _utcnow
+
+ADAPTIVE_POLLING = os.getenv("ADAPTIVE_POLLING", "OFF").upper() == "ON"
+
+POLL_LIVE = int(os.getenv("POLL_LIVE_INTERVAL", 60))
+POLL_SOON = int(os.getenv("POLL_SOON_INTERVAL", 120))
+POLL_TODAY = int(os.getenv("POLL_TODAY_INTERVAL", 600))
+POLL_LATER = int(os.getenv("POLL_LATER_INTERVAL", 1800))
+POLL_FAR = int(os.getenv("POLL_FAR_INTERVAL", 3600))
+
+
+def is_finished(kickoff=None, status=None, now=None) -> bool:
+    st = (status or "").strip().lower()
+    if st in FINISHED_STATUSES:
+        return True
+    if st in LIVE_STATUSES:
+        return False
+    ko = _to_utc(kickoff)
+    return ko is not None and (now or _utcnow()) - ko > FINISHED_AFTER
+
+
+def interval_for(kickoff=None, status=None, now=None):
+    """Polling interval (sec) για έναν αγώνα – None αν έχει τελειώσει."""
+    now = now or _utcnow()
+    if is_finished(kickoff, status, now):
+        return None
+    st = (status or "").strip().lower()
+    ko = _to_utc(kickoff)
+    if st in LIVE_STATUSES or (ko is not None and ko <= now):
+        return POLL_LIVE
+    if ko is None:
+        return POLL_FAR
+    ahead = ko - now
+    if ahead <= timedelta(hours=2):
+        return POLL_SOON
+    if ahead <= timedelta(hours=12):
+        return POLL_TODAY
+    if ahead <= timedelta(hours=48):
+        return POLL_LATER
+    return POLL_FAR
+
+
+class AdaptivePoller:
+    """
+    Priority queue (heap) με το επόμενο due time ανά key (αγώνας ή λίγκα).
+    Τα keys ξαναμπαίνουν στο heap με interval ανάλογο της απόστασης από το kickoff.
+    """
+
+    def __init__(self):
+        self._heap = []      # (due_monotonic, seq, key)
+        self._entries = {}   # key -> {"kickoff", "status", "interval", "seq", "due"}
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _push(self, key, due):
+        self._seq += 1
+        self._entries[key].update(seq=self._seq, due=due)
+        heapq.heappush(self._heap, (due, self._seq, key))
+
+    def track(self, key, kickoff=None, status=None, due_now=False):
+        """Προσθέτει/ενημερώνει ένα key. Τελειωμένοι αγώνες αφαιρούνται."""
+        interval = interval_for(kickoff, status)
+        with self._lock:
+            if interval is None:
+                self._entries.pop(key, None)
+                return None
+            prev = self._entries.get(key)
+            ent = {"kickoff": kickoff, "status": status, "interval": interval}
+            now = time.monotonic()
+            if prev is not None and not due_now:
+                if interval >= prev["interval"]:
+                    # Κρατάμε το ήδη προγραμματισμένο poll
+                    ent.update(seq=prev["seq"], due=prev["due"])
+                    self._entries[key] = ent
+                    return interval
+                # Έγινε πιο επείγον → φέρνουμε νωρίτερα το επόμενο poll
+                self._entries[key] = ent
+                self._push(key, min(prev["due"], now + interval))
+                return interval
+            self._entries[key] = ent
+            self._push(key, now)
+            return interval
+
+    def drop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def retain(self, keys):
+        """Κρατά μόνο τα δοσμένα keys (π.χ. αγώνες που εμφανίζονται ακόμη στο feed)."""
+        keys = set(keys)
+        with self._lock:
+            for key in [k for k in self._entries if k not in keys]:
+                del self._entries[key]
+
+    def due(self):
+        """Επιστρέφει τα keys που πρέπει να ανανεωθούν τώρα και τα ξαναπρογραμματίζει."""
+        out = []
+        now = time.monotonic()
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, seq, key = heapq.heappop(self._heap)
+                ent = self._entries.get(key)
+                if ent is None or ent.get("seq") != seq:
+                    continue  # stale εγγραφή (lazy deletion)
+                interval = interval_for(ent["kickoff"], ent["status"])
+                if interval is None:
+                    self._entries.pop(key, None)
+                    continue
+                ent["interval"] = interval
+                out.append(key)
+                self._push(key, now + interval)
+        return out
+
+    def sleep_hint(self, max_sleep: float, min_sleep: float = 1.0) -> float:
+        """Δευτερόλεπτα μέχρι το επόμενο due key (εντός [min_sleep, max_sleep])."""
+        with self._lock:
+            while self._heap:
+                due, seq, key = self._heap[0]
+                ent = self._entries.get(key)
+                if ent is not None and ent.get("seq") == seq:
+                    return max(min_sleep, min(max_sleep, due - time.monotonic()))
+                heapq.heappop(self._heap)
+        return max_sleep
+
+    def cadence(self, idle: float) -> float:
+        """Το μικρότερο interval ανάμεσα στα tracked keys (ή `idle` αν δεν υπάρχουν)."""
+        with self._lock:
+            intervals = [e["interval"] for e in self._entries.values()]
+        return min(intervals) if intervals else idle
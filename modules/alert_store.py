@@ -0,0 +1,91 @@
+# ============================================================
+# modules/alert_store.py
+# Alert history: append-only JSONL log + ring buffer στη μνήμη
+# ============================================================
+# Αντικαθιστά το read → insert(0) → rewrite του data/alert_history.json
+# σε κάθε alert. Κάθε alert:
+#   - μπαίνει σε deque(maxlen=ALERT_RING_SIZE) → /alerts χωρίς disk I/O
+#   - γράφεται ως μία γραμμή στο ALERT_LOG_FILE (modules/jsonl_log.py)
+# Στην εκκίνηση το ring γεμίζει από το τέλος του log· αν δεν υπάρχει log
+# εισάγεται μία φορά το παλιό alert_history.json.
+#   ALERT_LOG_FILE=data/alerts.jsonl  ALERT_RING_SIZE=500
+#   ALERT_SEGMENT_KB=1024  ALERT_KEEP_SEGMENTS=5
+# ============================================================
+
+import json
+import os
+import threading
+from collections import deque
+from datetime import datetime
+
+from modules.jsonl_log import JsonlLog
+
+
+class AlertStore:
+    def __init__(self, path: str = None, ring_size: int = None, legacy_file: str = None):
+        # Defaults από το env την ώρα της δημιουργίας (τα apps κάνουν load_dotenv() μετά τα imports)
+        path = path or os.getenv("ALERT_LOG_FILE", "data/alerts.jsonl")
+        ring_size = ring_size or int(os.getenv("ALERT_RING_SIZE", 500))
+        if legacy_file is None:
+            legacy_file = os.getenv("ALERT_HISTORY_FILE", "data/alert_history.json")
+        self._log = JsonlLog(path,
+                             segment_bytes=int(os.getenv("ALERT_SEGMENT_KB", 1024)) * 1024,
+                             keep_segments=int(os.getenv("ALERT_KEEP_SEGMENTS", 5)))
+        self._ring = deque(maxlen=max(1, int(ring_size)))
+        self._lock = threading.Lock()
+        if not self._log.segments() and legacy_file:
+            self._import_legacy(legacy_file)
+        self._ring.extend(self._log.tail(self._ring.maxlen))
+
+    def _import_legacy(self, legacy_file):
+        try:
+            if not os.path.exists(legacy_file):
+                return
+            with open(legacy_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, list) and data:
+                self._log.append_many(reversed(data))  # το παλιό αρχείο είναι newest-first
+                print(f"[ALERT_STORE] 📥 {len(data)} alerts από {legacy_file}")
+        except Exception as e:
+            print(f"[ALERT_STORE] ⚠️ Legacy import απέτυχε: {e}")
+
+    def __len__(self):
+        return len(self._ring)
+
+    def append(self, source: str, message: str, **extra):
+        entry = {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "source": source,
+            "message": message,
+        }
+        entry.update(extra)
+        with self._lock:
+            self._ring.append(entry)
+        try:
+            self._log.append(entry)
+        except Exception as e:
+            print(f"[ALERT_STORE] ⚠️ Write failed: {e}")
+        return entry
+
+    def recent(self, limit: int = None, source: str = None):
+        """Νεότερα πρώτα, από τη μνήμη."""
+        with self._lock:
+            items = list(self._ring)
+        items.reverse()
+        if source:
+            source = source.upper()
+            items = [a for a in items if str(a.get("source", "")).upper() == source]
+        return items[:limit] if limit else items
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = AlertStore()
+    return _store
@@ -6,6 +6,7 @@ import pandas as pd
 from dotenv import load_dotenv
 from datetime import datetime
 from modules.health_check import log_message
+from modules.quota_scheduler import SCHEDULER
 
 # --------------------------------------------------
 # 1. Εισαγωγή επιμέρους readers
@@ -49,6 +50,8 @@ def aggregate_all_data():
     else:
         log_message("[AGGREGATOR] ⚠️ No API-Football key found.")
 
+    log_message(f"[AGGREGATOR] 🎟️ Provider quota: {SCHEDULER.stats()}")
+
     # --- (Placeholder για Sportmonks / TheSportsDB) ---
     # Θα προστεθούν στη v2
 
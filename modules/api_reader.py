@@ -4,7 +4,8 @@
 # ============================================================
 
 from datetime import datetime, timedelta
-import requests
+
+from modules import http_client, season_resolver
 
 SUPPORTED_LEAGUES = {
     # England
@@ -82,15 +83,15 @@ def _apifootball_fixtures(league_id: int, apikey: str):
         return {"count": 0, "fixtures": []}
 
     headers = {"x-apisports-key": apikey}
-    season = datetime.now().year
+    season = season_resolver.get_season(league_id, apikey) or datetime.now().year
     to_date = (datetime.now() + timedelta(days=14)).strftime("%Y-%m-%d")
 
     try:
-        r = requests.get(
+        r = http_client.get(
             "https://v3.football.api-sports.io/fixtures",
+            provider="apifootball",
             headers=headers,
             params={"league": league_id, "season": season, "to": to_date, "status": "NS"},
-            timeout=12
         )
         if r.status_code != 200:
             print(f"[API_READER] ⚠️ API-Football fixtures {league_id} HTTP {r.status_code}")
@@ -2,12 +2,11 @@
 # EURO_GOALS – API-FOOTBALL Reader (Final v4)
 # ==============================================
 import os
-import requests
 from dotenv import load_dotenv
-from datetime import datetime, timezone
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from modules.health_check import log_message
+from modules import http_client, season_resolver
 
 # --------------------------------------------------
 # 1. Φόρτωση .env και API key
@@ -17,13 +16,17 @@ API_KEY = os.getenv("APIFOOTBALL_API_KEY")
 BASE_URL = "https://v3.football.api-sports.io"
 HEADERS = {"x-apisports-key": API_KEY, "Accept-Encoding": "gzip"}
 
+# TTL (sec) στο on-disk response cache – ζεστό cache μετά από restart
+FIXTURES_CACHE_TTL = 10 * 60
+ODDS_CACHE_TTL = 5 * 60
+
 
 # --------------------------------------------------
 # 2. Έλεγχος εγκυρότητας API key
 # --------------------------------------------------
 def check_api_key_valid():
     try:
-        r = requests.get(f"{BASE_URL}/status", headers=HEADERS, timeout=10)
+        r = http_client.get(f"{BASE_URL}/status", provider="apifootball", headers=HEADERS)
         if r.status_code == 200:
             log_message("[APIFOOTBALL] ✅ API key is valid and active.")
             return True
@@ -41,41 +44,14 @@ def get_current_season(league_id=39):
     """
     Επιστρέφει τη σωστή σεζόν που περιλαμβάνει την τρέχουσα ημερομηνία.
     Αν δεν υπάρχει, επιλέγει την τελευταία ενεργή completed.
+    Memoized ανά λίγκα (modules/season_resolver.py).
     """
-    try:
-        resp = requests.get(f"{BASE_URL}/leagues?id={league_id}", headers=HEADERS, timeout=10)
-        data = resp.json().get("response", [])
-        if not data:
-            return None
-
-        seasons = data[0].get("seasons", [])
-        if not seasons:
-            return None
-
-        today = datetime.now(timezone.utc).date()
-
-        # 🔍 Έλεγχος ημερομηνιών έναρξης/λήξης
-        for s in seasons:
-            start = s.get("start")
-            end = s.get("end")
-            if start and end:
-                try:
-                    start_date = datetime.strptime(start, "%Y-%m-%d").date()
-                    end_date = datetime.strptime(end, "%Y-%m-%d").date()
-                    if start_date <= today <= end_date:
-                        return s.get("year")  # ✅ αυτή είναι η σωστή τρέχουσα
-                except Exception:
-                    continue
-
-        # Αν δεν βρεθεί τρέχουσα, πάρε την πιο πρόσφατη completed
-        if len(seasons) > 1:
-            return seasons[-2].get("year")
-
-        return seasons[-1].get("year")
+    return season_resolver.get_season(league_id, API_KEY)
 
-    except Exception as e:
-        log_message(f"[APIFOOTBALL] ⚠️ Season fetch error: {e}")
-        return None
+
+def resolve_all_seasons(league_ids=None):
+    """Μαζική επίλυση σεζόν για πολλές λίγκες με ένα /leagues call."""
+    return season_resolver.resolve_seasons(league_ids, API_KEY)
 
 
 # --------------------------------------------------
@@ -88,7 +64,7 @@ def get_fixtures(league_id=39):
 
     try:
         url = f"{BASE_URL}/fixtures?league={league_id}&season={season}"
-        resp = requests.get(url, headers=HEADERS, timeout=15)
+        resp = http_client.get(url, provider="apifootball", headers=HEADERS, cache_ttl=FIXTURES_CACHE_TTL)
         resp.raise_for_status()
         data = resp.json().get("response", [])
         log_message(f"[APIFOOTBALL] ✅ Retrieved {len(data)} fixtures (league={league_id}, season={season}).")
@@ -108,7 +84,7 @@ def get_odds(league_id=39):
 
     try:
         url = f"{BASE_URL}/odds?league={league_id}&season={season}"
-        resp = requests.get(url, headers=HEADERS, timeout=15)
+        resp = http_client.get(url, provider="apifootball", headers=HEADERS, cache_ttl=ODDS_CACHE_TTL)
         data = resp.json().get("response", [])
         log_message(f"[APIFOOTBALL] 💰 Retrieved {len(data)} odds entries (league={league_id}, season={season}).")
         return data
@@ -3,11 +3,15 @@
 # =======================================================
 
 import os
-import requests
 import json
 from datetime import datetime
 from dotenv import load_dotenv
 
+from modules import http_client
+from modules.quota_scheduler import priority_for, PRIORITY_NORMAL
+from modules.identity_index import match_id
+from modules.signal_journal import SignalJournal
+
 # Φόρτωση .env (τοπικά). Στο Render μπαίνει από Environment.
 load_dotenv()
 THEODDS_API_KEY = os.getenv("THEODDS_API_KEY")
@@ -52,7 +56,11 @@ EURO_LEAGUES = [
     "soccer_turkey_1_lig",
 ]
 
-LOG_JSON = "smartmoney_log.json"
+LOG_JSON = "smartmoney_log.json"  # παλιό format (εισάγεται μία φορά στο journal)
+_JOURNAL = None
+
+# league -> προτεραιότητα (live / kickoff εντός 2h πρώτα) από τον προηγούμενο κύκλο
+_LEAGUE_PRIORITY = {}
 
 def detect_smart_money():
     """
@@ -75,7 +83,8 @@ def detect_smart_money():
         return alerts
 
     base = "https://api.the-odds-api.com/v4/sports"
-    for league in EURO_LEAGUES:
+    leagues = sorted(EURO_LEAGUES, key=lambda lg: _LEAGUE_PRIORITY.get(lg, PRIORITY_NORMAL))
+    for league in leagues:
         try:
             url = f"{base}/{league}/odds"
             params = {
@@ -84,11 +93,14 @@ def detect_smart_money():
                 "oddsFormat": "decimal",
                 "apiKey": THEODDS_API_KEY
             }
-            r = requests.get(url, params=params, timeout=12)
+            r = http_client.get(url, provider="theodds", params=params,
+                                priority=_LEAGUE_PRIORITY.get(league, PRIORITY_NORMAL))
             if r.status_code != 200:
                 print(f"[ASIAN READER] ⚠️ {league}: status {r.status_code}")
                 continue
             data = r.json()
+            _LEAGUE_PRIORITY[league] = min(
+                [priority_for(m.get("commence_time")) for m in data] or [PRIORITY_NORMAL])
             for match in data:
                 home = match.get("home_team")
                 away = match.get("away_team")
@@ -105,6 +117,8 @@ def detect_smart_money():
                                     alerts.append({
                                         "league": league,
                                         "match": f"{home} vs {away}",
+                                        "match_id": match_id(home, away, match.get("commence_time"),
+                                                             provider="theodds"),
                                         "movement": f"{p1} / {p2}",
                                         "timestamp": now
                                     })
@@ -119,20 +133,24 @@ def detect_smart_money():
     print(f"[ASIAN READER] ✅ Found {len(alerts)} alerts.")
     return alerts
 
+def get_journal():
+    """Append-only journal των runs (modules/signal_journal.py)."""
+    global _JOURNAL
+    if _JOURNAL is None:
+        _JOURNAL = SignalJournal(legacy_file=LOG_JSON)
+    return _JOURNAL
+
 def _append_log(ts, alerts):
-    """Προσθέτει τα αποτελέσματα σε smartmoney_log.json"""
-    entry = {"timestamp": ts, "alerts": alerts}
+    """Προσθέτει τα αποτελέσματα στο smart-money journal"""
     try:
-        data = []
-        if os.path.exists(LOG_JSON):
-            with open(LOG_JSON, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        data.append(entry)
-        with open(LOG_JSON, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        get_journal().append({"timestamp": ts, "alerts": alerts})
         print("[ASIAN READER] 💾 Log updated.")
     except Exception as e:
         print("[ASIAN READER] ⚠️ Log write failed:", e)
 
+def signals_between(start, end=None):
+    """Runs με start <= timestamp <= end (seek μέσω του index, χωρίς πλήρες parse)."""
+    return get_journal().between(start, end)
+
 if __name__ == "__main__":
     print(json.dumps(detect_smart_money(), indent=2, ensure_ascii=False))
@@ -0,0 +1,164 @@
+# ============================================================
+# modules/browser_pool.py
+# Persistent pool από headless browser sessions (requests_html)
+# ============================================================
+# Κάθε worker thread κρατά το δικό του HTMLSession + Chromium για όλη
+# τη διάρκεια του pool, ώστε οι λίγκες του Flashscore να γίνονται
+# render παράλληλα χωρίς νέο browser launch ανά σελίδα.
+# Τα threads μοιράζονται ένα per-host delay, ώστε ο ρυθμός αιτημάτων
+# προς το ίδιο site να μένει όσο με το σειριακό polite_sleep.
+# ============================================================
+
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+try:
+    import pyppeteer
+    from requests_html import HTMLSession
+    JS_ENABLED = True
+except Exception:
+    JS_ENABLED = False
+
+BROWSER_ARGS = ["--no-sandbox", "--disable-gpu", "--disable-dev-shm-usage"]
+
+
+class BrowserPool:
+    def __init__(self, size: int = 4, delay=(1.0, 2.0)):
+        self.size = max(1, int(size))
+        # (min, max) δευτερόλεπτα ανάμεσα σε δύο GET στον ίδιο host, όλα τα threads μαζί
+        self.delay = (max(0.0, float(delay[0])), max(0.0, float(delay[1])))
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+        self._next_slot = {}
+        self._executor = None
+
+    def _wait_for_host(self, url):
+        """Κρατά θέση για το επόμενο GET στον host και περιμένει μέχρι τότε (εκτός lock)."""
+        lo, hi = self.delay
+        if hi <= 0:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + random.uniform(lo, max(lo, hi))
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _session(self):
+        sess = getattr(self._local, "session", None)
+        if sess is None:
+            # Κάθε thread χρειάζεται δικό του event loop για το pyppeteer
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            sess = HTMLSession()
+            # Launch εδώ με απενεργοποιημένους signal handlers – το default
+            # launch του requests_html δουλεύει μόνο στο main thread
+            sess._browser = loop.run_until_complete(pyppeteer.launch(
+                headless=True, args=BROWSER_ARGS,
+                handleSIGINT=False, handleSIGTERM=False, handleSIGHUP=False))
+            # Το HTML.render() τρέχει στο session.loop – το property browser
+            # το ορίζει μόνο όταν λείπει το _browser, άρα το βάζουμε εμείς
+            sess.loop = loop
+            self._local.session = sess
+            with self._lock:
+                self._sessions.append((sess, loop))
+        return sess
+
+    def render(self, url, headers=None, timeout=20, render_timeout=30, sleep=2):
+        """GET + JS render μίας σελίδας· επιστρέφει το requests_html HTML object."""
+        sess = self._session()
+        self._wait_for_host(url)
+        r = sess.get(url, headers=headers, timeout=timeout)
+        r.html.render(timeout=render_timeout, sleep=sleep)
+        return r.html
+
+    def map(self, fn, items):
+        """Τρέχει fn(item) παράλληλα στα threads του pool· yield (item, result|exception)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="browser")
+        futures = {self._executor.submit(fn, it): it for it in items}
+        for fut in as_completed(futures):
+            try:
+                yield futures[fut], fut.result()
+            except Exception as e:
+                yield futures[fut], e
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        # Τα worker threads έχουν τελειώσει – κλείνουμε κάθε browser στο δικό του loop
+        for sess, loop in sessions:
+            try:
+                loop.run_until_complete(sess._browser.close())
+            except Exception:
+                pass
+            finally:
+                super(HTMLSession, sess).close()  # μόνο τα HTTP adapters
+                loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ------------------------------------------------------------
+# Self-check: python -m modules.browser_pool [threads]
+# Σερβίρει τοπικά μια σελίδα που γράφει το περιεχόμενό της με JS και
+# την κάνει render από όλα τα threads του pool (χωρίς JS δεν υπάρχει το #out).
+# ------------------------------------------------------------
+_CHECK_PAGE = (b"<html><body><div id='out'></div><script>"
+               b"document.getElementById('out').innerHTML ="
+               b" '<span class=\"event__match\">rendered</span>';"
+               b"</script></body></html>")
+
+
+def _self_check(size=2, pages=4):
+    import http.server
+
+    class _Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(_CHECK_PAGE)))
+            self.end_headers()
+            self.wfile.write(_CHECK_PAGE)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    def _render(i):
+        html = pool.render(f"{url}?p={i}", sleep=0)
+        return [el.text for el in html.find("#out .event__match")]
+
+    try:
+        with BrowserPool(size=size, delay=(0, 0)) as pool:
+            results = dict(pool.map(_render, range(pages)))
+    finally:
+        server.shutdown()
+    for i, res in sorted(results.items()):
+        assert not isinstance(res, Exception), f"page {i}: {res!r}"
+        assert res == ["rendered"], f"page {i}: {res!r}"
+    print(f"[BROWSER_POOL] ✅ {pages} pages rendered σε {size} threads")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if not JS_ENABLED:
+        raise SystemExit("[BROWSER_POOL] ⚠️ requests_html/pyppeteer δεν είναι εγκατεστημένα")
+    _self_check(size=int(sys.argv[1]) if len(sys.argv) > 1 else 2)
@@ -0,0 +1,84 @@
+# ============================================================
+# modules/change_filter.py
+# Change-only ingestion: compact hash ανά event ανά provider
+# ============================================================
+# Κάθε feed κρατά ένα 8-byte blake2b hash των πεδίων που μας ενδιαφέρουν
+# (π.χ. σκορ + status) ανά provider event id. Σε κάθε κύκλο περνούν
+# downstream (DB writes, alerts, cross-verification) μόνο τα νέα ή
+# αλλαγμένα events. Events που λείπουν από το feed για `keep_cycles`
+# κύκλους ξεχνιούνται, ώστε η μνήμη να ακολουθεί το μέγεθος του feed.
+# ============================================================
+
+import hashlib
+import threading
+
+
+def content_hash(values) -> bytes:
+    return hashlib.blake2b(repr(values).encode("utf-8"), digest_size=8).digest()
+
+
+class ChangeFilter:
+    def __init__(self, name: str, key, fields, keep_cycles: int = 3):
+        """
+        key(event)    → provider event id
+        fields(event) → tuple με τα πεδία που ορίζουν «αλλαγή»
+        """
+        self.name = name
+        self._key = key
+        self._fields = fields
+        self.keep_cycles = max(1, int(keep_cycles))
+        self._seen = {}  # event id -> (hash, cycle)
+        self._cycle = 0
+        self._lock = threading.Lock()
+        self.passed = self.suppressed = 0
+
+    def __len__(self):
+        return len(self._seen)
+
+    def partition(self, events):
+        """Επιστρέφει (new, changed)· τα αμετάβλητα events απορρίπτονται."""
+        new, changed = [], []
+        with self._lock:
+            self._cycle += 1
+            cycle = self._cycle
+            for ev in events or []:
+                try:
+                    key = self._key(ev)
+                    digest = content_hash(self._fields(ev))
+                except (KeyError, TypeError, AttributeError):
+                    continue
+                prev = self._seen.get(key)
+                self._seen[key] = (digest, cycle)
+                if prev is None:
+                    new.append(ev)
+                elif prev[0] != digest:
+                    changed.append(ev)
+                else:
+                    self.suppressed += 1
+            self.passed += len(new) + len(changed)
+            horizon = cycle - self.keep_cycles
+            for key in [k for k, (_, c) in self._seen.items() if c <= horizon]:
+                del self._seen[key]
+        return new, changed
+
+    def changes(self, events):
+        """Νέα + αλλαγμένα events (με τη σειρά του feed)."""
+        new, changed = self.partition(events)
+        if not new or not changed:
+            return new or changed
+        passed = {id(ev) for ev in new} | {id(ev) for ev in changed}
+        return [ev for ev in events if id(ev) in passed]
+
+    def forget(self, keys=None):
+        """Ξεχνά events (ή όλα) – π.χ. όταν αποτύχει το downstream write."""
+        with self._lock:
+            if keys is None:
+                self._seen.clear()
+                return
+            for key in keys:
+                self._seen.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {"name": self.name, "tracked": len(self._seen), "cycles": self._cycle,
+                    "passed": self.passed, "suppressed": self.suppressed}
@@ -0,0 +1,135 @@
+# ============================================================
+# modules/db_engine.py
+# Κοινό SQLAlchemy engine ανά process (SQLite WAL / Postgres pool)
+# ============================================================
+# Όλα τα modules (feeds, verifier, season manager, apps) μοιράζονται
+# ΕΝΑ engine ανά DATABASE_URL αντί για ένα pool το καθένα.
+#   SQLite  : journal_mode=WAL, synchronous=NORMAL, busy_timeout, mmap_size
+#             → οι readers δεν μπλοκάρουν τον writer (feed threads / verifier)
+#   Postgres: pool_size / max_overflow, pool_pre_ping, pool_recycle,
+#             statement_timeout
+# get_read_engine(): ξεχωριστό read-only engine για dashboard queries
+# (DATABASE_READ_URL αν υπάρχει replica, αλλιώς η ίδια βάση σε read-only).
+#   DB_POOL_SIZE=5  DB_MAX_OVERFLOW=10  DB_POOL_RECYCLE=1800
+#   DB_STATEMENT_TIMEOUT_MS=15000  DB_BUSY_TIMEOUT_MS=5000
+#   DB_SQLITE_MMAP_MB=256
+# ============================================================
+
+import os
+import threading
+
+from sqlalchemy import create_engine, event
+
+DEFAULT_URL = "sqlite:///matches.db"
+
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 15000))
+BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", 5000))
+SQLITE_MMAP_MB = int(os.getenv("DB_SQLITE_MMAP_MB", 256))
+
+_engines = {}
+_lock = threading.Lock()
+
+
+def database_url():
+    # Διαβάζεται την ώρα της κλήσης: τα apps κάνουν load_dotenv() μετά τα imports
+    return os.getenv("DATABASE_URL", DEFAULT_URL)
+
+
+def normalize_url(url):
+    # Render/Heroku δίνουν "postgres://" – το SQLAlchemy 2.x θέλει "postgresql://"
+    if url.startswith("postgres://"):
+        return "postgresql://" + url[len("postgres://"):]
+    return url
+
+
+def _is_memory(url):
+    return url in ("sqlite://", "sqlite:///:memory:") or ":memory:" in url
+
+
+def _sqlite_engine(url, read_only):
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False, "timeout": BUSY_TIMEOUT_MS / 1000},
+    )
+    memory = _is_memory(url)
+
+    @event.listens_for(engine, "connect")
+    def _pragmas(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        try:
+            if not memory:
+                cur.execute("PRAGMA journal_mode=WAL")
+                cur.execute(f"PRAGMA mmap_size={SQLITE_MMAP_MB * 1024 * 1024}")
+            cur.execute("PRAGMA synchronous=NORMAL")
+            cur.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            if read_only:
+                cur.execute("PRAGMA query_only=ON")
+        except Exception as e:
+            print(f"[DB_ENGINE] ⚠️ SQLite pragmas: {e}")
+        finally:
+            cur.close()
+
+    return engine
+
+
+def _server_engine(url, read_only):
+    connect_args = {}
+    if url.startswith("postgresql"):
+        options = f"-c statement_timeout={STATEMENT_TIMEOUT_MS}"
+        if read_only:
+            options += " -c default_transaction_read_only=on"
+        connect_args["options"] = options
+    return create_engine(
+        url,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=POOL_RECYCLE,
+        connect_args=connect_args,
+    )
+
+
+def _build(url, read_only):
+    if url.startswith("sqlite"):
+        return _sqlite_engine(url, read_only)
+    return _server_engine(url, read_only)
+
+
+def _cached(url, read_only):
+    key = (url, read_only)
+    engine = _engines.get(key)
+    if engine is None:
+        with _lock:
+            engine = _engines.get(key)
+            if engine is None:
+                engine = _engines[key] = _build(url, read_only)
+    return engine
+
+
+def get_engine(url=None):
+    """Το κοινό read/write engine για το `url` (default DATABASE_URL)."""
+    return _cached(normalize_url(url or database_url()), False)
+
+
+def get_read_engine(url=None):
+    """
+    Read-only engine για dashboard/API queries: DATABASE_READ_URL (replica)
+    αν έχει οριστεί, αλλιώς ξεχωριστό pool στην ίδια βάση με query_only /
+    default_transaction_read_only ώστε να μην ανταγωνίζεται τους writers.
+    """
+    if url is None:
+        url = os.getenv("DATABASE_READ_URL") or database_url()
+    url = normalize_url(url)
+    if _is_memory(url):
+        return get_engine(url)  # κάθε σύνδεση :memory: είναι άλλη βάση
+    return _cached(url, True)
+
+
+def dispose_all():
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
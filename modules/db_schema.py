@@ -0,0 +1,137 @@
+# ============================================================
+# modules/db_schema.py
+# Canonical schema του πίνακα `matches` + hot-path indexes
+# ============================================================
+# Ο πίνακας γράφεται από πολλά σημεία με διαφορετικές στήλες:
+#   main.py / setup_matches_table.py → date, league, home_team, away_team, *_odds, result
+#   season_manager.py                → league, season, date, home_team, away_team, score
+#   live_feeds.py / cross_verifier   → match_id, home, away, score, status, source, updated_at
+#   EURO_GOALS_v9_x (ORM)            → provider_id, home, away, kickoff_utc, status
+# Εδώ ορίζεται η ένωσή τους (MATCH_COLUMNS) και τα indexes των queries:
+#   live  : WHERE status IN (...) ORDER BY updated_at DESC  (composite + partial)
+#   league: WHERE league=... AND date ...                    (composite)
+#   ids   : ON CONFLICT(match_id), (source, provider_id)     (unique / composite)
+# ensure_schema() δημιουργεί ή αναβαθμίζει in place (SQLite/Postgres)·
+# CLI: migrate_db.py
+# ============================================================
+
+from sqlalchemy import inspect, text
+
+TABLE = "matches"
+
+# Η κοινή λίστα live statuses – ίδια με το predicate του partial index,
+# ώστε ο planner (και του SQLite) να μπορεί να τον χρησιμοποιήσει.
+LIVE_STATUSES = ("live", "inprogress", "1st_half", "2nd_half", "extra_time")
+
+# name → type (κοινοί τύποι SQLite/Postgres· το id ορίζεται ανά dialect)
+MATCH_COLUMNS = {
+    "match_id": "TEXT",
+    "provider_id": "TEXT",
+    "source": "TEXT",
+    "league": "TEXT",
+    "season": "TEXT",
+    "date": "TEXT",
+    "kickoff_utc": "TIMESTAMP",
+    "home_team": "TEXT",
+    "away_team": "TEXT",
+    "home": "TEXT",
+    "away": "TEXT",
+    "home_odds": "FLOAT",
+    "draw_odds": "FLOAT",
+    "away_odds": "FLOAT",
+    "score": "TEXT",
+    "result": "TEXT",
+    "status": "TEXT",
+    "created_at": "TIMESTAMP",
+    "updated_at": "TIMESTAMP",
+}
+
+_ID_COLUMN = {
+    "sqlite": "id INTEGER PRIMARY KEY AUTOINCREMENT",
+    "postgresql": "id SERIAL PRIMARY KEY",
+}
+
+_LIVE_PREDICATE = "status IN (" + ", ".join(f"'{s}'" for s in LIVE_STATUSES) + ")"
+
+# (name, columns, unique, partial WHERE)
+MATCH_INDEXES = [
+    ("ix_matches_status_updated", "status, updated_at", False, None),
+    ("ix_matches_live_updated", "updated_at", False, _LIVE_PREDICATE),
+    ("ix_matches_league_date", "league, date", False, None),
+    ("ux_matches_match_id", "match_id", True, None),
+    ("ix_matches_provider", "source, provider_id", False, None),
+    ("ix_matches_home_away", "home, away", False, None),
+    # Natural key του season_manager (idempotent backfill)
+    ("ux_matches_natural_key", "league, date, home_team, away_team", True, None),
+]
+
+
+def _dialect(engine):
+    return engine.dialect.name
+
+
+def create_table_sql(dialect):
+    cols = [_ID_COLUMN.get(dialect, _ID_COLUMN["postgresql"])]
+    for name, col_type in MATCH_COLUMNS.items():
+        default = " DEFAULT CURRENT_TIMESTAMP" if name == "created_at" else ""
+        cols.append(f"{name} {col_type}{default}")
+    body = ",\n    ".join(cols)
+    return f"CREATE TABLE IF NOT EXISTS {TABLE} (\n    {body}\n)"
+
+
+def index_sql(name, columns, unique, where):
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    sql = f"CREATE {kind} IF NOT EXISTS {name} ON {TABLE} ({columns})"
+    return f"{sql} WHERE {where}" if where else sql
+
+
+def plan(engine):
+    """Λίστα (περιγραφή, SQL) με ό,τι λείπει από τη βάση – κενή αν είναι ενημερωμένη."""
+    inspector = inspect(engine)
+    steps = []
+    if TABLE not in inspector.get_table_names():
+        steps.append((f"create table {TABLE}", create_table_sql(_dialect(engine))))
+        existing_cols, existing_idx = set(), set()
+    else:
+        existing_cols = {c["name"] for c in inspector.get_columns(TABLE)}
+        existing_idx = {ix["name"] for ix in inspector.get_indexes(TABLE)}
+        existing_idx |= {uc["name"] for uc in inspector.get_unique_constraints(TABLE) if uc.get("name")}
+        for name, col_type in MATCH_COLUMNS.items():
+            if name not in existing_cols:
+                # Χωρίς DEFAULT CURRENT_TIMESTAMP: το SQLite δεν το δέχεται σε ADD COLUMN
+                steps.append((f"add column {name}", f"ALTER TABLE {TABLE} ADD COLUMN {name} {col_type}"))
+    for name, columns, unique, where in MATCH_INDEXES:
+        if name not in existing_idx:
+            steps.append((f"create index {name}", index_sql(name, columns, unique, where)))
+    return steps
+
+
+def ensure_schema(engine, dry_run=False, analyze=True):
+    """
+    Δημιουργεί/αναβαθμίζει τον πίνακα `matches` in place.
+    Κάθε βήμα τρέχει σε δικό του transaction: ένα unique index που αποτυγχάνει
+    (π.χ. υπάρχοντα διπλότυπα) δεν μπλοκάρει τις υπόλοιπες αλλαγές.
+    Επιστρέφει (applied, failed) ως λίστες περιγραφών.
+    """
+    steps = plan(engine)
+    applied, failed = [], []
+    if dry_run:
+        for desc, sql in steps:
+            print(f"[DB_SCHEMA] 📝 {desc}: {sql}")
+        return [desc for desc, _ in steps], failed
+    for desc, sql in steps:
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(sql))
+            applied.append(desc)
+        except Exception as e:
+            print(f"[DB_SCHEMA] ⚠️ {desc} απέτυχε: {e.__class__.__name__}: {str(e).splitlines()[0]}")
+            failed.append(desc)
+    if applied and analyze:
+        # Στατιστικά για τον planner ώστε να επιλέγει τα νέα indexes
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(f"ANALYZE {TABLE}"))
+        except Exception as e:
+            print(f"[DB_SCHEMA] ⚠️ ANALYZE απέτυχε: {e}")
+    return applied, failed
@@ -0,0 +1,149 @@
+# ============================================================
+# modules/disk_cache.py
+# Persistent HTTP response cache (SQLite) – επιβιώνει restarts
+# ============================================================
+# Κλειδί: method + URL + params. Κάθε entry έχει δικό του TTL και
+# το αρχείο έχει συνολικό όριο μεγέθους (παλαιότερα entries φεύγουν πρώτα).
+# Χρησιμοποιείται από modules/http_client.py όταν δοθεί cache_ttl.
+# Το URL αποθηκεύεται μόνο για debugging και χωρίς secrets (apiKey κ.λπ.).
+#   HTTP_DISK_CACHE=OFF              → απενεργοποίηση
+#   HTTP_DISK_CACHE_PATH=...         → αρχείο SQLite
+#   HTTP_DISK_CACHE_MAX_MB=50        → όριο μεγέθους
+# ============================================================
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DISK_CACHE_ENABLED = os.getenv("HTTP_DISK_CACHE", "ON").upper() == "ON"
+DISK_CACHE_PATH = os.getenv("HTTP_DISK_CACHE_PATH", os.path.join("data", "http_cache.sqlite"))
+DISK_CACHE_MAX_BYTES = int(float(os.getenv("HTTP_DISK_CACHE_MAX_MB", 50)) * 1024 * 1024)
+
+# Query params που δεν γράφονται ποτέ στο αρχείο (σύγκριση lower-case)
+SECRET_PARAMS = {"apikey", "api_key", "key", "token", "access_token", "secret", "password", "sig", "signature"}
+
+
+def make_key(method: str, url: str, params=None) -> str:
+    if isinstance(params, dict):
+        params = sorted((k, str(v)) for k, v in params.items() if v is not None)
+    qs = urlencode(params or [])
+    return hashlib.sha256(f"{method.upper()} {url}?{qs}".encode("utf-8")).hexdigest()
+
+
+def redact_url(url: str) -> str:
+    """Αφαιρεί τις τιμές των secret query params (π.χ. apiKey του TheOdds)."""
+    if not url or "?" not in url:
+        return url
+    parts = urlsplit(url)
+    query = [(k, "***" if k.lower() in SECRET_PARAMS else v)
+             for k, v in parse_qsl(parts.query, keep_blank_values=True)]
+    return urlunsplit(parts._replace(query=urlencode(query, safe="*")))
+
+
+class DiskCache:
+    def __init__(self, path: str = DISK_CACHE_PATH, max_bytes: int = DISK_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key         TEXT PRIMARY KEY,
+                url         TEXT,
+                status      INTEGER,
+                headers     TEXT,
+                body        BLOB,
+                size        INTEGER,
+                stored_at   REAL,
+                expires_at  REAL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_responses_stored_at ON responses (stored_at)")
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key: str):
+        """Επιστρέφει (url, status, headers, body) ή None αν λείπει / έληξε."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, body, url, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[4] < time.time():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[3], row[0], json.loads(row[1] or "{}"), bytes(row[2])
+
+    def put(self, key: str, url: str, status: int, headers: dict, body: bytes, ttl: float):
+        body = body or b""
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, status, headers, body, size, stored_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, redact_url(url), status, json.dumps(headers or {}), sqlite3.Binary(body), len(body), now, now + ttl),
+            )
+            self._total += len(body) - (old[0] if old else 0)
+            if self._total > self.max_bytes:
+                self._evict(now)
+
+    def _evict(self, now):
+        # Πρώτα τα ληγμένα, μετά τα παλαιότερα μέχρι να πέσουμε στο 90% του ορίου
+        cur = self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (now,))
+        self.evictions += max(cur.rowcount, 0)
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        target = int(self.max_bytes * 0.9)
+        if self._total <= target:
+            return
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY stored_at"):
+            victims.append((key,))
+            freed += size
+            if self._total - freed <= target:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.evictions += len(victims)
+        self._total -= freed
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._total = 0
+
+    def stats(self):
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {"path": self.path, "entries": count, "bytes": self._total, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Το κοινό DiskCache (None αν είναι απενεργοποιημένο ή δεν ανοίγει το αρχείο)."""
+    global _cache, DISK_CACHE_ENABLED
+    if not DISK_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = DiskCache()
+                except Exception as e:
+                    print(f"[DISK_CACHE] ⚠️ Disabled – cannot open {DISK_CACHE_PATH}: {e}")
+                    DISK_CACHE_ENABLED = False
+                    return None
+    return _cache
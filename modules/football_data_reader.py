@@ -17,6 +17,7 @@ from dotenv import load_dotenv
 # --------------------------------------------------
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from modules.health_check import log_message
+from modules import http_client
 
 # --------------------------------------------------
 # 1. Φόρτωση .env και API key
@@ -35,7 +36,7 @@ def check_api_key_valid():
     """Ελέγχει αν το FOOTBALLDATA_API_KEY είναι έγκυρο."""
     test_url = f"{BASE_URL}/competitions/PL/matches"
     try:
-        response = requests.get(test_url, headers=HEADERS, timeout=10)
+        response = http_client.get(test_url, provider="footballdata", headers=HEADERS)
         if response.status_code == 200:
             log_message("[FOOTBALLDATA] ✅ API key is valid and active.")
             return True
@@ -61,7 +62,7 @@ def get_fixtures(competition="PL", status="SCHEDULED"):
     """
     url = f"{BASE_URL}/competitions/{competition}/matches?status={status}"
     try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
+        response = http_client.get(url, provider="footballdata", headers=HEADERS)
         response.raise_for_status()
         data = response.json()
 
@@ -92,7 +93,7 @@ def get_fixtures(competition="PL", status="SCHEDULED"):
 def get_competitions():
     """Επιστρέφει λίστα διαθεσίμων διοργανώσεων."""
     try:
-        response = requests.get(f"{BASE_URL}/competitions", headers=HEADERS, timeout=10)
+        response = http_client.get(f"{BASE_URL}/competitions", provider="footballdata", headers=HEADERS)
         response.raise_for_status()
         comps = [c["code"] for c in response.json().get("competitions", [])]
         log_message(f"[FOOTBALLDATA] ✅ Competitions loaded ({len(comps)} total)")
@@ -1,9 +1,18 @@
 # ==============================================
 # GOAL TRACKER MODULE – Sofascore Live Goals
 # ==============================================
-import requests
 from datetime import datetime
 
+from modules import http_client
+from modules.change_filter import ChangeFilter
+
+# Hash του σκορ ανά Sofascore event – goal alert μόνο όταν αλλάξει
+GOAL_CHANGES = ChangeFilter(
+    "goals",
+    key=lambda e: e["id"],
+    fields=lambda e: (e["homeScore"].get("current"), e["awayScore"].get("current")),
+)
+
 def fetch_live_goals():
     """
     Ελέγχει για live αγώνες από το Sofascore API
@@ -12,23 +21,26 @@ def fetch_live_goals():
     alerts = []
     try:
         url = "https://api.sofascore.com/api/v1/sport/football/events/live"
-        res = requests.get(url, timeout=8)
+        res = http_client.get(url, provider="sofascore")
         data = res.json()
 
-        for event in data.get("events", []):
+        new, changed = GOAL_CHANGES.partition(data.get("events", []))
+        # Πρώτη εμφάνιση: alert μόνο αν το feed σημειώνει πρόσφατη αλλαγή σκορ
+        fresh = [e for e in new
+                 if e.get("changes", {}).get("homeScore") or e.get("changes", {}).get("awayScore")]
+
+        for event in fresh + changed:
             home = event["homeTeam"]["name"]
             away = event["awayTeam"]["name"]
             score_home = event["homeScore"]["current"]
             score_away = event["awayScore"]["current"]
 
-            # Αν ο αγώνας έχει πρόσφατα γκολ ή αλλαγή σκορ
-            if event.get("changes", {}).get("homeScore") or event.get("changes", {}).get("awayScore"):
-                msg = f"⚽ Goal in {home} vs {away} ({score_home}-{score_away})"
-                alerts.append({
-                    "alert_type": "goal",
-                    "message": msg,
-                    "timestamp": datetime.now().isoformat()
-                })
+            msg = f"⚽ Goal in {home} vs {away} ({score_home}-{score_away})"
+            alerts.append({
+                "alert_type": "goal",
+                "message": msg,
+                "timestamp": datetime.now().isoformat()
+            })
 
         if alerts:
             print(f"[GOAL TRACKER] ✅ {len(alerts)} new goal(s) detected.")
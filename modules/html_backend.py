@@ -0,0 +1,185 @@
+# ============================================================
+# modules/html_backend.py
+# Pluggable HTML parsing backend (selectolax → lxml → BeautifulSoup)
+# ============================================================
+# Ένα κοινό API για scraping γραμμών από σελίδες (π.χ. Flashscore):
+#   extract_rows(html, ".event__match", {"home": ".event__participant--home", ...})
+# - Κάθε selector γίνεται compile μία φορά (cache ανά backend)
+# - Κάθε πεδίο αναζητείται ΜΙΑ φορά ανά γραμμή (single pass)
+# - Προαιρετικό header selector: κάθε γραμμή παίρνει το κείμενο του
+#   τελευταίου header που προηγείται στο έγγραφο (π.χ. τίτλος λίγκας)
+#   HTML_BACKEND=auto|selectolax|lxml|bs4
+# ============================================================
+
+import os
+import re
+from functools import lru_cache
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    HAS_SELECTOLAX = True
+except Exception:
+    try:
+        from selectolax.parser import HTMLParser  # selectolax < 0.3.13 (modest)
+        HAS_SELECTOLAX = True
+    except Exception:
+        HAS_SELECTOLAX = False
+
+try:
+    from lxml import etree, html as lxml_html
+    HAS_LXML = True
+except Exception:
+    HAS_LXML = False
+
+from bs4 import BeautifulSoup
+
+HTML_BACKEND = os.getenv("HTML_BACKEND", "auto").lower()
+
+# Απλοί selectors: tag, .class, tag.class.class, [attr] – ό,τι χρειάζονται οι readers
+_SIMPLE = re.compile(r"^(?P<tag>[a-zA-Z][\w-]*)?(?P<classes>(?:\.[\w-]+)*)$")
+
+
+def available_backends():
+    out = []
+    if HAS_SELECTOLAX:
+        out.append("selectolax")
+    if HAS_LXML:
+        out.append("lxml")
+    out.append("bs4")
+    return out
+
+
+def resolve_backend(name=None):
+    name = (name or HTML_BACKEND).lower()
+    if name == "auto":
+        return available_backends()[0]
+    if name not in available_backends():
+        print(f"[HTML_BACKEND] ⚠️ '{name}' not available – using {available_backends()[0]}")
+        return available_backends()[0]
+    return name
+
+
+def _normalize_fields(fields):
+    """{name: selector | (selector, attr)} → [(name, selector|None, attr|None)]."""
+    out = []
+    for name, spec in fields.items():
+        if isinstance(spec, tuple):
+            sel, attr = spec
+        else:
+            sel, attr = spec, None
+        out.append((name, sel or None, attr))
+    return tuple(out)
+
+
+# ---------------- lxml: CSS → compiled XPath ----------------
+@lru_cache(maxsize=256)
+def _xpath_for(selector, relative):
+    parts = []
+    for alt in selector.split(","):
+        m = _SIMPLE.match(alt.strip())
+        if not m:
+            raise ValueError(f"Unsupported selector for lxml backend: {alt!r}")
+        tag = m.group("tag") or "*"
+        conds = "".join(
+            f"[contains(concat(' ', normalize-space(@class), ' '), ' {c} ')]"
+            for c in m.group("classes").split(".") if c
+        )
+        parts.append(f"{'.' if relative else ''}//{tag}{conds}")
+    return etree.XPath(" | ".join(parts))
+
+
+def _text_lxml(node):
+    return " ".join(node.text_content().split()) if node is not None else ""
+
+
+def _rows_lxml(markup, row_sel, fields, header_sel):
+    root = lxml_html.fromstring(markup)
+    compiled = [(name, _xpath_for(sel, True) if sel else None, attr) for name, sel, attr in fields]
+    combined = f"{header_sel}, {row_sel}" if header_sel else row_sel
+    row_nodes = set(_xpath_for(row_sel, False)(root)) if header_sel else None
+    header = ""
+    rows = []
+    for node in _xpath_for(combined, False)(root):
+        if row_nodes is not None and node not in row_nodes:
+            header = _text_lxml(node)
+            continue
+        rows.append(_fill(node, compiled, header, header_sel, _first_lxml, _text_lxml, _attr_lxml))
+    return rows
+
+
+def _first_lxml(node, xp):
+    found = xp(node)
+    return found[0] if found else None
+
+
+def _attr_lxml(node, attr):
+    return node.get(attr) if node is not None else None
+
+
+# ---------------- selectolax ----------------
+def _rows_selectolax(markup, row_sel, fields, header_sel):
+    tree = HTMLParser(markup)
+    combined = f"{header_sel}, {row_sel}" if header_sel else row_sel
+    row_ids = None
+    if header_sel:
+        # Τα row nodes για να ξεχωρίζουν από τα headers (ίδια σειρά εγγράφου)
+        row_ids = {n.mem_id for n in tree.css(row_sel)}
+    header = ""
+    rows = []
+    for node in tree.css(combined):
+        if row_ids is not None and node.mem_id not in row_ids:
+            header = _text_selectolax(node)
+            continue
+        rows.append(_fill(node, fields, header, header_sel,
+                          lambda n, sel: n.css_first(sel), _text_selectolax,
+                          lambda n, a: n.attributes.get(a) if n is not None else None))
+    return rows
+
+
+def _text_selectolax(node):
+    return " ".join(node.text().split()) if node is not None else ""
+
+
+# ---------------- BeautifulSoup ----------------
+def _rows_bs4(markup, row_sel, fields, header_sel):
+    soup = BeautifulSoup(markup, "lxml" if HAS_LXML else "html.parser")
+    combined = f"{header_sel}, {row_sel}" if header_sel else row_sel
+    row_ids = {id(n) for n in soup.select(row_sel)} if header_sel else None
+    header = ""
+    rows = []
+    for node in soup.select(combined):
+        if row_ids is not None and id(node) not in row_ids:
+            header = _text_bs4(node)
+            continue
+        rows.append(_fill(node, fields, header, header_sel,
+                          lambda n, sel: n.select_one(sel), _text_bs4,
+                          lambda n, a: n.get(a) if n is not None else None))
+    return rows
+
+
+def _text_bs4(node):
+    return " ".join(node.get_text().split()) if node is not None else ""
+
+
+# ---------------- κοινά ----------------
+def _fill(node, fields, header, header_sel, first, text_of, attr_of):
+    row = {"header": header} if header_sel else {}
+    for name, sel, attr in fields:
+        target = first(node, sel) if sel else node  # μία αναζήτηση ανά πεδίο
+        row[name] = attr_of(target, attr) if attr else text_of(target)
+    return row
+
+
+_IMPL = {"selectolax": _rows_selectolax, "lxml": _rows_lxml, "bs4": _rows_bs4}
+
+
+def extract_rows(markup, row_selector, fields, header=None, backend=None):
+    """
+    Επιστρέφει μία dict ανά γραμμή που ταιριάζει στο row_selector.
+    fields: {όνομα: selector} για κείμενο ή {όνομα: (selector|None, attr)} για attribute
+            (selector None = attribute της ίδιας της γραμμής).
+    header: selector για headers ομάδων – το κείμενό τους μπαίνει στο "header" κάθε γραμμής.
+    """
+    if not markup:
+        return []
+    return _IMPL[resolve_backend(backend)](markup, row_selector, _normalize_fields(fields), header)
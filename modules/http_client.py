@@ -0,0 +1,162 @@
+# ============================================================
+# modules/http_client.py
+# Shared pooled HTTP client για όλους τους readers
+# (keep-alive pools ανά host, gzip, retry με jitter, timeouts ανά provider)
+# ============================================================
+
+import json
+import os
+import random
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from modules.quota_scheduler import SCHEDULER, PRIORITY_NORMAL
+from modules.disk_cache import get_cache, make_key
+
+# Timeouts (connect, read) ανά provider
+PROVIDER_TIMEOUTS = {
+    "apifootball": (5, 15),
+    "footballdata": (5, 10),
+    "theodds": (5, 12),
+    "sofascore": (5, 10),
+    "flashscore": (5, 15),
+    "openfootball": (5, 10),
+    "betfair": (5, 12),
+    "asianconnect": (5, 10),
+    "digitain": (5, 15),
+    "health": (3, 5),
+    "default": (5, 10),
+}
+
+# Πόσα host pools κρατάμε και πόσες keep-alive συνδέσεις ανά host
+POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", 20))
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", 16))
+RETRY_TOTAL = int(os.getenv("HTTP_RETRY_TOTAL", 3))
+RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", 0.5))
+RETRY_JITTER = float(os.getenv("HTTP_RETRY_JITTER", 0.5))
+
+USER_AGENT = "EURO_GOALS/v9"
+
+_session = None
+_lock = threading.Lock()
+
+
+class JitterRetry(Retry):
+    """Retry με exponential backoff + τυχαίο jitter (αποφυγή thundering herd)."""
+
+    def get_backoff_time(self):
+        base = super().get_backoff_time()
+        if base <= 0:
+            return base
+        return base + random.uniform(0, RETRY_JITTER)
+
+
+def _make_session() -> requests.Session:
+    s = requests.Session()
+    retries = JitterRetry(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "POST"],
+        respect_retry_after_header=True,
+        raise_on_status=False,  # οι readers ελέγχουν μόνοι τους το status_code
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE, max_retries=retries)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    s.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"})
+    return s
+
+
+def get_session() -> requests.Session:
+    """Επιστρέφει το κοινό Session (lazy, thread-safe)."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _make_session()
+    return _session
+
+
+def timeout_for(provider: str):
+    return PROVIDER_TIMEOUTS.get(provider, PROVIDER_TIMEOUTS["default"])
+
+
+def _cached_response(url, status, headers, body):
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers = CaseInsensitiveDict(headers)
+    resp._content = body
+    resp.url = url
+    resp.from_cache = True
+    return resp
+
+
+def _cacheable(resp) -> bool:
+    """
+    Μόνο 200 χωρίς σφάλμα στο body. Το API-Football απαντά 200 με
+    {"errors": {...}} σε quota / λάθος key – αυτό δεν πρέπει να σερβίρεται
+    από το cache για όλο το TTL.
+    """
+    if resp.status_code != 200:
+        return False
+    if "json" not in resp.headers.get("Content-Type", "").lower():
+        return True
+    try:
+        data = json.loads(resp.content or b"null")
+    except ValueError:
+        return False
+    return not (isinstance(data, dict) and data.get("errors"))
+
+
+def request(method: str, url: str, provider: str = "default",
+            priority: int = PRIORITY_NORMAL, cache_ttl: float = None, **kwargs) -> requests.Response:
+    """
+    Εκτελεί request μέσω του κοινού session. Για providers με quota
+    (βλ. modules/quota_scheduler.py) περιμένει πρώτα token με τη δοθείσα
+    προτεραιότητα – μπορεί να σηκώσει QuotaExceeded.
+    Με cache_ttl (sec) κοιτάζει πρώτα το on-disk cache (modules/disk_cache.py)
+    και αποθηκεύει εκεί τις επιτυχημένες απαντήσεις (200 χωρίς "errors").
+    """
+    kwargs.setdefault("timeout", timeout_for(provider))
+    cache = get_cache() if cache_ttl else None
+    if cache is not None:
+        key = make_key(method, url, kwargs.get("params"))
+        hit = cache.get(key)
+        if hit is not None:
+            return _cached_response(*hit)
+
+    if SCHEDULER.has(provider):
+        SCHEDULER.acquire(provider, priority)
+    resp = get_session().request(method, url, **kwargs)
+    if SCHEDULER.has(provider):
+        SCHEDULER.record_response(provider, resp)
+
+    if cache is not None and _cacheable(resp):
+        try:
+            headers = {"Content-Type": resp.headers.get("Content-Type", "")}
+            cache.put(key, resp.url, resp.status_code, headers, resp.content, cache_ttl)
+        except Exception as e:
+            print(f"[HTTP] ⚠️ Disk cache write failed for {url}: {e}")
+    return resp
+
+
+def get(url: str, provider: str = "default", **kwargs) -> requests.Response:
+    return request("GET", url, provider=provider, **kwargs)
+
+
+def post(url: str, provider: str = "default", **kwargs) -> requests.Response:
+    return request("POST", url, provider=provider, **kwargs)
+
+
+def close():
+    """Κλείνει τα pools (π.χ. σε shutdown event)."""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,232 @@
+# ============================================================
+# modules/identity_index.py
+# Cross-provider team aliases + canonical match ids
+# ============================================================
+# Κάθε provider γράφει τις ομάδες διαφορετικά ("Olympiacos Piraeus",
+# "Olympiakos", "Ολυμπιακός", "Man Utd" / "Manchester United").
+#   normalize_team()  → lowercase, χωρίς τόνους, Greek → Latin,
+#                       χωρίς FC/AFC/CF/... και σημεία στίξης
+#   TeamIndex         → alias key → canonical team και κάθε ακριβές όνομα
+#                       provider → canonical (στη μνήμη + SQLite)
+#   match_id()        → "<YYYY-MM-DD>:<home>__<away>" από canonical ομάδες
+#                       και ημερομηνία kickoff (UTC)
+# Έτσι τα joins ανάμεσα σε providers γίνονται dict lookups.
+#   IDENTITY_DB_PATH=data/identity.sqlite
+# ============================================================
+
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from datetime import datetime, timezone
+from functools import lru_cache
+
+IDENTITY_DB_PATH = os.getenv("IDENTITY_DB_PATH", os.path.join("data", "identity.sqlite"))
+
+_GREEK = {
+    "α": "a", "β": "v", "γ": "g", "δ": "d", "ε": "e", "ζ": "z", "η": "i", "θ": "th",
+    "ι": "i", "κ": "k", "λ": "l", "μ": "m", "ν": "n", "ξ": "x", "ο": "o", "π": "p",
+    "ρ": "r", "σ": "s", "ς": "s", "τ": "t", "υ": "y", "φ": "f", "χ": "ch", "ψ": "ps",
+    "ω": "o",
+}
+_GREEK_DIGRAPHS = {"ου": "ou", "γκ": "gk", "αι": "ai", "ει": "ei", "οι": "oi"}
+
+# Λέξεις που δεν ξεχωρίζουν ομάδες
+_NOISE = {"fc", "afc", "cf", "sc", "ac", "as", "fk", "sk", "cd", "ud", "sv", "ss", "bk",
+          "if", "fsv", "vfl", "vfb", "tsg", "rc", "rcd", "ssc", "club", "the", "de", "f", "c"}
+_EXPAND = {"utd": "united", "man": "manchester", "st": "saint", "atl": "atletico"}
+
+# Γνωστά aliases (normalized key → canonical)
+SEED_ALIASES = {
+    "olympiacos piraeus": "olympiacos",
+    "olympiakos": "olympiacos",
+    "olympiakos piraeus": "olympiacos",
+    "paok thessaloniki": "paok",
+    "aek athens": "aek",
+    "aek athina": "aek",
+    "panathinaikos athens": "panathinaikos",
+    "manchester united": "manchester united",
+    "manchester city": "manchester city",
+    "wolverhampton wanderers": "wolves",
+    "wolverhampton": "wolves",
+    "tottenham hotspur": "tottenham",
+    "spurs": "tottenham",
+    "brighton and hove albion": "brighton",
+    "brighton hove albion": "brighton",
+    "west ham united": "west ham",
+    "newcastle united": "newcastle",
+    "nottingham forest": "nottingham",
+    "nottm forest": "nottingham",
+    "bayern munchen": "bayern munich",
+    "bayern": "bayern munich",
+    "borussia dortmund": "dortmund",
+    "bayer leverkusen": "leverkusen",
+    "cologne": "koln",
+    "inter milan": "inter",
+    "internazionale": "inter",
+    "paris saint germain": "psg",
+    "paris sg": "psg",
+    "atletico madrid": "atletico madrid",
+    "atletico de madrid": "atletico madrid",
+}
+
+_PUNCT = re.compile(r"[^a-z0-9 ]+")
+
+
+def _transliterate(text):
+    for gr, lat in _GREEK_DIGRAPHS.items():
+        text = text.replace(gr, lat)
+    return "".join(_GREEK.get(ch, ch) for ch in text)
+
+
+@lru_cache(maxsize=8192)
+def normalize_team(name):
+    """'Ολυμπιακός Πειραιώς' → 'olympiakos peiraios', 'Man Utd FC' → 'manchester united'."""
+    if not name:
+        return ""
+    text = unicodedata.normalize("NFKD", str(name).lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = _transliterate(text)
+    text = _PUNCT.sub(" ", text.replace("&", " and "))
+    tokens = [_EXPAND.get(t, t) for t in text.split()]
+    # Χωρίς noise λέξεις και σκέτους αριθμούς ("1. FC Köln", "Hannover 96")
+    kept = [t for t in tokens if t not in _NOISE and not t.isdigit()]
+    return " ".join(kept or tokens)
+
+
+def _kickoff_date(kickoff):
+    if kickoff is None or kickoff == "":
+        return None
+    if isinstance(kickoff, (int, float)):
+        return datetime.fromtimestamp(kickoff, tz=timezone.utc).date().isoformat()
+    if isinstance(kickoff, datetime):
+        dt = kickoff
+    else:
+        try:
+            dt = datetime.fromisoformat(str(kickoff).replace("Z", "+00:00"))
+        except ValueError:
+            return str(kickoff)[:10]
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return dt.date().isoformat()
+
+
+class TeamIndex:
+    def __init__(self, path: str = IDENTITY_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._aliases = dict(SEED_ALIASES)  # normalized alias → canonical
+        self._raw = {}                      # ακριβές όνομα provider → canonical (fast path)
+        self._spellings = {}                # canonical → {ακριβή ονόματα}
+        self._conn = None
+        try:
+            folder = os.path.dirname(path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS team_aliases (
+                    alias       TEXT PRIMARY KEY,
+                    canonical   TEXT NOT NULL,
+                    provider    TEXT,
+                    created_at  TEXT
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS team_spellings (
+                    raw         TEXT PRIMARY KEY,
+                    alias       TEXT NOT NULL,
+                    provider    TEXT
+                )
+            """)
+            for alias, canonical in self._conn.execute("SELECT alias, canonical FROM team_aliases"):
+                self._aliases[alias] = canonical
+            for raw, alias in self._conn.execute("SELECT raw, alias FROM team_spellings"):
+                self._remember_raw(raw, self._aliases.get(alias, alias))
+        except Exception as e:
+            print(f"[IDENTITY] ⚠️ In-memory only – cannot open {path}: {e}")
+            self._conn = None
+
+    def __len__(self):
+        return len(self._aliases)
+
+    def _write(self, sql, params):
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(sql, params)
+        except Exception as e:
+            print(f"[IDENTITY] ⚠️ Write failed ({params[0]}): {e}")
+
+    def _remember_raw(self, raw, canonical):
+        self._raw[raw] = canonical
+        self._spellings.setdefault(canonical, set()).add(raw)
+
+    def canonical(self, name, provider=None):
+        """Canonical όνομα ομάδας· άγνωστα ονόματα καταχωρούνται ως δικό τους canonical."""
+        if not name:
+            return ""
+        found = self._raw.get(name)
+        if found is not None:
+            return found
+        key = normalize_team(name)
+        if not key:
+            return ""
+        with self._lock:
+            found = self._aliases.get(key)
+            if found is None:
+                self._aliases[key] = found = key
+                self._write("INSERT OR IGNORE INTO team_aliases (alias, canonical, provider, created_at) "
+                            "VALUES (?, ?, ?, ?)", (key, key, provider, datetime.utcnow().isoformat()))
+            self._remember_raw(name, found)
+            self._write("INSERT OR IGNORE INTO team_spellings (raw, alias, provider) VALUES (?, ?, ?)",
+                        (name, key, provider))
+        return found
+
+    def add_alias(self, alias, canonical, provider=None):
+        """Συνδέει ένα όνομα provider με canonical ομάδα (π.χ. από χειροκίνητο mapping)."""
+        key = normalize_team(alias)
+        target = self.canonical(canonical)
+        with self._lock:
+            self._aliases[key] = target
+            self._write("INSERT OR REPLACE INTO team_aliases (alias, canonical, provider, created_at) "
+                        "VALUES (?, ?, ?, ?)", (key, target, provider, datetime.utcnow().isoformat()))
+            # Ήδη γνωστά ονόματα με το ίδιο key μεταφέρονται στο νέο canonical
+            for raw in [r for r in self._raw if normalize_team(r) == key]:
+                old = self._raw[raw]
+                self._spellings.get(old, set()).discard(raw)
+                self._remember_raw(raw, target)
+        return target
+
+    def spellings(self, name):
+        """Όλα τα ακριβή ονόματα providers που έχουν δει για την ομάδα του `name`."""
+        return set(self._spellings.get(self.canonical(name), ())) | ({name} if name else set())
+
+    def match_id(self, home, away, kickoff=None, provider=None):
+        """Canonical match id από (canonical home, canonical away, ημερομηνία kickoff)."""
+        pair = f"{self.canonical(home, provider)}__{self.canonical(away, provider)}"
+        day = _kickoff_date(kickoff)
+        return f"{day}:{pair}" if day else pair
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = TeamIndex()
+    return _index
+
+
+def canonical_team(name, provider=None):
+    return get_index().canonical(name, provider)
+
+
+def match_id(home, away, kickoff=None, provider=None):
+    return get_index().match_id(home, away, kickoff, provider)
@@ -0,0 +1,99 @@
+# ============================================================
+# modules/jsonl_log.py
+# Append-only JSONL log με size-based segments + retention
+# ============================================================
+# Κάθε record γράφεται ως ΜΙΑ γραμμή με ένα os.write σε αρχείο O_APPEND:
+# ταυτόχρονοι writers (threads ή processes) δεν ανακατεύουν γραμμές και
+# κανένα append δεν ξαναγράφει το αρχείο (O(1) I/O ανά record).
+# Όταν το ενεργό segment ξεπεράσει τα `segment_bytes` γίνεται rotate:
+#   alerts.jsonl → alerts.jsonl.1 → ... → alerts.jsonl.<keep_segments>
+# και το παλαιότερο σβήνεται (retention).
+# ============================================================
+
+import json
+import os
+import threading
+
+
+class JsonlLog:
+    def __init__(self, path: str, segment_bytes: int = 1024 * 1024, keep_segments: int = 5):
+        self.path = path
+        self.segment_bytes = max(1024, int(segment_bytes))
+        self.keep_segments = max(0, int(keep_segments))
+        self._lock = threading.Lock()
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+    # ---------------- γράψιμο ----------------
+    def append(self, record: dict):
+        self.append_many([record])
+
+    def append_many(self, records):
+        lines = "".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in records)
+        if not lines:
+            return
+        data = lines.encode("utf-8")
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+                size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+            if size >= self.segment_bytes:
+                self._rotate()
+
+    def _segment(self, n):
+        return self.path if n == 0 else f"{self.path}.{n}"
+
+    def _rotate(self):
+        try:
+            oldest = self._segment(self.keep_segments)
+            if self.keep_segments == 0:
+                os.remove(self.path)
+                return
+            if os.path.exists(oldest):
+                os.remove(oldest)
+            for n in range(self.keep_segments - 1, -1, -1):
+                src = self._segment(n)
+                if os.path.exists(src):
+                    os.replace(src, self._segment(n + 1))
+        except FileNotFoundError:
+            pass  # άλλο process έκανε ήδη rotate
+
+    # ---------------- διάβασμα ----------------
+    def segments(self):
+        """Υπάρχοντα segments, νεότερο πρώτο."""
+        return [p for p in (self._segment(n) for n in range(self.keep_segments + 1)) if os.path.exists(p)]
+
+    @staticmethod
+    def _read(path):
+        out = []
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        out.append(json.loads(line))
+                    except ValueError:
+                        continue  # μισογραμμένη γραμμή (crash κατά το write)
+        except FileNotFoundError:
+            pass
+        return out
+
+    def tail(self, n: int):
+        """Τα τελευταία n records (παλαιότερο → νεότερο), διαβάζοντας μόνο όσα segments χρειάζονται."""
+        collected = []
+        for path in self.segments():
+            collected = self._read(path) + collected
+            if len(collected) >= n:
+                break
+        return collected[-n:] if n else []
+
+    def __iter__(self):
+        """Όλα τα records (παλαιότερο → νεότερο)."""
+        for path in reversed(self.segments()):
+            yield from self._read(path)
@@ -0,0 +1,466 @@
+# ============================================================
+# modules/odds_store.py
+# Columnar time-series store για odds ticks
+# ============================================================
+# Ανά (match_id, market, book) τρία append-only arrays (module `array`):
+#   ts (epoch sec, 'd') | price ('d') | line ('d', NaN = χωρίς line)
+# - record()  → O(1) append στη μνήμη (αγνοεί ticks χωρίς αλλαγή τιμής)
+# - compact() → γράφει ό,τι είναι στη μνήμη σε ένα on-disk segment
+#               (κάθε στήλη συνεχόμενα bytes) και αδειάζει τα arrays
+#   αυτόματα (background thread) κάθε ODDS_COMPACT_INTERVAL s ή όταν η
+#   μνήμη ξεπεράσει ODDS_COMPACT_POINTS ticks
+# - merge     → size-tiered: συγχωνεύονται μόνο γειτονικά segments του ίδιου
+#               μεγέθους (ODDS_MERGE_FANIN ανά tier), ή τα μικρότερα γειτονικά
+#               όταν ξεπεραστεί το ODDS_MAX_SEGMENTS. Διάβασμα/γράψιμο εκτός
+#               lock, μόνο το swap της λίστας γίνεται υπό lock.
+# - history() → bisect στα arrays κάθε segment (seek μόνο στη σειρά που
+#               ζητήθηκε) + στη μνήμη, χωρίς row-per-tick ORM queries.
+#               Τα disk reads γίνονται ΕΚΤΟΣ lock (snapshot των segments),
+#               ώστε ένα μεγάλο range read να μη μπλοκάρει το record()·
+#               segments που συγχωνεύτηκαν σβήνονται όταν φύγει ο τελευταίος reader
+# Segment: b"EGODDS1\n" + uint64 μήκος header + JSON header + data.
+# Όνομα: odds-<lo>[-<hi>].seg = το εύρος των compaction seq που περιέχει.
+# Ένα merged segment γράφεται atomically πριν σβηστούν τα αρχικά· στο
+# φόρτωμα όποιο segment καλύπτεται από το εύρος άλλου θεωρείται superseded
+# και σβήνεται, οπότε ένα crash στο ενδιάμεσο δεν διπλασιάζει ticks.
+#   ODDS_STORE_DIR=data/odds_store
+# ============================================================
+
+import json
+import math
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+
+MAGIC = b"EGODDS1\n"
+_SEGMENT = re.compile(r"^odds-(\d{8})(?:-(\d{8}))?\.seg$")
+_NAN = float("nan")
+
+
+def to_epoch(ts):
+    if ts is None:
+        return time.time()
+    if isinstance(ts, (int, float)):
+        return float(ts)
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)  # naive = UTC (datetime.utcnow())
+    return ts.timestamp()
+
+
+def _line_out(v):
+    return None if math.isnan(v) else v
+
+
+class OddsSeries:
+    """Τρία παράλληλα arrays ταξινομημένα κατά ts."""
+    __slots__ = ("ts", "price", "line")
+
+    def __init__(self, ts=None, price=None, line=None):
+        self.ts = ts if ts is not None else array("d")
+        self.price = price if price is not None else array("d")
+        self.line = line if line is not None else array("d")
+
+    def __len__(self):
+        return len(self.ts)
+
+    def append(self, ts, price, line=None):
+        line = _NAN if line is None else float(line)
+        if self.ts and ts < self.ts[-1]:
+            i = bisect_right(self.ts, ts)  # tick εκτός σειράς (σπάνιο)
+            self.ts.insert(i, ts)
+            self.price.insert(i, price)
+            self.line.insert(i, line)
+        else:
+            self.ts.append(ts)
+            self.price.append(price)
+            self.line.append(line)
+
+    def last(self):
+        if not self.ts:
+            return None
+        return self.ts[-1], self.price[-1], _line_out(self.line[-1])
+
+    def window(self, start=None, end=None):
+        lo = bisect_left(self.ts, start) if start is not None else 0
+        hi = bisect_right(self.ts, end) if end is not None else len(self.ts)
+        return lo, hi
+
+    def rows(self, start=None, end=None):
+        lo, hi = self.window(start, end)
+        return [(self.ts[i], self.price[i], _line_out(self.line[i])) for i in range(lo, hi)]
+
+
+class _Segment:
+    def __init__(self, path, data_start, series, lo, hi):
+        self.path = path
+        self.data_start = data_start
+        self.series = series  # key -> (t_min, t_max, offset, count)
+        self.lo, self.hi = lo, hi  # εύρος compaction seq (από το όνομα)
+        self.ticks = sum(meta[3] for meta in series.values())
+        self.readers = 0      # history() σε εξέλιξη (αλλαγές μόνο με το lock του store)
+        self.retired = False  # συγχωνεύτηκε – σβήνεται όταν readers == 0
+
+    def unlink(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def read(self, key, start=None, end=None):
+        meta = self.series.get(key)
+        if meta is None:
+            return None
+        t_min, t_max, offset, count = meta
+        if (start is not None and t_max < start) or (end is not None and t_min > end):
+            return None
+        base = self.data_start + offset
+        with open(self.path, "rb") as f:
+            f.seek(base)
+            ts = array("d")
+            ts.frombytes(f.read(8 * count))
+            lo = bisect_left(ts, start) if start is not None else 0
+            hi = bisect_right(ts, end) if end is not None else count
+            if lo >= hi:
+                return None
+            price, line = array("d"), array("d")
+            f.seek(base + 8 * (count + lo))
+            price.frombytes(f.read(8 * (hi - lo)))
+            f.seek(base + 8 * (2 * count + lo))
+            line.frombytes(f.read(8 * (hi - lo)))
+        return OddsSeries(ts[lo:hi], price, line)
+
+
+class OddsStore:
+    def __init__(self, directory: str = None, compact_interval: float = None,
+                 compact_points: int = None, max_segments: int = None):
+        self.directory = directory or os.getenv("ODDS_STORE_DIR", os.path.join("data", "odds_store"))
+        self.compact_interval = float(compact_interval or os.getenv("ODDS_COMPACT_INTERVAL", 300))
+        self.compact_points = int(compact_points or os.getenv("ODDS_COMPACT_POINTS", 200000))
+        self.max_segments = max(2, int(max_segments or os.getenv("ODDS_MAX_SEGMENTS", 16)))
+        self.merge_fanin = max(2, int(os.getenv("ODDS_MERGE_FANIN", 4)))
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._mem = {}       # key -> OddsSeries (ticks μετά το τελευταίο compact)
+        self._first = {}     # key -> (ts, price, line) opening tick
+        self._last = {}      # key -> (ts, price, line) τελευταίο tick
+        self._points = 0
+        self._segments = []  # παλαιότερο → νεότερο
+        self._seq = 0
+        self._merge_lock = threading.Lock()  # ένα merge τη φορά
+        self._stop = threading.Event()
+        self._kick = threading.Event()       # record() → compaction τώρα
+        self._thread = None
+        self._load_segments()
+
+    # ---------------- segments ----------------
+    def _open_segment(self, path):
+        m = _SEGMENT.match(os.path.basename(path))
+        lo = int(m.group(1))
+        hi = int(m.group(2) or lo)
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError("bad magic")
+            (size,) = struct.unpack("<Q", f.read(8))
+            header = json.loads(f.read(size).decode("utf-8"))
+        series = {tuple(k): tuple(v) for k, v in header["series"]}
+        return _Segment(path, len(MAGIC) + 8 + size, series, lo, hi)
+
+    def _load_segments(self):
+        found = []
+        for name in os.listdir(self.directory):
+            if not _SEGMENT.match(name):
+                continue
+            try:
+                found.append(self._open_segment(os.path.join(self.directory, name)))
+            except Exception as e:
+                print(f"[ODDS_STORE] ⚠️ Αγνοείται {name}: {e}")
+        # Τα ευρύτερα πρώτα: ό,τι καλύπτεται από merged segment είναι superseded
+        # (crash μετά το rename του merge και πριν σβηστούν τα αρχικά)
+        found.sort(key=lambda seg: (seg.lo - seg.hi, seg.lo))
+        kept = []
+        for seg in found:
+            if any(k.lo <= seg.lo and seg.hi <= k.hi for k in kept):
+                print(f"[ODDS_STORE] 🧹 Superseded segment {os.path.basename(seg.path)}")
+                seg.unlink()
+                continue
+            kept.append(seg)
+        self._segments = sorted(kept, key=lambda seg: seg.lo)
+        for seg in self._segments:
+            self._seq = max(self._seq, seg.hi)
+            for key in seg.series:
+                # opening / latest φορτώνονται lazily από τα segments
+                self._first.setdefault(key, None)
+                self._last[key] = None
+
+    def _write_segment(self, series, lo, hi=None):
+        """series: {key: OddsSeries} → νέο segment odds-<lo>[-<hi>].seg (atomic rename)."""
+        entries, blobs, offset = [], [], 0
+        for key, s in series.items():
+            if not len(s):
+                continue
+            n = len(s)
+            entries.append([list(key), [s.ts[0], s.ts[-1], offset, n]])
+            blobs.extend((s.ts.tobytes(), s.price.tobytes(), s.line.tobytes()))
+            offset += 24 * n
+        if not entries:
+            return None
+        header = json.dumps({"series": entries}, ensure_ascii=False).encode("utf-8")
+        name = f"odds-{lo:08d}.seg" if hi is None or hi == lo else f"odds-{lo:08d}-{hi:08d}.seg"
+        path = os.path.join(self.directory, name)
+        fd, tmp = tempfile.mkstemp(prefix=".odds-", suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(MAGIC)
+                f.write(struct.pack("<Q", len(header)))
+                f.write(header)
+                for blob in blobs:
+                    f.write(blob)
+                f.flush()
+                os.fsync(f.fileno())  # το merged αρχείο πρέπει να υπάρχει πριν σβηστούν τα αρχικά
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return self._open_segment(path)
+
+    # ---------------- γράψιμο ----------------
+    def record(self, match_id, market, book, price, ts=None, line=None, dedupe=True):
+        """Προσθέτει ένα tick· με dedupe αγνοείται αν τιμή/line δεν άλλαξαν."""
+        if price is None:
+            return False
+        key = (str(match_id), str(market), str(book))
+        ts = to_epoch(ts)
+        price = float(price)
+        with self._lock:
+            last = self._latest_locked(key)
+            if dedupe and last is not None and last[1] == price and last[2] == line:
+                return False
+            series = self._mem.get(key)
+            if series is None:
+                series = self._mem[key] = OddsSeries()
+            series.append(ts, price, line)
+            tick = (ts, price, line)
+            if last is None or ts >= last[0]:
+                self._last[key] = tick
+            if key not in self._first:
+                self._first[key] = tick
+            self._points += 1
+            over = self._points >= self.compact_points
+        self.start()
+        if over:
+            self._kick.set()  # compaction στο background thread, όχι στο request path
+        return True
+
+    def compact(self):
+        """Μεταφέρει τα ticks της μνήμης σε on-disk segment και κάνει (αν χρειάζεται) merge."""
+        with self._lock:
+            if not self._points:
+                n = 0
+            else:
+                mem, self._mem, n = self._mem, {}, self._points
+                self._points = 0
+                self._seq += 1
+                try:
+                    seg = self._write_segment(mem, self._seq)
+                except Exception as e:
+                    # Κρατάμε τα ticks στη μνήμη για την επόμενη προσπάθεια
+                    for key, s in mem.items():
+                        cur = self._mem.get(key)
+                        self._mem[key] = s if cur is None else self._merge(s, cur)
+                    self._points += n
+                    print(f"[ODDS_STORE] ⚠️ Compaction απέτυχε: {e}")
+                    return 0
+                if seg is not None:
+                    self._segments.append(seg)
+        self._maybe_merge()
+        return n
+
+    @staticmethod
+    def _merge(a, b):
+        out = OddsSeries(array("d", a.ts), array("d", a.price), array("d", a.line))
+        for i in range(len(b)):
+            out.append(b.ts[i], b.price[i], _line_out(b.line[i]))
+        return out
+
+    def _tier(self, seg):
+        return int(math.log(max(seg.ticks, 1), self.merge_fanin))
+
+    def _pick_merge(self, segments):
+        """
+        Size-tiered επιλογή: το πρώτο γειτονικό run merge_fanin segments του ίδιου
+        tier (το μικρότερο tier πρώτα)· αλλιώς, πάνω από max_segments, τα γειτονικά
+        merge_fanin με τα λιγότερα ticks. Κάθε tick ξαναγράφεται O(log N) φορές.
+        """
+        k = self.merge_fanin
+        best = None
+        for i in range(len(segments) - k + 1):
+            run = segments[i:i + k]
+            tiers = {self._tier(seg) for seg in run}
+            if len(tiers) == 1 and (best is None or tiers.pop() < self._tier(best[0])):
+                best = run
+        if best is None and len(segments) > self.max_segments:
+            best = min((segments[i:i + k] for i in range(len(segments) - k + 1)),
+                       key=lambda run: sum(seg.ticks for seg in run))
+        return best
+
+    def _maybe_merge(self):
+        if not self._merge_lock.acquire(blocking=False):
+            return  # ήδη τρέχει merge
+        try:
+            while True:
+                with self._lock:
+                    run = self._pick_merge(list(self._segments))
+                if not run:
+                    return
+                if not self._merge_segments(run):
+                    return
+        finally:
+            self._merge_lock.release()
+
+    def _merge_segments(self, run):
+        """Συγχωνεύει ένα γειτονικό run segments εκτός lock· swap της λίστας υπό lock."""
+        try:
+            merged = {}
+            for key in sorted({key for seg in run for key in seg.series}):
+                parts = [p for p in (seg.read(key) for seg in run) if p is not None]
+                out = OddsSeries()
+                for p in parts:
+                    out.ts.extend(p.ts)
+                    out.price.extend(p.price)
+                    out.line.extend(p.line)
+                if any(out.ts[i] > out.ts[i + 1] for i in range(len(out.ts) - 1)):
+                    order = sorted(range(len(out.ts)), key=out.ts.__getitem__)
+                    out = OddsSeries(array("d", (out.ts[i] for i in order)),
+                                     array("d", (out.price[i] for i in order)),
+                                     array("d", (out.line[i] for i in order)))
+                merged[key] = out
+            seg = self._write_segment(merged, run[0].lo, run[-1].hi)
+        except Exception as e:
+            print(f"[ODDS_STORE] ⚠️ Merge απέτυχε ({len(run)} segments): {e}")
+            return False
+        with self._lock:
+            ids = {id(s) for s in run}
+            pos = next(i for i, s in enumerate(self._segments) if id(s) in ids)
+            rest = [s for s in self._segments if id(s) not in ids]
+            self._segments = rest[:pos] + ([seg] if seg is not None else []) + rest[pos:]
+            for s in run:
+                s.retired = True
+                if not s.readers:
+                    s.unlink()
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._kick.wait(self.compact_interval)
+            self._kick.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.compact()
+            except Exception as e:
+                print(f"[ODDS_STORE] ⚠️ {e}")
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="odds-compact", daemon=True)
+                self._thread.start()
+
+    def close(self):
+        self._stop.set()
+        self._kick.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=30)
+        self.compact()
+
+    # ---------------- διάβασμα ----------------
+    def keys(self, match_id=None):
+        with self._lock:
+            keys = set(self._first) | set(self._mem)
+        if match_id is not None:
+            keys = {k for k in keys if k[0] == str(match_id)}
+        return sorted(keys)
+
+    def history(self, match_id, market, book, start=None, end=None):
+        """[(ts, price, line)] με start <= ts <= end (epoch, datetime ή ISO)."""
+        key = (str(match_id), str(market), str(book))
+        start = to_epoch(start) if start is not None else None
+        end = to_epoch(end) if end is not None else None
+        # Snapshot υπό lock: segments (με reader ref) + αντίγραφο του παραθύρου της μνήμης
+        with self._lock:
+            segments = [seg for seg in self._segments if key in seg.series]
+            for seg in segments:
+                seg.readers += 1
+            mem = self._mem.get(key)
+            recent = mem.rows(start, end) if mem is not None else []
+        rows = []
+        try:
+            for seg in segments:
+                part = seg.read(key, start, end)
+                if part is not None:
+                    rows.extend(part.rows())
+        finally:
+            with self._lock:
+                for seg in segments:
+                    seg.readers -= 1
+                    if seg.retired and not seg.readers:
+                        seg.unlink()  # deferred από το _merge_segments
+        rows.extend(recent)
+        if any(rows[i][0] > rows[i + 1][0] for i in range(len(rows) - 1)):
+            rows.sort(key=lambda r: r[0])
+        return rows
+
+    def _latest_locked(self, key):
+        if key in self._last and self._last[key] is None:
+            for seg in reversed(self._segments):
+                meta = seg.series.get(key)
+                if meta:
+                    part = seg.read(key, meta[1], meta[1])
+                    self._last[key] = part.last() if part is not None else None
+                    break
+        return self._last.get(key)
+
+    def latest(self, match_id, market, book):
+        with self._lock:
+            return self._latest_locked((str(match_id), str(market), str(book)))
+
+    def opening(self, match_id, market, book):
+        key = (str(match_id), str(market), str(book))
+        with self._lock:
+            if key in self._first and self._first[key] is None:
+                for seg in self._segments:
+                    meta = seg.series.get(key)
+                    if meta:
+                        part = seg.read(key, meta[0], meta[0])
+                        self._first[key] = part.rows()[0] if part is not None else None
+                        break
+            return self._first.get(key)
+
+    def stats(self):
+        with self._lock:
+            return {"series": len(set(self._first) | set(self._mem)), "memory_ticks": self._points,
+                    "segments": len(self._segments)}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_odds_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = OddsStore()
+    return _store
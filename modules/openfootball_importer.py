@@ -2,15 +2,20 @@
 # OPENFOOTBALL IMPORTER v8.4 (auto-season finder)
 # ==============================================
 import os
-import requests
 import json
 
+from modules import http_client
+
 DATA_DIR = os.path.join("data", "openfootball_cache")
 os.makedirs(DATA_DIR, exist_ok=True)
 
 GITHUB_API_BASE = "https://api.github.com/repos/openfootball"
 RAW_BASE = "https://raw.githubusercontent.com/openfootball"
 
+# TTL (sec) στο on-disk response cache
+CONTENTS_CACHE_TTL = 24 * 3600
+SEASON_FILE_CACHE_TTL = 6 * 3600
+
 LEAGUES = {
     "england": "Premier League",
     "germany": "Bundesliga",
@@ -33,7 +38,7 @@ def get_latest_season_folder(league):
     """Αναζητά τον πιο πρόσφατο φάκελο season στο GitHub repo του OpenFootball"""
     url = f"{GITHUB_API_BASE}/{league}/contents"
     try:
-        r = requests.get(url, timeout=10)
+        r = http_client.get(url, provider="openfootball", cache_ttl=CONTENTS_CACHE_TTL)
         if r.status_code != 200:
             print(f"⚠️  {league}: cannot fetch repo contents ({r.status_code})")
             return None
@@ -63,7 +68,7 @@ def import_league(league):
     print(f"[OPENFOOTBALL] ⚽ {league} ({latest}) -> {url}")
 
     try:
-        r = requests.get(url, timeout=10)
+        r = http_client.get(url, provider="openfootball", cache_ttl=SEASON_FILE_CACHE_TTL)
         if r.status_code != 200:
             print(f"⚠️  {league}: {r.status_code} not found")
             return 0
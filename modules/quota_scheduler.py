@@ -0,0 +1,274 @@
+# ============================================================
+# modules/quota_scheduler.py
+# Provider quota scheduler – token bucket ανά provider,
+# ημερήσιο quota accounting και προτεραιότητες αιτημάτων
+# ============================================================
+# Όλοι οι readers (SmartMoneyMonitor, asian_reader, odds_reader,
+# api_aggregator ...) περνούν από modules/http_client.py, το οποίο
+# καλεί SCHEDULER.acquire() πριν από κάθε request προς provider με quota.
+#
+# Προτεραιότητες (μικρότερο = πιο επείγον):
+#   PRIORITY_LIVE   – αγώνες σε εξέλιξη
+#   PRIORITY_SOON   – kickoff εντός 2 ωρών
+#   PRIORITY_NORMAL – όλα τα υπόλοιπα
+# Όταν το ημερήσιο quota πλησιάζει στο τέλος, κρατάμε ένα reserve
+# μόνο για LIVE/SOON αιτήματα αντί να καταλήγουμε σε 429.
+#
+# Opt-in: ένας provider περιορίζεται ΜΟΝΟ αν οριστούν τα όριά του στο .env
+# (χωρίς αυτά τα requests περνούν όπως πριν). Για free plans π.χ.:
+#   APIFOOTBALL_RATE_PER_MIN=10  APIFOOTBALL_DAILY_QUOTA=100
+#   THEODDS_RATE_PER_MIN=10      THEODDS_DAILY_QUOTA=16
+#   FOOTBALLDATA_RATE_PER_MIN=10
+#   <PROVIDER>_QUOTA_RESERVE=0.1 (μερίδιο για LIVE/SOON)  QUOTA_WAIT_TIMEOUT=30
+# Το SmartMoney refresh κάνει ένα request ανά λίγκα (40 λίγκες), οπότε με
+# 10/λεπτό ένα πλήρες refresh θέλει ~4 λεπτά – αυξήστε το rate ή το
+# QUOTA_WAIT_TIMEOUT ανάλογα με το plan.
+# ============================================================
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+PRIORITY_LIVE = 0
+PRIORITY_SOON = 1
+PRIORITY_NORMAL = 2
+
+SOON_WINDOW = timedelta(hours=2)
+# Μετά από πόσο χρόνο από το kickoff θεωρούμε έναν αγώνα τελειωμένο
+# (κοινό με modules/adaptive_poller.py)
+FINISHED_AFTER = timedelta(hours=float(os.getenv("POLL_FINISHED_AFTER_HOURS", 2.5)))
+LIVE_STATUSES = {"live", "inprogress", "1h", "2h", "ht", "et", "bt", "p", "1st_half", "2nd_half", "extra_time"}
+FINISHED_STATUSES = {"ft", "aet", "pen", "finished", "canc", "pst", "abd", "awd", "wo"}
+
+
+class QuotaExceeded(RuntimeError):
+    """Δεν υπάρχει διαθέσιμο credit (ημερήσιο quota ή timeout αναμονής)."""
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+def _to_utc(kickoff):
+    if kickoff is None:
+        return None
+    if isinstance(kickoff, (int, float)):
+        return datetime.fromtimestamp(kickoff, tz=timezone.utc)
+    if isinstance(kickoff, str):
+        try:
+            kickoff = datetime.fromisoformat(kickoff.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if kickoff.tzinfo is None:
+        kickoff = kickoff.replace(tzinfo=timezone.utc)
+    return kickoff
+
+
+def priority_for(kickoff=None, status=None, now=None) -> int:
+    """Προτεραιότητα αιτήματος με βάση status και απόσταση από το kickoff."""
+    st = (status or "").strip().lower()
+    if st in LIVE_STATUSES:
+        return PRIORITY_LIVE
+    ko = _to_utc(kickoff)
+    if ko is not None and st not in FINISHED_STATUSES:
+        now = now or _utcnow()
+        if ko <= now:
+            # Live μόνο μέσα στο παράθυρο του αγώνα – παλιοί αγώνες δεν
+            # παρακάμπτουν το reserve του ημερήσιου quota
+            return PRIORITY_LIVE if now - ko <= FINISHED_AFTER else PRIORITY_NORMAL
+        if ko - now <= SOON_WINDOW:
+            return PRIORITY_SOON
+    return PRIORITY_NORMAL
+
+
+class TokenBucket:
+    """Κλασικό token bucket: `rate` tokens/λεπτό, μέχρι `burst` αποθηκευμένα."""
+
+    def __init__(self, rate_per_min: float, burst: int = None):
+        self.rate = float(rate_per_min) / 60.0
+        self.capacity = float(burst or max(1, int(rate_per_min)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now=None) -> float:
+        """Δευτερόλεπτα μέχρι να υπάρξει 1 διαθέσιμο token."""
+        now = now or time.monotonic()
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def take(self):
+        self.tokens -= 1
+
+
+class ProviderQuota:
+    def __init__(self, name, rate_per_min, daily_limit=None, reserve=0.1, burst=None):
+        self.name = name
+        self.bucket = TokenBucket(rate_per_min, burst)
+        self.daily_limit = daily_limit
+        # Ποσοστό του ημερήσιου quota που κρατιέται για LIVE/SOON αιτήματα
+        self.reserve = int((daily_limit or 0) * reserve)
+        self.used_today = 0
+        self.day = _utcnow().date()
+        self.denied = 0
+
+    def _roll_day(self):
+        today = _utcnow().date()
+        if today != self.day:
+            self.day = today
+            self.used_today = 0
+
+    def remaining(self):
+        self._roll_day()
+        if self.daily_limit is None:
+            return None
+        return max(0, self.daily_limit - self.used_today)
+
+    def allows(self, priority) -> bool:
+        left = self.remaining()
+        if left is None:
+            return True
+        if left <= 0:
+            return False
+        if priority >= PRIORITY_NORMAL and left <= self.reserve:
+            return False
+        return True
+
+
+def _env_int(name, default):
+    val = os.getenv(name)
+    return int(val) if val not in (None, "") else default
+
+
+# Providers με quota και το prefix των env vars τους
+QUOTA_PROVIDERS = {
+    "apifootball": "APIFOOTBALL",
+    "theodds": "THEODDS",
+    "footballdata": "FOOTBALLDATA",
+}
+
+
+def limits_from_env():
+    """Όρια μόνο για providers με <PREFIX>_RATE_PER_MIN ή <PREFIX>_DAILY_QUOTA στο env."""
+    limits = {}
+    for name, prefix in QUOTA_PROVIDERS.items():
+        rate = _env_int(f"{prefix}_RATE_PER_MIN", None)
+        daily = _env_int(f"{prefix}_DAILY_QUOTA", None)
+        if rate is None and daily is None:
+            continue
+        # Μόνο ημερήσιο quota → πρακτικά χωρίς όριο ανά λεπτό (600/λεπτό)
+        limits[name] = {"rate_per_min": rate or 600, "daily_limit": daily,
+                        "reserve": float(os.getenv(f"{prefix}_QUOTA_RESERVE", 0.1))}
+    return limits
+
+# Headers με τα υπόλοιπα credits όπως τα αναφέρει ο ίδιος ο provider
+REMAINING_HEADERS = {
+    "apifootball": "x-ratelimit-requests-remaining",
+    "theodds": "x-requests-remaining",
+}
+
+
+class QuotaScheduler:
+    def __init__(self, limits=None, wait_timeout: float = None):
+        if wait_timeout is None:
+            wait_timeout = float(os.getenv("QUOTA_WAIT_TIMEOUT", 30))
+        self.wait_timeout = wait_timeout
+        self._providers = {
+            name: ProviderQuota(name, **cfg) for name, cfg in (limits_from_env() if limits is None else limits).items()
+        }
+        self._cond = threading.Condition()
+        self._waiters = {name: [] for name in self._providers}
+        self._seq = itertools.count()
+
+    def has(self, provider) -> bool:
+        return provider in self._providers
+
+    def acquire(self, provider: str, priority: int = PRIORITY_NORMAL, timeout: float = None):
+        """
+        Μπλοκάρει μέχρι να υπάρξει token για τον provider. Τα αιτήματα
+        εξυπηρετούνται με σειρά προτεραιότητας (και FIFO μέσα στην ίδια).
+        Σηκώνει QuotaExceeded αν τελειώσει το quota ή το timeout.
+        """
+        pq = self._providers.get(provider)
+        if pq is None:
+            return
+        timeout = self.wait_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        ticket = (priority, next(self._seq))
+        waiters = self._waiters[provider]
+
+        with self._cond:
+            heapq.heappush(waiters, ticket)
+            try:
+                while True:
+                    if not pq.allows(priority):
+                        pq.denied += 1
+                        raise QuotaExceeded(
+                            f"{provider}: daily quota exhausted ({pq.used_today}/{pq.daily_limit}, priority={priority})")
+                    now = time.monotonic()
+                    wait = pq.bucket.wait_time(now)
+                    if waiters[0] == ticket and wait <= 0:
+                        heapq.heappop(waiters)
+                        pq.bucket.take()
+                        pq.used_today += 1
+                        self._cond.notify_all()
+                        return
+                    left = deadline - now
+                    if left <= 0:
+                        pq.denied += 1
+                        raise QuotaExceeded(f"{provider}: no token within {timeout:g}s (priority={priority})")
+                    self._cond.wait(min(left, wait) if wait > 0 else left)
+            finally:
+                if ticket in waiters:
+                    waiters.remove(ticket)
+                    heapq.heapify(waiters)
+                    self._cond.notify_all()
+
+    def record_response(self, provider: str, response):
+        """Συγχρονίζει το accounting με τα headers του provider και χειρίζεται 429."""
+        pq = self._providers.get(provider)
+        if pq is None or response is None:
+            return
+        with self._cond:
+            header = REMAINING_HEADERS.get(provider)
+            remaining = response.headers.get(header) if header else None
+            if remaining is not None and pq.daily_limit is not None:
+                try:
+                    pq.used_today = max(pq.used_today, pq.daily_limit - int(float(remaining)))
+                except ValueError:
+                    pass
+            if response.status_code == 429:
+                try:
+                    retry_after = float(response.headers.get("Retry-After", 60))
+                except ValueError:
+                    retry_after = 60.0
+                pq.bucket.blocked_until = time.monotonic() + retry_after
+                pq.bucket.tokens = 0
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                name: {
+                    "used_today": pq.used_today,
+                    "daily_limit": pq.daily_limit,
+                    "remaining": pq.remaining(),
+                    "denied": pq.denied,
+                    "waiting": len(self._waiters[name]),
+                }
+                for name, pq in self._providers.items()
+            }
+
+
+SCHEDULER = QuotaScheduler()
@@ -0,0 +1,153 @@
+# ============================================================
+# modules/score_reconciler.py
+# Quorum-based score reconciliation για N live sources
+# ============================================================
+# Κάθε source έχει βάρος αξιοπιστίας (SOURCE_WEIGHTS) που μειώνεται όσο
+# η τιμή του μένει πίσω από την πιο πρόσφατη πηγή του ίδιου αγώνα
+# (half-life RECONCILE_HALF_LIFE, μηδενίζεται μετά από RECONCILE_STALE_AFTER).
+# Για κάθε αγώνα οι ψήφοι ομαδοποιούνται ανά σκορ σε ένα πέρασμα:
+#   - όλες οι πηγές συμφωνούν            → "agree"
+#   - ένα σκορ έχει > RECONCILE_QUORUM του βάρους → αυτό (με διαφωνία → "disagree_quorum")
+#   - κανένα δεν έχει quorum            → το βαρύτερο ("disagree_no_quorum")
+# Χρησιμοποιείται από cross_verifier.py.
+# ============================================================
+
+import os
+import re
+from datetime import datetime, timedelta
+
+SOURCE_WEIGHTS = {
+    "Verified": 1.5,
+    "Sofascore": 1.0,
+    "API-Football": 1.0,
+    "Flashscore": 0.9,
+    "Football-Data": 0.7,
+}
+
+SOURCE_ALIASES = {
+    "sofascore": "Sofascore",
+    "flashscore": "Flashscore",
+    "football-data": "Football-Data",
+    "footballdata": "Football-Data",
+    "football_data": "Football-Data",
+    "api-football": "API-Football",
+    "apifootball": "API-Football",
+    "api_football": "API-Football",
+    "verified": "Verified",
+}
+
+HALF_LIFE = float(os.getenv("RECONCILE_HALF_LIFE", 180))
+STALE_AFTER = float(os.getenv("RECONCILE_STALE_AFTER", 900))
+QUORUM = float(os.getenv("RECONCILE_QUORUM", 0.5))
+
+_SCORE = re.compile(r"^\s*(\d+)\s*[-:–]\s*(\d+)\s*$")
+
+
+def canonical_source(name):
+    if not name:
+        return None
+    name = name.strip()
+    return SOURCE_ALIASES.get(name.lower(), name if name in SOURCE_WEIGHTS else None)
+
+
+def normalize_score(score):
+    """'1 - 0', '1:0', '1–0' → '1-0' (None αν δεν είναι σκορ)."""
+    if score is None:
+        return None
+    m = _SCORE.match(str(score))
+    return f"{int(m.group(1))}-{int(m.group(2))}" if m else None
+
+
+def _to_dt(ts):
+    if ts is None or isinstance(ts, datetime):
+        return ts
+    try:
+        return datetime.fromisoformat(str(ts).replace("Z", ""))
+    except ValueError:
+        return None
+
+
+def freshness(updated_at, reference=None):
+    """
+    Πολλαπλασιαστής βάρους 1 → 0 με την καθυστέρηση της τιμής σε σχέση με
+    την πιο πρόσφατη παρατήρηση του αγώνα (1 αν δεν υπάρχει timestamp).
+    Σχετική ηλικία: οι readers γράφουν μόνο αλλαγές, οπότε ένα αμετάβλητο
+    σκορ είναι παλιό σε απόλυτο χρόνο αλλά όχι απαραίτητα λάθος.
+    """
+    ts = _to_dt(updated_at)
+    if ts is None or reference is None:
+        return 1.0
+    lag = (reference - ts).total_seconds()
+    if lag <= 0:
+        return 1.0
+    if lag > STALE_AFTER:
+        return 0.0
+    return 0.5 ** (lag / HALF_LIFE)
+
+
+def _utc_naive(ts):
+    ts = _to_dt(ts)
+    if ts is not None and ts.tzinfo is not None:
+        ts = ts.replace(tzinfo=None) - (ts.utcoffset() or timedelta(0))
+    return ts
+
+
+def reconcile(observations):
+    """
+    observations: {source: (score, updated_at)}
+    Επιστρέφει (decided, note, support) – support = ποσοστό βάρους υπέρ του decided.
+    """
+    parsed = []
+    for source, (score, updated_at) in observations.items():
+        score = normalize_score(score)
+        if score is not None:
+            parsed.append((source, score, _utc_naive(updated_at)))
+    if not parsed:
+        return None, "no_data", 0.0
+    reference = max((ts for _, _, ts in parsed if ts is not None), default=None)
+
+    votes = {}   # score -> weight
+    voters = {}  # score -> [sources]
+    stale = []
+    for source, score, ts in parsed:
+        weight = SOURCE_WEIGHTS.get(source, 0.5) * freshness(ts, reference)
+        if weight <= 0:
+            stale.append(source)
+            continue
+        votes[score] = votes.get(score, 0.0) + weight
+        voters.setdefault(score, []).append(source)
+
+    total = sum(votes.values())
+    decided = max(votes, key=lambda s: (votes[s], len(voters[s])))
+    support = votes[decided] / total
+    if len(votes) == 1:
+        sources = voters[decided]
+        if stale:
+            return decided, f"fresh_only ({'/'.join(sorted(sources))}={decided}; stale: {', '.join(sorted(stale))})", 1.0
+        if len(sources) == 1:
+            return decided, f"only_{sources[0].lower()}", 1.0
+        return decided, "agree", 1.0
+
+    detail = ", ".join(f"{'/'.join(sorted(voters[s]))}={s}" for s in sorted(votes, key=votes.get, reverse=True))
+    if support > QUORUM:
+        return decided, f"disagree_quorum ({detail})", support
+    return decided, f"disagree_no_quorum ({detail})", support
+
+
+def group_latest(rows, key=None):
+    """
+    Ένα πέρασμα πάνω σε rows (home, away, score, source, updated_at) →
+    {key(row): {source: (score, updated_at)}} με την πιο πρόσφατη τιμή ανά source.
+    Default key: (home, away).
+    """
+    latest = {}
+    for r in rows:
+        source = canonical_source(r["source"])
+        if source is None:
+            continue
+        k = key(r) if key else (r["home"], r["away"])
+        per_source = latest.setdefault(k, {})
+        prev = per_source.get(source)
+        if prev is None or str(r["updated_at"] or "") > str(prev[1] or ""):
+            per_source[source] = (r["score"], r["updated_at"])
+    return latest
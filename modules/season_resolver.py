@@ -0,0 +1,131 @@
+# ============================================================
+# modules/season_resolver.py
+# Memoized API-Football season resolution ανά λίγκα
+# ============================================================
+# Αντί για ένα /leagues?id= request πριν από κάθε fixtures/odds call,
+# η τρέχουσα σεζόν κάθε λίγκας κρατιέται στη μνήμη (SEASON_TTL) και
+# μπορεί να λυθεί μαζικά για όλες τις λίγκες με ένα /leagues?current=true.
+# Αν το μαζικό call δεν λύσει καμία σεζόν (σφάλμα / κενό body), ξαναδοκιμάζει
+# με exponential backoff (SEASON_RETRY → SEASON_RETRY_MAX) και χωρίς disk cache.
+# Χρησιμοποιείται από apifootball_reader, SmartMoneyMonitor, api_reader.
+# ============================================================
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from modules import http_client
+
+BASE_URL = "https://v3.football.api-sports.io"
+SEASON_TTL = int(os.getenv("APIFOOTBALL_SEASON_TTL", 6 * 3600))
+SEASON_RETRY = int(os.getenv("APIFOOTBALL_SEASON_RETRY", 60))
+SEASON_RETRY_MAX = int(os.getenv("APIFOOTBALL_SEASON_RETRY_MAX", 900))
+
+_seasons = {}  # league_id -> (year, expires_at)
+_bulk_expires = 0.0  # πότε λήγει το τελευταίο /leagues?current=true (ή το backoff)
+_bulk_failures = 0   # διαδοχικά μαζικά calls χωρίς καμία σεζόν
+_lock = threading.Lock()
+
+
+def pick_current_season(seasons, today=None):
+    """
+    Επιστρέφει τη σεζόν που περιλαμβάνει τη σημερινή ημερομηνία.
+    Αν δεν υπάρχει, επιλέγει την τελευταία ενεργή completed.
+    """
+    if not seasons:
+        return None
+    today = today or datetime.now(timezone.utc).date()
+    for s in seasons:
+        start = s.get("start")
+        end = s.get("end")
+        if start and end:
+            try:
+                start_date = datetime.strptime(start, "%Y-%m-%d").date()
+                end_date = datetime.strptime(end, "%Y-%m-%d").date()
+                if start_date <= today <= end_date:
+                    return s.get("year")
+            except Exception:
+                continue
+    if len(seasons) > 1:
+        return seasons[-2].get("year")
+    return seasons[-1].get("year")
+
+
+def _remember(league_id, year):
+    with _lock:
+        _seasons[int(league_id)] = (year, time.monotonic() + SEASON_TTL)
+
+
+def _cached(league_id):
+    with _lock:
+        ent = _seasons.get(int(league_id))
+    if ent and ent[1] > time.monotonic():
+        return ent[0]
+    return None
+
+
+def _headers(api_key):
+    return {"x-apisports-key": api_key or os.getenv("APIFOOTBALL_API_KEY") or ""}
+
+
+def get_season(league_id, api_key=None):
+    """Τρέχουσα σεζόν για μία λίγκα (από τη μνήμη ή με ένα /leagues?id= call)."""
+    year = _cached(league_id)
+    if year is not None:
+        return year
+    try:
+        resp = http_client.get(f"{BASE_URL}/leagues", provider="apifootball", headers=_headers(api_key),
+                               params={"id": league_id}, cache_ttl=SEASON_TTL)
+        data = resp.json().get("response", [])
+        if not data:
+            return None
+        year = pick_current_season(data[0].get("seasons", []))
+        if year is not None:
+            _remember(league_id, year)
+        return year
+    except Exception as e:
+        print(f"[SEASONS] ⚠️ Season fetch error (league={league_id}): {e}")
+        return None
+
+
+def resolve_seasons(league_ids=None, api_key=None):
+    """
+    Λύνει μαζικά τις τρέχουσες σεζόν με ένα /leagues?current=true call.
+    Επιστρέφει {league_id: year} για τα ζητούμενα ids (ή για όλες τις λίγκες).
+    """
+    global _bulk_expires, _bulk_failures
+    wanted = [int(l) for l in league_ids] if league_ids is not None else None
+    if wanted is not None:
+        known = {lid: _cached(lid) for lid in wanted}
+        if all(y is not None for y in known.values()) or _bulk_expires > time.monotonic():
+            return known
+    resolved = 0
+    try:
+        # Μετά από αποτυχία όχι disk cache – θέλουμε φρέσκια απάντηση
+        resp = http_client.get(f"{BASE_URL}/leagues", provider="apifootball", headers=_headers(api_key),
+                               params={"current": "true"}, cache_ttl=None if _bulk_failures else SEASON_TTL)
+        for it in resp.json().get("response", []) or []:
+            lid = (it.get("league") or {}).get("id")
+            year = pick_current_season(it.get("seasons") or [])
+            if lid is not None and year is not None:
+                _remember(lid, year)
+                resolved += 1
+    except Exception as e:
+        print(f"[SEASONS] ⚠️ Bulk season fetch error: {e}")
+
+    if resolved:
+        _bulk_failures = 0
+        _bulk_expires = time.monotonic() + SEASON_TTL
+    else:
+        delay = min(SEASON_RETRY_MAX, SEASON_RETRY * 2 ** _bulk_failures)
+        _bulk_failures += 1
+        _bulk_expires = time.monotonic() + delay
+        print(f"[SEASONS] ⚠️ Bulk season fetch resolved nothing – retry in {delay}s")
+
+    with _lock:
+        now = time.monotonic()
+        if wanted is None:
+            return {lid: y for lid, (y, exp) in _seasons.items() if exp > now}
+        return {lid: _seasons[lid][0] if lid in _seasons and _seasons[lid][1] > now else None
+                for lid in wanted}
@@ -0,0 +1,198 @@
+# ============================================================
+# modules/signal_journal.py
+# Append-only JSONL journal για smart-money signals + sidecar index
+# ============================================================
+# Αντικαθιστά το load → append → rewrite του smartmoney_log.json.
+#   <dir>/seg-000001.jsonl, seg-000002.jsonl, ...  (ένα record ανά γραμμή)
+#   <dir>/index.tsv   "timestamp<TAB>segment<TAB>byte offset"
+# - Κάθε append γράφει μόνο τη νέα γραμμή (O(1) I/O)
+# - Νέο segment όταν το τρέχον ξεπεράσει τα segment_bytes· τα segments
+#   ΔΕΝ μετονομάζονται, οπότε τα offsets του index μένουν έγκυρα
+# - Retention: κρατούνται τα τελευταία keep_segments segments
+# - Index: το πρώτο record κάθε segment + ένα κάθε `index_every` records
+#   → between(T1, T2) κάνει bisect στο index, seek στο offset και
+#     διαβάζει μόνο το κομμάτι [T1, T2]
+# Τα timestamps είναι "YYYY-MM-DD HH:MM:SS" (λεξικογραφική = χρονική σειρά).
+#   SMARTMONEY_JOURNAL_DIR=data/smartmoney_journal
+#   SMARTMONEY_SEGMENT_KB=1024  SMARTMONEY_KEEP_SEGMENTS=20
+#   SMARTMONEY_INDEX_EVERY=16
+# ============================================================
+
+import json
+import os
+import re
+import tempfile
+import threading
+from bisect import bisect_left
+from datetime import datetime
+
+TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+INDEX_FILE = "index.tsv"
+_SEGMENT = re.compile(r"^seg-(\d{6})\.jsonl$")
+
+
+def _ts(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.strftime(TS_FORMAT)
+    return str(value).replace("T", " ")[:19]
+
+
+class SignalJournal:
+    def __init__(self, directory: str = None, segment_bytes: int = None, keep_segments: int = None,
+                 index_every: int = None, legacy_file: str = None):
+        self.directory = directory or os.getenv("SMARTMONEY_JOURNAL_DIR", os.path.join("data", "smartmoney_journal"))
+        self.segment_bytes = max(1024, int(segment_bytes or int(os.getenv("SMARTMONEY_SEGMENT_KB", 1024)) * 1024))
+        self.keep_segments = max(1, int(keep_segments or os.getenv("SMARTMONEY_KEEP_SEGMENTS", 20)))
+        self.index_every = max(1, int(index_every or os.getenv("SMARTMONEY_INDEX_EVERY", 16)))
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._segments = self._scan_segments()
+        self._index = []  # [(timestamp, segment, offset)] σε σειρά εγγραφής
+        self._since_index = 0
+        self._load_index()
+        if not self._segments and legacy_file:
+            self._import_legacy(legacy_file)
+
+    # ---------------- αρχεία ----------------
+    def _path(self, seg):
+        return os.path.join(self.directory, f"seg-{seg:06d}.jsonl")
+
+    def _scan_segments(self):
+        found = []
+        for name in os.listdir(self.directory):
+            m = _SEGMENT.match(name)
+            if m:
+                found.append(int(m.group(1)))
+        return sorted(found)
+
+    def _load_index(self):
+        path = os.path.join(self.directory, INDEX_FILE)
+        live = set(self._segments)
+        entries = []
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) == 3 and int(parts[1]) in live:
+                        entries.append((parts[0], int(parts[1]), int(parts[2])))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[SIGNAL_JOURNAL] ⚠️ Index μη αναγνώσιμο ({e}) – rebuild")
+            entries = []
+        indexed = {seg for _, seg, _ in entries}
+        if any(seg not in indexed for seg in self._segments):
+            entries = self._rebuild_index()
+        self._index = entries
+
+    def _rebuild_index(self):
+        entries = []
+        for seg in self._segments:
+            count = 0
+            with open(self._path(seg), "rb") as f:
+                offset = 0
+                for raw in f:
+                    if count % self.index_every == 0:
+                        try:
+                            entries.append((_ts(json.loads(raw).get("timestamp")) or "", seg, offset))
+                        except ValueError:
+                            pass
+                    count += 1
+                    offset += len(raw)
+        self._write_index(entries)
+        return entries
+
+    def _write_index(self, entries):
+        fd, tmp = tempfile.mkstemp(prefix=".index-", suffix=".tmp", dir=self.directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.writelines(f"{ts}\t{seg}\t{off}\n" for ts, seg, off in entries)
+        os.replace(tmp, os.path.join(self.directory, INDEX_FILE))
+
+    def _import_legacy(self, legacy_file):
+        try:
+            if not os.path.exists(legacy_file):
+                return
+            with open(legacy_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for entry in data if isinstance(data, list) else []:
+                self.append(entry)
+            print(f"[SIGNAL_JOURNAL] 📥 {len(data)} runs από {legacy_file}")
+        except Exception as e:
+            print(f"[SIGNAL_JOURNAL] ⚠️ Legacy import απέτυχε: {e}")
+
+    # ---------------- γράψιμο ----------------
+    def append(self, record: dict):
+        ts = _ts(record.get("timestamp")) or datetime.now().strftime(TS_FORMAT)
+        data = (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            if not self._segments:
+                self._segments.append(1)
+            seg = self._segments[-1]
+            with open(self._path(seg), "ab") as f:
+                offset = f.tell()
+                f.write(data)
+            if offset == 0 or self._since_index >= self.index_every:
+                self._index.append((ts, seg, offset))
+                self._since_index = 0
+                with open(os.path.join(self.directory, INDEX_FILE), "a", encoding="utf-8") as f:
+                    f.write(f"{ts}\t{seg}\t{offset}\n")
+            self._since_index += 1
+            if offset + len(data) >= self.segment_bytes:
+                self._segments.append(seg + 1)
+                self._since_index = self.index_every  # το πρώτο record του νέου segment μπαίνει στο index
+                self._apply_retention()
+
+    def _apply_retention(self):
+        dropped = self._segments[:-self.keep_segments]
+        if not dropped:
+            return
+        self._segments = self._segments[-self.keep_segments:]
+        for seg in dropped:
+            try:
+                os.remove(self._path(seg))
+            except FileNotFoundError:
+                pass
+        oldest = self._segments[0]
+        self._index = [e for e in self._index if e[1] >= oldest]
+        self._write_index(self._index)
+
+    # ---------------- διάβασμα ----------------
+    def between(self, start=None, end=None):
+        """Records με start <= timestamp <= end (παλαιότερο → νεότερο)."""
+        start, end = _ts(start), _ts(end)
+        with self._lock:
+            segments = list(self._segments)
+            index = list(self._index)
+        if not segments:
+            return []
+        seg, offset = segments[0], 0
+        if start and index:
+            pos = bisect_left([e[0] for e in index], start) - 1
+            if pos >= 0:
+                _, seg, offset = index[pos]
+        out = []
+        for s in (x for x in segments if x >= seg):
+            try:
+                with open(self._path(s), "rb") as f:
+                    f.seek(offset if s == seg else 0)
+                    for raw in f:
+                        try:
+                            record = json.loads(raw)
+                        except ValueError:
+                            continue
+                        ts = _ts(record.get("timestamp")) or ""
+                        if start and ts < start:
+                            continue
+                        if end and ts > end:
+                            return out
+                        out.append(record)
+            except FileNotFoundError:
+                continue  # σβήστηκε από retention στο μεταξύ
+        return out
+
+    def stats(self):
+        with self._lock:
+            size = sum(os.path.getsize(self._path(s)) for s in self._segments if os.path.exists(self._path(s)))
+            return {"segments": len(self._segments), "index_entries": len(self._index), "bytes": size}
@@ -4,10 +4,16 @@
 # ============================================================
 
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
 import time
-import requests
 import random
 
+from modules import http_client, season_resolver
+from modules.quota_scheduler import priority_for, PRIORITY_NORMAL
+from modules.adaptive_poller import AdaptivePoller, ADAPTIVE_POLLING, POLL_FAR, is_finished
+from modules.identity_index import match_id
+from modules.odds_store import get_odds_store
+
 # Target league IDs (API-Football — Ευρώπη 1-2 + Γερμανία 3 + Ελλάδα 1-2)
 TARGET_LEAGUES = [
     # England
@@ -85,16 +91,33 @@ def _match_key(home, away):
     return f"{(home or '').strip()} - {(away or '').strip()}"
 
 class SmartMoneyMonitor:
-    def __init__(self, refresh_interval: int, apifootball_key: str, sportmonks_key: str = ""):
+    def __init__(self, refresh_interval: int, apifootball_key: str, sportmonks_key: str = "",
+                 max_workers: int = 8, league_timeout: float = 10, refresh_deadline: float = None,
+                 adaptive: bool = None):
         self.refresh_interval = max(15, int(refresh_interval))
         self.apifootball_key = apifootball_key
         self.sportmonks_key = sportmonks_key
+        # Concurrent fan-out: πόσες λίγκες ταυτόχρονα, timeout ανά λίγκα
+        # και συνολικό όριο ανά refresh (default = refresh_interval)
+        self.max_workers = max(1, int(max_workers))
+        self.league_timeout = float(league_timeout)
+        self.refresh_deadline = float(refresh_deadline or self.refresh_interval)
+        self._executor = None
+        self._league_priority = {}  # lid -> προτεραιότητα από το πιο κοντινό kickoff
+        # Adaptive mode: κάθε λίγκα ανανεώνεται ανάλογα με το πιο κοντινό kickoff της
+        self.adaptive = ADAPTIVE_POLLING if adaptive is None else bool(adaptive)
+        self._poller = AdaptivePoller()
+        self._current = {}  # canonical match id -> {"match", "odds", "kickoff"}
+        self._rows = {}     # canonical match id -> feed row (snapshot τρέχουσας τιμής)
         self._feed_cache = []
-        self._start_odds = {}  # αρχικό snapshot ανά match
+        self._start_odds = {}  # αρχικό snapshot ανά canonical match id
+        self._sim_start = {}   # start odds του simulation feed (ποτέ μέσα στο _current)
         self._last_refresh = None
 
     # -------- public --------
     def run_forever(self):
+        if self.adaptive:
+            return self._run_adaptive()
         print(f"[SMARTMONEY] ♻️ Loop started – every {self.refresh_interval}s")
         while True:
             try:
@@ -105,6 +128,21 @@ class SmartMoneyMonitor:
                 print("[SMARTMONEY] ❌ Refresh error:", e)
             time.sleep(self.refresh_interval)
 
+    def _run_adaptive(self):
+        print("[SMARTMONEY] ♻️ Adaptive loop started – kickoff-proximity polling")
+        for lid in TARGET_LEAGUES:
+            self._poller.track(lid, due_now=True)
+        while True:
+            due = self._poller.due()
+            if due:
+                try:
+                    self._refresh_once(due)
+                    self._last_refresh = datetime.now()
+                    print(f"[SMARTMONEY] ✅ {len(due)} leagues refreshed – {len(self._feed_cache)} matches")
+                except Exception as e:
+                    print("[SMARTMONEY] ❌ Refresh error:", e)
+            time.sleep(self._poller.sleep_hint(max_sleep=POLL_FAR))
+
     def get_feed(self):
         if not self._feed_cache:
             try:
@@ -113,91 +151,176 @@ class SmartMoneyMonitor:
                 pass
         return self._feed_cache
 
+    def price_history(self, match_id, start=None, end=None, book="Pinnacle"):
+        """1X2 ticks ανά επιλογή από το odds store: {"1": [(ts, price, line)], "X": ..., "2": ...}"""
+        store = get_odds_store()
+        return {sel: store.history(match_id, f"1X2:{sel}", book, start, end) for sel in ("1", "X", "2")}
+
     def last_refresh_str(self):
         return self._last_refresh.strftime("%Y-%m-%d %H:%M:%S") if self._last_refresh else "—"
 
     # -------- internal --------
-    def _refresh_once(self):
-        items = self._fetch_apifootball()
-        if not items:
-            items = self._simulate(8)
+    def _refresh_once(self, leagues=None):
+        items = self._fetch_apifootball(leagues)
+        if leagues is None:
+            self._current = {}  # πλήρες refresh → νέο snapshot
+            self._rows = {}
+        if not items and not self._current:
+            # Demo γραμμές μόνο για το feed – δεν μπαίνουν στο snapshot, ώστε να
+            # μη μείνουν δίπλα στους πραγματικούς αγώνες όταν έρθουν δεδομένα
+            self._feed_cache = self._simulated_feed(8)
             print("[SMARTMONEY] 🟡 Simulation mode")
+            return
+        self._sim_start = {}
         self._feed_cache = self._enrich(items)
 
-    def _fetch_apifootball(self):
+    def _fetch_apifootball(self, leagues=None):
         if not self.apifootball_key:
             return []
         headers = {"x-apisports-key": self.apifootball_key}
-        season = datetime.now().year
+        # Σεζόν όλων των λιγκών με ένα /leagues call (memoized)
+        seasons = season_resolver.resolve_seasons(TARGET_LEAGUES, self.apifootball_key)
+        fallback_season = datetime.now().year
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="smartmoney")
+
+        # Πρώτα οι λίγκες με live / κοντινά kickoffs (quota scheduler)
+        leagues = sorted(leagues or TARGET_LEAGUES, key=lambda lid: self._league_priority.get(lid, PRIORITY_NORMAL))
+        futures = {
+            self._executor.submit(self._fetch_league, lid, seasons.get(lid) or fallback_season, headers,
+                                  self._league_priority.get(lid, PRIORITY_NORMAL)): lid
+            for lid in leagues
+        }
         out = []
-        for lid in TARGET_LEAGUES:
-            try:
-                r = requests.get(
-                    "https://v3.football.api-sports.io/odds",
-                    headers=headers,
-                    params={"league": lid, "season": season, "bookmaker": 8},  # 8: Pinnacle
-                    timeout=10
-                )
-                if r.status_code != 200:
+        try:
+            # Merge όπως έρχονται – το refresh κρατά όσο η πιο αργή λίγκα
+            for fut in as_completed(futures, timeout=self.refresh_deadline):
+                lid = futures[fut]
+                try:
+                    rows, prio, nearest = fut.result()
+                except Exception as e:
+                    print(f"[SMARTMONEY] ⚠️ League {lid} skipped: {e}")
                     continue
-                for it in r.json().get("response") or []:
-                    teams = it.get("teams") or {}
-                    home = (teams.get("home") or {}).get("name") or ""
-                    away = (teams.get("away") or {}).get("name") or ""
-                    mk = _match_key(home, away)
-
-                    odds = it.get("odds") or []
-                    o1 = oX = o2 = None
-                    for book in odds:
-                        for m in (book.get("markets") or []):
-                            if "1x2" in (m.get("name") or "").lower():
-                                for s in (m.get("outcomes") or []):
-                                    nm = (s.get("name") or "").strip().lower()
-                                    pr = _safe_float(s.get("price"))
-                                    if pr:
-                                        if nm in ["home", "1", home.lower()]: o1 = pr
-                                        elif nm in ["draw", "x"]: oX = pr
-                                        elif nm in ["away", "2", away.lower()]: o2 = pr
-                    if o1 and oX and o2:
-                        out.append({"match": mk, "odds": {"1": round(o1,2), "X": round(oX,2), "2": round(o2,2)}})
-            except Exception as e:
-                print(f"[SMARTMONEY] ⚠️ League {lid} skipped: {e}")
+                out.extend(rows)
+                # Priority / kickoff εφαρμόζονται εδώ, στο thread του loop
+                if prio is not None:
+                    self._league_priority[lid] = prio
+                    self._poller.track(lid, kickoff=nearest)
+        except FuturesTimeout:
+            pending = [lid for fut, lid in futures.items() if not fut.done()]
+            for fut in futures:
+                fut.cancel()
+            print(f"[SMARTMONEY] ⏱️ Deadline {self.refresh_deadline:g}s – {len(pending)} leagues skipped: {pending}")
         print(f"[SMARTMONEY] 📡 API-Football fetched {len(out)} matches")
         return out
 
+    def _fetch_league(self, lid, season, headers, priority=PRIORITY_NORMAL):
+        """Τρέχει σε worker thread· επιστρέφει (rows, priority, nearest kickoff) χωρίς side effects."""
+        r = http_client.get(
+            "https://v3.football.api-sports.io/odds",
+            provider="apifootball",
+            priority=priority,
+            headers=headers,
+            params={"league": lid, "season": season, "bookmaker": 8},  # 8: Pinnacle
+            timeout=self.league_timeout
+        )
+        if r.status_code != 200:
+            return [], None, None
+        out = []
+        prio = PRIORITY_NORMAL
+        nearest = None
+        for it in r.json().get("response") or []:
+            kickoff = (it.get("fixture") or {}).get("date")
+            if is_finished(kickoff):
+                continue
+            prio = min(prio, priority_for(kickoff))
+            if kickoff and (nearest is None or kickoff < nearest):
+                nearest = kickoff
+            teams = it.get("teams") or {}
+            home = (teams.get("home") or {}).get("name") or ""
+            away = (teams.get("away") or {}).get("name") or ""
+            mk = _match_key(home, away)
+            mid = match_id(home, away, kickoff, provider="apifootball")
+
+            odds = it.get("odds") or []
+            o1 = oX = o2 = None
+            for book in odds:
+                for m in (book.get("markets") or []):
+                    if "1x2" in (m.get("name") or "").lower():
+                        for s in (m.get("outcomes") or []):
+                            nm = (s.get("name") or "").strip().lower()
+                            pr = _safe_float(s.get("price"))
+                            if pr:
+                                if nm in ["home", "1", home.lower()]: o1 = pr
+                                elif nm in ["draw", "x"]: oX = pr
+                                elif nm in ["away", "2", away.lower()]: o2 = pr
+            if o1 and oX and o2:
+                out.append({"match": mk, "match_id": mid,
+                            "odds": {"1": round(o1,2), "X": round(oX,2), "2": round(o2,2)},
+                            "kickoff": kickoff, "book": "Pinnacle"})
+        return out, prio, nearest
+
     def _simulate(self, n=10):
         demo = ["Arsenal - Chelsea","Bayern - Dortmund","PAOK - Olympiacos","Juventus - Inter","Barcelona - Sevilla","PSG - Marseille","Ajax - Feyenoord","Porto - Benfica"]
         out = []
         for _ in range(n):
             m = random.choice(demo)
             o1, oX, o2 = [round(random.uniform(1.7, 3.6), 2) for _ in range(3)]
-            out.append({"match": m, "odds": {"1": o1, "X": oX, "2": o2}})
+            out.append({"match": m, "match_id": match_id(*m.split(" - ", 1)), "odds": {"1": o1, "X": oX, "2": o2}})
         return out
 
+    def _simulated_feed(self, n=8):
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = {}
+        for it in self._simulate(n):
+            ent = {"match": it["match"], "odds": it["odds"], "kickoff": None}
+            rows[it["match_id"]] = self._feed_row(it["match_id"], ent, now, starts=self._sim_start)
+        return list(rows.values())
+
     def _enrich(self, items):
+        """
+        Ενημερώνει το snapshot μόνο για αγώνες με νέες/αλλαγμένες τιμές·
+        οι υπόλοιπες γραμμές του feed μένουν ως έχουν (O(αλλαγές) ανά refresh).
+        """
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        merged = {}
+        merged = self._current  # canonical match id -> {"match", "odds", "kickoff"}
+        store = get_odds_store()
+        ts = time.time()
         for it in items:
             mk = it.get("match")
             o = (it.get("odds") or {})
             if not mk or not all(k in o for k in ("1","X","2")):
                 continue
-            merged[mk] = o
+            mid = it.get("match_id") or mk
+            prev = merged.get(mid)
+            merged[mid] = {"match": mk, "odds": o, "kickoff": it.get("kickoff")}
+            if it.get("book"):  # πραγματικές τιμές μόνο (όχι simulation)
+                for sel in ("1", "X", "2"):
+                    store.record(mid, f"1X2:{sel}", it["book"], o[sel], ts=ts)
+            if prev is None or prev["odds"] != o or mid not in self._rows:
+                self._rows[mid] = self._feed_row(mid, merged[mid], now)
 
-        out = []
-        for mk, cur in merged.items():
-            if mk not in self._start_odds:
-                self._start_odds[mk] = cur.copy()
-            start = self._start_odds[mk]
-            mfi = _money_flow(start, cur)
-            mov = _movement_label(start, cur)
-            out.append({
-                "match": mk,
-                "market": "1X2",
-                "start_odds": start,
-                "current_odds": cur,
-                "movement": mov,
-                "money_flow": mfi,
-                "timestamp": now
-            })
-        return out
+        # Τελειωμένοι αγώνες βγαίνουν από το feed
+        for mid in [mid for mid, ent in merged.items() if is_finished(ent["kickoff"])]:
+            del merged[mid]
+            self._rows.pop(mid, None)
+            self._start_odds.pop(mid, None)
+
+        return list(self._rows.values())
+
+    def _feed_row(self, mid, ent, now, starts=None):
+        starts = self._start_odds if starts is None else starts
+        cur = ent["odds"]
+        if mid not in starts:
+            starts[mid] = cur.copy()
+        start = starts[mid]
+        return {
+            "match": ent["match"],
+            "match_id": mid,
+            "market": "1X2",
+            "start_odds": start,
+            "current_odds": cur,
+            "movement": _movement_label(start, cur),
+            "money_flow": _money_flow(start, cur),
+            "timestamp": now
+        }
@@ -2,10 +2,11 @@
 # EURO_GOALS – Status Monitor
 # ==============================================
 import os
-import requests
 from datetime import datetime
 from dotenv import load_dotenv
 
+from modules import http_client
+
 load_dotenv()
 
 # ============================================================
@@ -26,8 +27,8 @@ def check_status():
     fd_key = os.getenv("FOOTBALLDATA_API_KEY")
     if fd_key:
         try:
-            r = requests.get("https://api.football-data.org/v4/status",
-                             headers={"X-Auth-Token": fd_key}, timeout=5)
+            r = http_client.get("https://api.football-data.org/v4/status", provider="health",
+                                headers={"X-Auth-Token": fd_key})
             if r.status_code in [200, 403]:  # 403 = free plan OK
                 result.append({"module": "🏆 Football-Data.org", "status": "🟢 Active", "last_check": now})
             else:
@@ -41,8 +42,8 @@ def check_status():
     af_key = os.getenv("APIFOOTBALL_API_KEY")
     if af_key:
         try:
-            r = requests.get("https://v3.football.api-sports.io/status",
-                             headers={"x-apisports-key": af_key}, timeout=5)
+            r = http_client.get("https://v3.football.api-sports.io/status", provider="health",
+                                headers={"x-apisports-key": af_key})
             if r.status_code == 200:
                 result.append({"module": "📊 API-Football", "status": "🟢 Connected", "last_check": now})
             else:
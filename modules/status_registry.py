@@ -0,0 +1,122 @@
+# ============================================================
+# modules/status_registry.py
+# Engine status στη μνήμη + atomic περιοδικό flush σε JSON
+# ============================================================
+# Το registry είναι η πηγή αλήθειας για /status και /health_dual:
+#   update()   → αλλάζει μόνο τη μνήμη (κανένα disk I/O στο tick)
+#   snapshot() → αντίγραφο για τα routes (κανένα disk I/O στο request)
+# Ένα daemon thread γράφει το SYSTEM_STATUS_FILE κάθε
+# STATUS_FLUSH_INTERVAL δευτερόλεπτα ΜΟΝΟ αν άλλαξε κάτι, με
+# write-temp-and-rename (os.replace) ώστε οι εξωτερικοί readers να μη
+# βλέπουν ποτέ μισογραμμένο αρχείο. Flush και στο shutdown (atexit).
+#   SYSTEM_STATUS_FILE=data/system_status.json  STATUS_FLUSH_INTERVAL=5
+# ============================================================
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+
+class StatusRegistry:
+    def __init__(self, path: str = None, flush_interval: float = None):
+        # Defaults από το env την ώρα της δημιουργίας (τα apps κάνουν load_dotenv() μετά τα imports)
+        self.path = path or os.getenv("SYSTEM_STATUS_FILE", "data/system_status.json")
+        if flush_interval is None:
+            flush_interval = float(os.getenv("STATUS_FLUSH_INTERVAL", 5))
+        self.flush_interval = max(0.5, float(flush_interval))
+        self._lock = threading.Lock()
+        self._data = self._load()
+        self._version = 0   # αυξάνεται σε κάθε update
+        self._flushed = 0   # version που γράφτηκε τελευταία
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"[STATUS_REGISTRY] ⚠️ Αγνοείται το {self.path}: {e}")
+            return {}
+
+    # ---------------- μνήμη ----------------
+    def update(self, name: str, state: str, **extra):
+        entry = {"status": state, "last_update": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+        entry.update(extra)
+        with self._lock:
+            self._data[name] = entry
+            self._version += 1
+        self.start()
+
+    def get(self, name: str, default=None):
+        with self._lock:
+            entry = self._data.get(name)
+            return dict(entry) if isinstance(entry, dict) else default
+
+    def snapshot(self):
+        with self._lock:
+            return {k: dict(v) if isinstance(v, dict) else v for k, v in self._data.items()}
+
+    # ---------------- δίσκος ----------------
+    def flush(self, force: bool = False):
+        """Γράφει atomically αν υπάρχουν αλλαγές από το τελευταίο flush."""
+        with self._lock:
+            if not force and self._version == self._flushed:
+                return False
+            version = self._version
+            payload = json.dumps(self._data, indent=4, ensure_ascii=False)
+        folder = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(folder, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".status-", suffix=".tmp", dir=folder)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                os.replace(tmp, self.path)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+        except Exception as e:
+            print(f"[STATUS_REGISTRY] ⚠️ Flush απέτυχε: {e}")
+            return False
+        with self._lock:
+            self._flushed = max(self._flushed, version)
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="status-flush", daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    def close(self):
+        self._stop.set()
+        self.flush()
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = StatusRegistry()
+    return _registry
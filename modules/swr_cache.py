@@ -0,0 +1,119 @@
+# ============================================================
+# modules/swr_cache.py
+# Bounded LRU + TTL cache με stale-while-revalidate
+# και single-flight coalescing
+# ============================================================
+# - fresh entry (ηλικία < ttl)          → επιστρέφεται αμέσως
+# - stale entry (ttl ≤ ηλικία < ttl+stale_ttl)
+#                                        → επιστρέφεται αμέσως και γίνεται
+#                                          background refresh (μία φορά ανά key)
+# - miss / πολύ παλιό entry             → φόρτωση· ταυτόχρονα misses για το ίδιο
+#                                          key περιμένουν το ίδιο upstream call
+# Ο loader επιστρέφει None όταν αποτύχει → δεν αποθηκεύεται τίποτα.
+# ============================================================
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class SWRCache:
+    def __init__(self, maxsize: int = 128, ttl: float = 300, stale_ttl: float = 3600,
+                 name: str = "cache", refresh_workers: int = 2):
+        self.maxsize = max(1, int(maxsize))
+        self.ttl = float(ttl)
+        self.stale_ttl = float(stale_ttl)
+        self.name = name
+        self._data = OrderedDict()  # key -> (ts, value)
+        self._inflight = {}         # key -> Future
+        self._lock = threading.Lock()
+        self._refresh_workers = refresh_workers
+        self._executor = None
+        self.hits = self.stale_hits = self.misses = 0
+        self.evictions = self.refreshes = self.coalesced = 0
+
+    # ---------------- public ----------------
+    def get_or_load(self, key, loader):
+        with self._lock:
+            ent = self._data.get(key)
+            if ent is not None:
+                age = time.monotonic() - ent[0]
+                if age < self.ttl:
+                    self.hits += 1
+                    self._data.move_to_end(key)
+                    return ent[1]
+                if age < self.ttl + self.stale_ttl:
+                    self.stale_hits += 1
+                    self._data.move_to_end(key)
+                    if key not in self._inflight:
+                        self._inflight[key] = fut = Future()
+                        self._submit_refresh(key, loader, fut)
+                    return ent[1]
+            fut = self._inflight.get(key)
+            if fut is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                self.misses += 1
+                self._inflight[key] = fut = Future()
+                leader = True
+
+        if not leader:
+            value = fut.result()
+            # Αν το κοινό load απέτυχε, σερβίρουμε ό,τι υπάρχει (έστω και πολύ παλιό)
+            return value if value is not None else (ent[1] if ent is not None else None)
+        value = self._load(key, loader, fut)
+        if value is None and ent is not None:
+            return ent[1]
+        return value
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "refreshes": self.refreshes,
+                "evictions": self.evictions,
+            }
+
+    # ---------------- internal ----------------
+    def _submit_refresh(self, key, loader, fut):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._refresh_workers,
+                                                thread_name_prefix=f"{self.name}-swr")
+        self.refreshes += 1
+        self._executor.submit(self._load, key, loader, fut)
+
+    def _load(self, key, loader, fut):
+        value = None
+        try:
+            value = loader()
+        except Exception as e:
+            print(f"[{self.name.upper()}] ⚠️ Load failed for {key}: {e}")
+        finally:
+            with self._lock:
+                if value is not None:
+                    self._store(key, value)
+                self._inflight.pop(key, None)
+            fut.set_result(value)
+        return value
+
+    def _store(self, key, value):
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
@@ -6,8 +6,11 @@
 import os
 import time
 import json
-import requests
-from datetime import datetime, timedelta
+from datetime import timedelta
+
+from modules import http_client
+from modules.quota_scheduler import PRIORITY_NORMAL
+from modules.swr_cache import SWRCache
 
 # ==============================================================
 # Βασικές ρυθμίσεις API
@@ -20,37 +23,47 @@ MARKETS = "h2h"
 ODDS_FMT = "decimal"
 
 # ==============================================================
-# Simple in-memory cache (ώστε να μην γίνονται πολλά API calls)
+# Bounded LRU + TTL cache με stale-while-revalidate
+# (ώστε να μην γίνονται πολλά API calls και να μην περιμένει
+# κανείς το round trip του TheOddsAPI όταν λήξει ένα entry)
+# Κάτω από το SWR υπάρχει και το disk cache του http_client (ίδιο TTL),
+# ώστε ένα restart να μην ξοδεύει quota. Μετά από restart / eviction ένα
+# entry μπορεί να φορτωθεί από το δίσκο ήδη ~TTL παλιό και να θεωρηθεί
+# fresh για άλλο ένα TTL → οι αποδόσεις μπορεί να είναι έως ~2×TTL
+# (10 λεπτά) παλιές. ODDS_DISK_CACHE=OFF για πάντα φρέσκο fetch.
 # ==============================================================
-CACHE = {}
 TTL = timedelta(minutes=5)  # 5 λεπτά caching
-
-def _cache_get(key):
-    ent = CACHE.get(key)
-    if not ent:
-        return None
-    if datetime.utcnow() - ent["ts"] > TTL:
-        return None
-    return ent["data"]
-
-def _cache_set(key, data):
-    CACHE[key] = {"data": data, "ts": datetime.utcnow()}
+STALE_TTL = timedelta(minutes=int(os.environ.get("ODDS_CACHE_STALE_MINUTES", 60)))
+ODDS_DISK_CACHE = os.environ.get("ODDS_DISK_CACHE", "ON").upper() == "ON"
+CACHE = SWRCache(
+    maxsize=int(os.environ.get("ODDS_CACHE_SIZE", 64)),
+    ttl=TTL.total_seconds(),
+    stale_ttl=STALE_TTL.total_seconds(),
+    name="odds_cache",
+)
+
+def cache_stats():
+    """Hit/miss/eviction counters του odds cache."""
+    return CACHE.stats()
 
 # ==============================================================
 # Λειτουργία απλού fetch για 1 πρωτάθλημα
 # ==============================================================
 
-def get_odds(sport_key: str, mode: str = "simple"):
+def get_odds(sport_key: str, mode: str = "simple", priority: int = PRIORITY_NORMAL):
     """
     Παίρνει αποδόσεις για συγκεκριμένο πρωτάθλημα (sport_key)
     Παραδείγματα:
       /odds/soccer_epl
       /odds/soccer_greece_super_league
+    Το priority περνά στον quota scheduler (live / κοντινά kickoffs πρώτα).
     """
-    cached = _cache_get(sport_key)
-    if cached:
-        return cached
+    data = CACHE.get_or_load(sport_key, lambda: _fetch_odds(sport_key, priority))
+    if data is None:
+        return {"count": 0, "events": []}
+    return data
 
+def _fetch_odds(sport_key: str, priority: int):
     url = f"{BASE}/sports/{sport_key}/odds/"
     params = {
         "apiKey": THEODDS_KEY,
@@ -60,12 +73,13 @@ def get_odds(sport_key: str, mode: str = "simple"):
     }
 
     try:
-        res = requests.get(url, params=params, timeout=10)
+        res = http_client.get(url, provider="theodds", params=params, priority=priority,
+                              cache_ttl=TTL.total_seconds() if ODDS_DISK_CACHE else None)
         res.raise_for_status()
         data = res.json()
     except Exception as e:
         print(f"[get_odds] Error fetching {sport_key}: {e}")
-        return {"count": 0, "events": []}
+        return None
 
     events = []
     for match in data:
@@ -82,9 +96,7 @@ def get_odds(sport_key: str, mode: str = "simple"):
         except Exception:
             continue
 
-    out = {"sport_key": sport_key, "count": len(events), "events": events}
-    _cache_set(sport_key, out)
-    return out
+    return {"sport_key": sport_key, "count": len(events), "events": events}
 
 # ==============================================================
 # Bundle odds fetcher (multiple leagues)
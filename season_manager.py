@@ -1,15 +1,20 @@
 # ==============================================
 # EURO_GOALS – Season Manager v2 (Flashscore Parser)
 # ==============================================
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from bs4 import BeautifulSoup
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, column, insert, table, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 import os
 
+from modules import http_client
+from modules.db_engine import get_engine
+from modules.html_backend import extract_rows
+
 # --- Ρύθμιση βάσης --------------------------------
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///matches.db")
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {})
+engine = get_engine(DATABASE_URL)
 
 # --- Flashscore URLs -----------------------------
 FLASH_BASE = "https://www.flashscore.com"
@@ -31,59 +36,223 @@ def get_recent_seasons():
     return seasons  # π.χ. ['2024/2025', '2023/2024', '2022/2023', '2021/2022', '2020/2021']
 
 # --- Εξαγωγή αγώνων από Flashscore -------------------------------
+MATCH_FIELDS = {
+    "date": (None, "data-date"),
+    "home": ".event__participant--home",
+    "away": ".event__participant--away",
+    "score": ".event__scores",
+}
+
+def parse_matches(html, backend=None):
+    """Single-pass εξαγωγή αγώνων από σελίδα Flashscore (βλ. modules/html_backend.py)."""
+    return extract_rows(html, "div.event__match", MATCH_FIELDS, backend=backend)
+
 def fetch_matches(league_url, season):
+    """
+    Κατεβάζει και κάνει parse μία σελίδα αποτελεσμάτων. Σφάλματα δικτύου/HTTP
+    σηκώνονται, ώστε το backfill να γράψει checkpoint 'failed' με την αιτία
+    (και να ξαναδοκιμαστεί στο επόμενο resume).
+    """
+    print(f"[SEASON MANAGER] 🔍 Λήψη δεδομένων για {season} – {league_url}")
     try:
-        print(f"[SEASON MANAGER] 🔍 Λήψη δεδομένων για {season} – {league_url}")
-        r = requests.get(league_url, headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
-        soup = BeautifulSoup(r.text, "html.parser")
-
-        matches = []
-        for match in soup.select("div.event__match"):
-            date = match.get("data-date")
-            home = match.select_one(".event__participant--home").text.strip() if match.select_one(".event__participant--home") else ""
-            away = match.select_one(".event__participant--away").text.strip() if match.select_one(".event__participant--away") else ""
-            score = match.select_one(".event__scores").text.strip() if match.select_one(".event__scores") else ""
-            matches.append({"date": date, "home": home, "away": away, "score": score})
-        print(f"[SEASON MANAGER] ✅ {len(matches)} αγώνες ελήφθησαν")
-        return matches
-
+        r = http_client.get(league_url, provider="flashscore", headers={"User-Agent": "Mozilla/5.0"})
+        if r.status_code != 200:
+            raise RuntimeError(f"HTTP {r.status_code} για {league_url}")
+        matches = parse_matches(r.text)
     except Exception as e:
         print(f"[SEASON MANAGER] ❌ Σφάλμα λήψης δεδομένων: {e}")
-        return []
+        raise
+    print(f"[SEASON MANAGER] ✅ {len(matches)} αγώνες ελήφθησαν")
+    return matches
 
-# --- Έλεγχος αν υπάρχουν ήδη στη βάση -------------------------------
-def match_exists(conn, league, date, home, away):
-    res = conn.execute(text("""
-        SELECT 1 FROM matches 
-        WHERE league=:league AND date=:date AND home_team=:home AND away_team=:away
-        LIMIT 1
-    """), {"league": league, "date": date, "home": home, "away": away}).fetchone()
-    return res is not None
+# --- Natural key (league, date, home_team, away_team) -------------
+NATURAL_KEY_INDEX = "ux_matches_natural_key"
+_natural_key = None  # True αν υπάρχει το unique index (ON CONFLICT διαθέσιμο)
+
+def ensure_natural_key():
+    """
+    Δημιουργεί (μία φορά) το unique index του natural key.
+    Αν αποτύχει (π.χ. ήδη υπάρχουν διπλότυπα), τα inserts συνεχίζουν με προέλεγχο των υπαρχόντων keys.
+    """
+    global _natural_key
+    if _natural_key is not None:
+        return _natural_key
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(f"""
+                CREATE UNIQUE INDEX IF NOT EXISTS {NATURAL_KEY_INDEX}
+                ON matches (league, date, home_team, away_team)
+            """))
+        _natural_key = True
+    except Exception as e:
+        print(f"[SEASON MANAGER] ⚠️ Unique key μη διαθέσιμο ({e.__class__.__name__}) – fallback σε προέλεγχο keys")
+        _natural_key = False
+    return _natural_key
 
 # --- Εισαγωγή στη βάση ------------------------------------------
+# Core insert() με multi-row VALUES (ένα round trip ανά chunk) – το
+# text() + list of dicts περνά από το DBAPI executemany (μία γραμμή τη φορά
+# στο psycopg2). Τα νέα μετρώνται από το rowcount κάθε statement.
+MATCHES = table("matches", column("league"), column("season"), column("date"),
+                column("home_team"), column("away_team"), column("score"))
+NATURAL_KEY = ["league", "date", "home_team", "away_team"]
+INSERT_CHUNK = 150  # 6 στήλες × 150 < 999 bound params (παλιά SQLite)
+_UPSERT_DIALECTS = {"sqlite": sqlite_insert, "postgresql": pg_insert}
+
+_EXISTING_SQL = text("""
+    SELECT date, home_team, away_team FROM matches
+    WHERE league=:league AND date IN :dates
+""").bindparams(bindparam("dates", expanding=True))
+
+def _insert_matches(conn, matches, league, season):
+    """Bulk idempotent insert· επιστρέφει (inserted, skipped)."""
+    rows = {}
+    for m in matches:
+        key = (m["date"], m["home"], m["away"])
+        if key not in rows:  # διπλότυπα μέσα στο ίδιο scrape
+            rows[key] = {"league": league, "season": season, "date": m["date"],
+                         "home_team": m["home"], "away_team": m["away"], "score": m["score"]}
+    if not rows:
+        return 0, len(matches)
+    dialect_insert = _UPSERT_DIALECTS.get(conn.dialect.name) if _natural_key else None
+    if dialect_insert is None:
+        # Χωρίς unique key: αφαιρούμε ό,τι υπάρχει ήδη (ένας writer ανά backfill)
+        dates = sorted({d for d, _, _ in rows})
+        for (d, h, a) in conn.execute(_EXISTING_SQL, {"league": league, "dates": dates}):
+            rows.pop((d, h, a), None)
+    values = list(rows.values())
+    inserted = 0
+    for i in range(0, len(values), INSERT_CHUNK):
+        chunk = values[i:i + INSERT_CHUNK]
+        if dialect_insert is not None:
+            stmt = dialect_insert(MATCHES).values(chunk).on_conflict_do_nothing(index_elements=NATURAL_KEY)
+        else:
+            stmt = insert(MATCHES).values(chunk)
+        result = conn.execute(stmt)
+        # Ένα multi-row INSERT: το rowcount είναι ακριβές (τα conflicts δεν μετρούν)
+        inserted += result.rowcount if result.rowcount >= 0 else len(chunk)
+    return inserted, len(matches) - inserted
+
 def insert_into_db(matches, league, season):
     if not matches:
-        return
+        return 0, 0
+    ensure_natural_key()  # πριν ανοίξει το transaction που θα το χρησιμοποιήσει
     with engine.begin() as conn:
-        new_count = 0
-        for m in matches:
-            if not match_exists(conn, league, m["date"], m["home"], m["away"]):
-                conn.execute(text("""
-                    INSERT INTO matches (league, season, date, home_team, away_team, score)
-                    VALUES (:league, :season, :date, :home, :away, :score)
-                """), {"league": league, "season": season, "date": m["date"], "home": m["home"], "away": m["away"], "score": m["score"]})
-                new_count += 1
-        print(f"[SEASON MANAGER] 💾 Εισαγωγή {new_count} νέων αγώνων για {league} ({season})")
+        inserted, skipped = _insert_matches(conn, matches, league, season)
+        print(f"[SEASON MANAGER] 💾 Εισαγωγή {inserted} νέων αγώνων για {league} ({season}), {skipped} υπήρχαν ήδη")
+    return inserted, skipped
+
+# --- Backfill checkpoints ---------------------------------------
+# Κάθε (league, season) που ολοκληρώθηκε καταγράφεται στον ίδιο
+# transaction με τα inserts του, ώστε ένα restart να συνεχίζει από εκεί.
+def ensure_checkpoint_table():
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS backfill_checkpoints (
+                league      TEXT NOT NULL,
+                season      TEXT NOT NULL,
+                status      TEXT NOT NULL,
+                fetched     INTEGER DEFAULT 0,
+                inserted    INTEGER DEFAULT 0,
+                error       TEXT,
+                updated_at  TEXT,
+                PRIMARY KEY (league, season)
+            )
+        """))
+
+def completed_units():
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT league, season FROM backfill_checkpoints WHERE status = 'done'")).fetchall()
+    return {(r[0], r[1]) for r in rows}
+
+def _checkpoint(conn, league, season, status, fetched=0, inserted=0, error=None):
+    params = {"league": league, "season": season, "status": status, "fetched": fetched,
+              "inserted": inserted, "error": error, "ts": datetime.utcnow().isoformat()}
+    updated = conn.execute(text("""
+        UPDATE backfill_checkpoints
+        SET status=:status, fetched=:fetched, inserted=:inserted, error=:error, updated_at=:ts
+        WHERE league=:league AND season=:season
+    """), params).rowcount
+    if not updated:
+        conn.execute(text("""
+            INSERT INTO backfill_checkpoints (league, season, status, fetched, inserted, error, updated_at)
+            VALUES (:league, :season, :status, :fetched, :inserted, :error, :ts)
+        """), params)
+
+def reset_checkpoints():
+    ensure_checkpoint_table()
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM backfill_checkpoints"))
 
 # --- Κύρια εκτέλεση ---------------------------------------------
-def update_all_leagues(current_only=False):
+BACKFILL_WORKERS = int(os.getenv("BACKFILL_WORKERS", 4))
+
+def current_season():
+    now = datetime.now()
+    start = now.year if now.month >= 7 else now.year - 1
+    return f"{start}/{start+1}"
+
+def season_url(path, season):
+    """Η τρέχουσα σεζόν είναι στο /results/ της λίγκας, οι παλιές στο archive (league-2023-2024)."""
+    if season == current_season():
+        return f"{FLASH_BASE}{path}results/"
+    return f"{FLASH_BASE}{path.rstrip('/')}-{season.replace('/', '-')}/results/"
+
+def backfill(seasons=None, leagues=None, workers=BACKFILL_WORKERS, resume=True):
+    """
+    Παράλληλο backfill: κάθε (league, season) είναι ένα work unit.
+    Τα downloads/parse τρέχουν σε έως `workers` threads· οι εγγραφές στη βάση
+    γίνονται σειριακά από το κύριο thread (ένας writer – ασφαλές και για SQLite).
+    Με resume=True παραλείπονται τα units που έχουν ήδη checkpoint 'done'.
+    """
+    seasons = seasons or get_recent_seasons()
+    leagues = leagues or FLASH_LEAGUES
+    ensure_checkpoint_table()
+    ensure_natural_key()
+    done = completed_units() if resume else set()
+    live = current_season()
+    units = [(league, season) for season in seasons for league in leagues if (league, season) not in done]
+    skipped = len(seasons) * len(leagues) - len(units)
+    print(f"[SEASON MANAGER] 🚀 Backfill: {len(units)} units, {skipped} ήδη ολοκληρωμένα, {workers} workers")
+
+    totals = {"units": len(units), "done": 0, "failed": 0, "inserted": 0, "skipped": 0}
+    if not units:
+        return totals
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="backfill") as pool:
+        futures = {pool.submit(fetch_matches, season_url(leagues[league], season), season): (league, season)
+                   for league, season in units}
+        for fut in as_completed(futures):
+            league, season = futures[fut]
+            try:
+                matches = fut.result()
+                with engine.begin() as conn:
+                    inserted, skipped = _insert_matches(conn, matches, league, season)
+                    # Η τρέχουσα σεζόν αλλάζει ακόμη – δεν σημαδεύεται ποτέ ως 'done'
+                    status = "done" if matches and season != live else "partial"
+                    _checkpoint(conn, league, season, status, len(matches), inserted)
+                totals["done"] += 1
+                totals["inserted"] += inserted
+                totals["skipped"] += skipped
+                print(f"[SEASON MANAGER] 💾 {league} ({season}): {inserted} νέοι, {skipped} υπήρχαν – {status}")
+            except Exception as e:
+                totals["failed"] += 1
+                print(f"[SEASON MANAGER] ❌ {league} ({season}): {e}")
+                try:
+                    with engine.begin() as conn:
+                        _checkpoint(conn, league, season, "failed", error=str(e)[:500])
+                except Exception:
+                    pass
+    print(f"[SEASON MANAGER] ✅ Backfill: {totals['done']}/{totals['units']} units, "
+          f"{totals['inserted']} νέοι αγώνες, {totals['skipped']} υπήρχαν, {totals['failed']} αποτυχίες")
+    return totals
+
+def update_all_leagues(current_only=False, workers=BACKFILL_WORKERS, resume=True):
     seasons = [get_recent_seasons()[0]] if current_only else get_recent_seasons()
-    for season in seasons:
-        for league_name, path in FLASH_LEAGUES.items():
-            url = f"{FLASH_BASE}{path}"
-            matches = fetch_matches(url, season)
-            insert_into_db(matches, league_name, season)
+    backfill(seasons, workers=workers, resume=resume)
     print("[SEASON MANAGER] ✅ Ολοκλήρωση ενημέρωσης.")
 
 if __name__ == "__main__":
+    import sys
+    if "--reset" in sys.argv:
+        reset_checkpoints()
     update_all_leagues(current_only=False)
@@ -1,13 +1,14 @@
 # ==============================================
 # SOFASCORE READER – Live Football Feed (Clean v2)
 # ==============================================
-import requests
 from datetime import datetime
 
+from modules import http_client
+
 def get_live_matches():
     try:
         url = "https://api.sofascore.com/api/v1/sport/football/events/live"
-        response = requests.get(url, timeout=10)
+        response = http_client.get(url, provider="sofascore")
         data = response.json()
 
         events = data.get("events", [])
@@ -10,11 +10,20 @@ import time
 import random
 from datetime import datetime
 
+from modules.change_filter import ChangeFilter
+
 # ------------------------------------------------
 # Εσωτερικός buffer τελευταίων καταστάσεων
 # ------------------------------------------------
 last_state = {}
 
+# Hash (σκορ, status) ανά αγώνα – μόνο νέοι/αλλαγμένοι αγώνες εξετάζονται
+LIVE_CHANGES = ChangeFilter(
+    "live_alerts",
+    key=lambda m: m["match"],
+    fields=lambda m: (m["home"], m["away"], m["status"]),
+)
+
 # ------------------------------------------------
 # Συνάρτηση ανίχνευσης αλλαγών live δεδομένων
 # ------------------------------------------------
@@ -34,7 +43,8 @@ def detect_live_alerts():
     ]
 
     # Ελέγχει για αλλαγές έναντι της προηγούμενης κατάστασης
-    for m in sample_matches:
+    # (αμετάβλητοι αγώνες δεν περνούν από το change filter)
+    for m in LIVE_CHANGES.changes(sample_matches):
         match_id = m["match"]
         prev = last_state.get(match_id)
 
@@ -61,7 +71,16 @@ def detect_live_alerts():
                     "timestamp": datetime.utcnow().isoformat()
                 })
 
-        # Τυχαίο γεγονός Red Card (demo)
+        # Ενημερώνει την τρέχουσα κατάσταση
+        last_state[match_id] = m
+
+    # Ξεχνάμε αγώνες που έφυγαν από το feed
+    current = {m["match"] for m in sample_matches}
+    for match_id in [k for k in last_state if k not in current]:
+        del last_state[match_id]
+
+    # Τυχαίο γεγονός Red Card (demo)
+    for m in sample_matches:
         if random.random() < 0.1:
             alerts.append({
                 "type": "card",
@@ -69,9 +88,6 @@ def detect_live_alerts():
                 "timestamp": datetime.utcnow().isoformat()
             })
 
-        # Ενημερώνει την τρέχουσα κατάσταση
-        last_state[match_id] = m
-
     print(f"[LIVE FEEDS] ✅ {len(alerts)} new alerts detected.")
     return {"status": "ok", "count": len(alerts), "alerts": alerts}
 
@@ -0,0 +1,7 @@
+# Τα tests τρέχουν από τη ρίζα του repo (python -m pytest tests)
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,104 @@
+# ==============================================
+# flashscore_feed_reader – parser πάνω στο αποθηκευμένο x/feed fixture
+# ==============================================
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+import flashscore_feed_reader as feed
+from conftest import ROOT
+
+FIXTURE = os.path.join(ROOT, "data", "fixtures", "flashscore_feed_sample.txt")
+
+
+@pytest.fixture(scope="module")
+def parsed():
+    with open(FIXTURE, encoding="utf-8") as fh:
+        return feed.parse_feed(fh.read())
+
+
+def _by_id(parsed):
+    return {m["id"]: m for m in parsed}
+
+
+def test_fixture_row_count(parsed):
+    assert len(parsed) == 18
+    assert len(_by_id(parsed)) == 18
+
+
+def test_fixture_known_matches(parsed):
+    by_id = _by_id(parsed)
+
+    first = by_id["de0IgxLd"]
+    assert (first["country"], first["league"]) == ("England", "Premier League")
+    assert (first["home"], first["away"]) == ("Arsenal", "Chelsea")
+    assert (first["home_goals"], first["away_goals"], first["status"]) == (1, 0, "finished")
+    assert first["kickoff"] == datetime(2025, 10, 17, 13, 0, tzinfo=timezone.utc)
+
+    live = by_id["AepfJBd0"]
+    assert (live["home"], live["away"], live["status"]) == ("Liverpool", "Man City", "live")
+    assert (live["home_goals"], live["away_goals"]) == (0, 1)
+
+    upcoming = by_id["KLzdocJ2"]
+    assert (upcoming["home"], upcoming["away"], upcoming["status"]) == ("Newcastle", "Tottenham", "scheduled")
+    assert upcoming["home_goals"] is None and upcoming["away_goals"] is None
+    assert upcoming["kickoff"] == datetime(2025, 10, 16, 15, 0, tzinfo=timezone.utc)
+
+    last = by_id["zgEOzdme"]
+    assert (last["country"], last["league"]) == ("Spain", "LaLiga")
+    assert (last["home"], last["away"]) == ("Villarreal", "Betis")
+    assert (last["home_goals"], last["away_goals"], last["status"]) == (1, 3, "live")
+
+
+def test_fixture_league_headers(parsed):
+    statuses = [m["status"] for m in parsed]
+    assert (statuses.count("finished"), statuses.count("live"), statuses.count("scheduled")) == (7, 6, 5)
+    leagues = {}
+    for m in parsed:
+        leagues[(m["country"], m["league"])] = leagues.get((m["country"], m["league"]), 0) + 1
+    assert leagues == {
+        ("England", "Premier League"): 5,
+        ("England", "Championship"): 4,
+        ("Germany", "Bundesliga"): 3,
+        ("Greece", "Super League"): 3,
+        ("Spain", "LaLiga"): 3,
+    }
+
+
+def test_tokenizer_edge_cases():
+    # Κενό / μόνο header / αγώνας χωρίς ομάδες / μη αριθμητικό σκορ / header χωρίς χώρα
+    assert feed.parse_feed("") == []
+    assert feed.parse_feed("SA÷1¬~") == []
+    assert feed.parse_feed("~ZA÷Friendlies¬~AA÷x1¬AD÷1760706000¬AB÷1¬AE÷Home¬~") == []
+    rows = feed.parse_feed("~ZA÷World Cup¬~AA÷x2¬AD÷abc¬AB÷9¬AE÷A÷B¬AF÷C¬AG÷-¬AH÷2¬~")
+    assert len(rows) == 1
+    row = rows[0]
+    assert (row["country"], row["league"], row["url"]) == ("", "World Cup", "")
+    assert row["home"] == "A÷B"  # μόνο το πρώτο ÷ χωρίζει key/value
+    assert (row["kickoff"], row["status"], row["home_goals"], row["away_goals"]) == (None, "unknown", None, 2)
+
+
+def test_to_week_rows_matches_config_names(parsed, capsys):
+    leagues = {
+        "ENG1": {"country": "England", "name": "Premier League", "path": "/football/england/premier-league/"},
+        # Το config λέει "Super League 1", το feed "GREECE: Super League"
+        "GRE1": {"country": "Greece", "name": "Super League 1", "path": "/football/greece/super-league/"},
+        "ITA1": {"country": "Italy", "name": "Serie A", "path": "/football/italy/serie-a/"},
+    }
+    rows = feed.to_week_rows(parsed, leagues)
+    assert len(rows) == 8
+    assert {r["LeagueCode"] for r in rows} == {"ENG1", "GRE1"}
+    assert all(r["LeagueName"] == "Super League 1" for r in rows if r["LeagueCode"] == "GRE1")
+    assert "ITA1 (Italy/Serie A)" in capsys.readouterr().out
+
+
+def test_to_week_rows_prefers_feed_url():
+    text = ("~ZA÷GREECE: Super League¬ZY÷Greece¬ZL÷/football/greece/super-league-2/¬"
+            "~AA÷x3¬AD÷1760706000¬AB÷1¬AE÷Kalamata¬AF÷Niki¬~")
+    leagues = {
+        "GRE1": {"country": "Greece", "name": "Super League 1", "path": "/football/greece/super-league/"},
+        "GRE2": {"country": "Greece", "name": "Super League 2", "path": "/football/greece/super-league-2/"},
+    }
+    rows = feed.to_week_rows(feed.parse_feed(text), leagues)
+    assert [r["LeagueCode"] for r in rows] == ["GRE2"]